@@ -0,0 +1 @@
+"""GraphQL types for artifacts."""
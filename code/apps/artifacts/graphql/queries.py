@@ -0,0 +1,37 @@
+"""GraphQL queries for artifacts."""
+
+from __future__ import annotations
+
+from typing import List
+
+import strawberry
+import strawberry_django
+
+from apps.artifacts import models
+from apps.artifacts.graphql.types import ArtifactType
+from apps.core.graphql.pagination import DEFAULT_PAGE_SIZE, PageInfo, keyset_page
+
+
+@strawberry.type
+class ArtifactConnection:
+    """One page of artifacts, newest first."""
+
+    page_info: PageInfo
+    ids: strawberry.Private[List]
+
+    @strawberry_django.field
+    def nodes(self) -> List[ArtifactType]:
+        return models.Artifact.objects.filter(id__in=self.ids).order_by("-created_at", "-id")
+
+
+@strawberry.type
+class ArtifactQuery:
+    """Artifact queries."""
+
+    @strawberry.field
+    def artifacts(
+        self, world_id: strawberry.ID, after: str | None = None, first: int = DEFAULT_PAGE_SIZE
+    ) -> ArtifactConnection:
+        """List a world's artifacts newest first, keyset-paginated on (-created_at, id) via the (world, -created_at) index."""
+        ids, page_info = keyset_page(models.Artifact.objects.filter(world_id=world_id), "created_at", after, first)
+        return ArtifactConnection(page_info=page_info, ids=ids)
@@ -0,0 +1,24 @@
+"""GraphQL types for artifacts."""
+
+from __future__ import annotations
+
+import strawberry
+from strawberry import auto
+
+from apps.artifacts import models
+
+
+@strawberry.django.type(models.Artifact)
+class ArtifactType:
+    """Artifact GraphQL type."""
+
+    id: auto
+    uri: auto
+    path: auto
+    is_scalar: auto
+    data: auto
+    content_type: auto
+    size_bytes: auto
+    etag: auto
+    sha256: auto
+    created_at: auto
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.12 on 2026-10-18 21:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('cid', models.CharField(max_length=80, primary_key=True, serialize=False)),
+                ('size_bytes', models.BigIntegerField()),
+                ('content_type', models.CharField(blank=True, max_length=128)),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('last_used_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'blob',
+                'indexes': [models.Index(fields=['refcount', 'last_used_at'], name='blob_refcoun_8269f2_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BlobRef',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=512, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='refs', to='artifacts.blob')),
+            ],
+            options={
+                'db_table': 'blob_ref',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.12 on 2026-10-18 22:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0003_blob_cas'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='blobref',
+            name='blob',
+        ),
+        migrations.DeleteModel(
+            name='Blob',
+        ),
+        migrations.DeleteModel(
+            name='BlobRef',
+        ),
+    ]
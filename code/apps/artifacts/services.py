@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import uuid
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Tuple
 from urllib.parse import quote
 
 from apps.artifacts.models import Artifact
@@ -12,6 +14,9 @@ from apps.worlds.models import World
 from backend.storage.service import StorageService
 from django.conf import settings
 
+# Concurrent uploads per create_many call
+UPLOAD_CONCURRENCY = 8
+
 
 class ArtifactService:
     """Service for creating and managing artifacts."""
@@ -27,6 +32,11 @@ class ArtifactService:
         """
         Create a file artifact by uploading content to S3.
 
+        Size and sha256 are computed locally. If the world already holds a file
+        with the same sha256, the new artifact points at that object and nothing
+        is uploaded. No metadata round trip is made either way. The URI still
+        names this run's key, so readers resolve it through Artifact.path.
+
         Args:
             world: World context
             run_id: Run ID for path scoping
@@ -37,33 +47,46 @@ class ArtifactService:
         Returns:
             Artifact record
         """
-        storage = StorageService()
-        bucket = settings.STORAGE.get("BUCKET")
-
-        # Generate path and URI
-        path = f"{world.id}/{run_id}/{key}"
         uri = f"world://{world.id}/{run_id}/{key}"
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        # Same bytes already stored in this world: reuse the object (uses the (world, sha256) index)
+        existing = (
+            Artifact.objects.filter(world=world, sha256=sha256, is_scalar=False)
+            .exclude(path="")
+            .values("path", "etag")
+            .first()
+        )
+        if existing:
+            path, etag = existing["path"], existing["etag"]
+        else:
+            path = f"{world.id}/{run_id}/{key}"
+            etag = ArtifactService._upload(path, content, content_type)
 
-        # Upload to storage
-        storage.upload_bytes(data=content, key=path, content_type=content_type, bucket=bucket)
-
-        # Get file metadata
-        metadata = storage.get_file_metadata(key=path, bucket=bucket)
-
-        # Create artifact record
-        artifact = Artifact.objects.create(
+        return Artifact.objects.create(
             world=world,
             uri=uri,
             path=path,
             data=None,
             is_scalar=False,
             content_type=content_type,
-            size_bytes=metadata.get("ContentLength"),
-            etag=metadata.get("ETag", "").strip('"'),
-            sha256="",  # TODO: compute hash if needed
+            size_bytes=len(content),
+            etag=etag,
+            sha256=sha256,
         )
 
-        return artifact
+    @staticmethod
+    def _upload(path: str, content: bytes, content_type: str) -> str:
+        """Upload content to path and return its ETag, computed locally (no HEAD)."""
+        storage = StorageService()
+        bucket = settings.STORAGE.get("BUCKET")
+
+        storage.upload_bytes(data=content, key=path, content_type=content_type, bucket=bucket)
+
+        # Single-part uploads have ETag = md5(body); multipart ETags can't be derived locally
+        if len(content) <= settings.STORAGE.get("TRANSFER", {}).get("MULTIPART_THRESHOLD", 0):
+            return hashlib.md5(content).hexdigest()
+        return ""
 
     @staticmethod
     def create_scalar_artifact(
@@ -84,12 +107,18 @@ class ArtifactService:
         Returns:
             Artifact record with embedded data in URI
         """
+        artifact = ArtifactService._scalar_artifact(world, run_id, key, data)
+        artifact.save(force_insert=True)
+        return artifact
+
+    @staticmethod
+    def _scalar_artifact(world: World, run_id: str, key: str, data: Any) -> Artifact:
+        """Unsaved scalar Artifact with its data encoded in the URI."""
         # Encode data in URI
         encoded_data = quote(json.dumps(data))
         uri = f"world://{world.id}/{run_id}/{key}?data={encoded_data}"
 
-        # Create artifact record
-        artifact = Artifact.objects.create(
+        return Artifact(
             world=world,
             uri=uri,
             path="",  # No S3 path for scalars
@@ -101,8 +130,6 @@ class ArtifactService:
             sha256="",
         )
 
-        return artifact
-
     @staticmethod
     def create_inline_artifact(
         world: World,
@@ -122,16 +149,87 @@ class ArtifactService:
         Returns:
             Artifact record
         """
-        if isinstance(value, (dict, list)):
-            # JSON data - create scalar artifact
+        file_spec = ArtifactService._inline_file(key, value)
+        if file_spec is None:
             return ArtifactService.create_scalar_artifact(world, run_id, key, value)
-        elif isinstance(value, str):
+        return ArtifactService.create_file_artifact(world, run_id, *file_spec)
+
+    @staticmethod
+    def _inline_file(key: str, value: Any) -> Tuple[str, bytes, str] | None:
+        """(file key, content, content type) for values stored as files; None for scalars."""
+        if isinstance(value, str):
             # String - write as JSON file
-            content = json.dumps(value).encode()
-            return ArtifactService.create_file_artifact(world, run_id, f"{key}.json", content, "application/json")
-        elif isinstance(value, bytes):
+            return f"{key}.json", json.dumps(value).encode(), "application/json"
+        if isinstance(value, bytes):
             # Binary - write as file
-            return ArtifactService.create_file_artifact(world, run_id, key, value, "application/octet-stream")
-        else:
-            # Scalar value - create scalar artifact
-            return ArtifactService.create_scalar_artifact(world, run_id, key, value)
+            return key, value, "application/octet-stream"
+        # dict/list/number/bool/None - scalar artifact
+        return None
+
+    @staticmethod
+    def create_many(world: World, run_id: str, items: Dict[str, Any]) -> Dict[str, Artifact]:
+        """
+        Create artifacts for many inline values at once.
+
+        Same type rules as create_inline_artifact. File contents are deduplicated
+        against the world and within the call with one query. New contents
+        upload concurrently, with at most UPLOAD_CONCURRENCY uploads in flight,
+        and all rows are inserted with a single bulk_create. As with
+        create_file_artifact, a deduplicated artifact's path is the shared
+        object's key, and readers resolve its URI through Artifact.path.
+
+        Args:
+            world: World context
+            run_id: Run ID for path scoping
+            items: Artifact key -> inline value
+
+        Returns:
+            Artifact key -> Artifact record (same order as items)
+        """
+        artifacts: Dict[str, Artifact] = {}
+        files: Dict[str, Tuple[str, bytes, str, str]] = {}  # item key -> (file key, content, content type, sha256)
+        for key, value in items.items():
+            file_spec = ArtifactService._inline_file(key, value)
+            if file_spec is None:
+                artifacts[key] = ArtifactService._scalar_artifact(world, run_id, key, value)
+            else:
+                file_key, content, content_type = file_spec
+                files[key] = (file_key, content, content_type, hashlib.sha256(content).hexdigest())
+
+        stored = {
+            row["sha256"]: (row["path"], row["etag"])
+            for row in Artifact.objects.filter(
+                world=world, sha256__in={spec[3] for spec in files.values()}, is_scalar=False
+            )
+            .exclude(path="")
+            .values("sha256", "path", "etag")
+        }
+
+        # One upload per distinct new content
+        pending = {}
+        for file_key, content, content_type, sha256 in files.values():
+            if sha256 not in stored and sha256 not in pending:
+                pending[sha256] = (f"{world.id}/{run_id}/{file_key}", content, content_type)
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(UPLOAD_CONCURRENCY, len(pending))) as pool:
+                etags = pool.map(lambda spec: ArtifactService._upload(*spec), pending.values())
+                for (sha256, (path, _, _)), etag in zip(pending.items(), etags, strict=True):
+                    stored[sha256] = (path, etag)
+
+        for key, (file_key, content, content_type, sha256) in files.items():
+            path, etag = stored[sha256]
+            artifacts[key] = Artifact(
+                world=world,
+                uri=f"world://{world.id}/{run_id}/{file_key}",
+                path=path,
+                data=None,
+                is_scalar=False,
+                content_type=content_type,
+                size_bytes=len(content),
+                etag=etag,
+                sha256=sha256,
+            )
+
+        ordered = {key: artifacts[key] for key in items}
+        Artifact.objects.bulk_create(ordered.values())
+        return ordered
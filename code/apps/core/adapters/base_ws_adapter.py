@@ -19,6 +19,35 @@ class DriftError(WsError):
     pass
 
 
+class TransportError(WsError):
+    """
+    Connection-level failure (connect, timeout, unexpected close).
+
+    The tool may or may not have started, so retries must reuse the run's
+    idempotency key. Tool-level failures arrive as a Response with
+    status="error" and are never raised.
+    """
+
+
+class ToolTimeoutError(WsError):
+    """
+    The tool connected and acknowledged the run but sent no final Response
+    before the run's deadline (Tool.timeout_s).
+
+    Not a transport failure: the tool is slow or hung, and running it again
+    would multiply its wall time and cost, so it is never retried.
+    """
+
+
+# Event phase a container emits once it applied each control op (RunRegistry.apply_control)
+CONTROL_PHASES = {
+    "preempt": "preempted",
+    "pause": "paused",
+    "resume": "resumed",
+    "set_budget": "budget_updated",
+}
+
+
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
@@ -47,10 +76,11 @@ class BaseWsAdapter:
 
     # ---------------- Public API ----------------
 
-    def invoke_run(self, run) -> Dict[str, Any]:
+    def invoke_run(self, run, on_event=None) -> Dict[str, Any]:
         """
         High-level invocation from Run model.
         Loads Tool, constructs payload with presigned URLs, invokes, returns envelope.
+        - on_event: optional callback receiving every streamed event (including the final Response)
         """
         from apps.tools.models import Tool
         from django.conf import settings
@@ -75,12 +105,50 @@ class BaseWsAdapter:
         payload = self._build_payload(run)
 
         # Invoke with tool timeout
-        oci = {"expected_digest": expected_digest}
-        return self.invoke(run.ref, payload, tool.timeout_s, oci, stream=False)
+        oci = {"expected_digest": expected_digest, "coalesce_key": run.coalesce_key or None}
+        return self._invoke_observed(run.ref, payload, tool.timeout_s, oci, on_event)
+
+    def control_run(self, run, content: Dict[str, Any], timeout_s: float = 5) -> Dict[str, Any]:
+        """
+        Send one control op to the container executing run.
+        - content: {"op": "preempt" | "pause" | "resume" | "set_budget", ...op fields}
+        Returns the container's acknowledging Event.
+        """
+        return self.control(run.ref, str(run.id), content, self._control_oci(run.ref), timeout_s)
+
+    def control(
+        self, ref: str, run_id: str, content: Dict[str, Any], oci: Dict[str, Any], timeout_s: float = 5
+    ) -> Dict[str, Any]:
+        """
+        Open a CONTROLLER connection to run_id, apply one control op, and return the acknowledging Event.
+        - oci: {"ws_url": ".../run", "headers": {...}}
+        Raises WsError if the container does not know the run, TransportError if it cannot be reached in time.
+        """
+        import concurrent.futures
+
+        # Own loop on a helper thread: callers may be sync code running under an event loop
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self._control_async(ref, run_id, content, oci, timeout_s)).result()
+
+    def _control_oci(self, ref: str) -> Dict[str, Any]:
+        """{"ws_url", "headers"} of the container serving ref (resolved by subclasses)."""
+        raise WsError(f"{type(self).__name__} does not support control connections")
+
+    def _invoke_observed(
+        self, ref: str, payload: Dict[str, Any], timeout_s: int, oci: Dict[str, Any], on_event=None
+    ) -> Dict[str, Any]:
+        """invoke() returning the final Response; streams when on_event is given so it sees every event."""
+        if on_event is None:
+            return self.invoke(ref, payload, timeout_s, oci, stream=False)
+        for ev in self.invoke(ref, payload, timeout_s, oci, stream=True):
+            on_event(ev)
+            if ev.get("kind") == "Response" and ev.get("control", {}).get("final"):
+                return ev
+        raise WsError("Run finished without Response")
 
     def _build_payload(self, run) -> Dict[str, Any]:
         """
-        Build invocation payload with hydrated inputs and presigned output URLs.
+        Build the Request message with hydrated inputs and presigned output URLs.
 
         Hydrates world:// URIs in inputs to presigned GET URLs.
         Generates presigned PUT URLs for outputs.
@@ -102,8 +170,9 @@ class BaseWsAdapter:
             timeout = 3600
             output_paths = []
 
-        # Hydrate inputs: convert world:// URIs to presigned GET URLs
-        hydrated_inputs = self._hydrate_inputs(run.inputs, run.world.id, bucket, storage, timeout)
+        # Hydrate inputs: convert world:// URIs to presigned GET URLs of the stored objects
+        paths = self._stored_paths(run.inputs, run.world_id)
+        hydrated_inputs = self._hydrate_inputs(run.inputs, run.world.id, bucket, storage, timeout, paths)
 
         # Generate presigned PUT URLs for declared outputs
         prefix = run.write_prefix.lstrip("/").rstrip("/")
@@ -119,27 +188,68 @@ class BaseWsAdapter:
         )
 
         return {
-            "run_id": str(run.id),
-            "mode": run.mode,
+            "kind": "Request",
+            "control": {
+                "run_id": str(run.id),
+                "mode": run.mode,
+                # Same key on every attempt so the container can dedupe side effects of retried runs
+                "idempotency_key": run.idempotency_key,
+                "attempt": run.attempts,
+            },
             "inputs": hydrated_inputs,
             "outputs": outputs,
         }
 
+    def _stored_paths(self, inputs: Any, world_id) -> Dict[str, str]:
+        """
+        Storage keys of the file artifacts referenced by inputs, by URI (one query).
+
+        Deduplicated artifacts share the object of the first artifact with the
+        same content, so their key is Artifact.path, not the key spelled by the URI.
+        """
+        from apps.artifacts.models import Artifact
+
+        uris = set()
+
+        def collect(value):
+            if isinstance(value, dict):
+                for item in value.values():
+                    collect(item)
+            elif isinstance(value, list):
+                for item in value:
+                    collect(item)
+            elif isinstance(value, str) and value.startswith("world://") and "?data=" not in value:
+                uris.add(value)
+
+        collect(inputs)
+        if not uris:
+            return {}
+        return dict(
+            Artifact.objects.filter(world_id=world_id, uri__in=uris).exclude(path="").values_list("uri", "path")
+        )
+
     def _hydrate_inputs(
-        self, inputs: Dict[str, Any], world_id: str, bucket: str, storage, timeout: int
+        self,
+        inputs: Dict[str, Any],
+        world_id: str,
+        bucket: str,
+        storage,
+        timeout: int,
+        paths: Dict[str, str] | None = None,
     ) -> Dict[str, Any]:
         """
         Recursively hydrate world:// URIs to presigned GET URLs.
 
         Handles:
-        - world://{world}/{run}/{path} → presigned GET URL
+        - world://{world}/{run}/{path} → presigned GET URL of the artifact's stored object
+          (paths: URI -> Artifact.path; URIs without an artifact row map to their own key)
         - world://{world}/{run}/key?data={json} → leaves as-is (protocol layer handles)
         - Nested dicts and lists
         """
         if isinstance(inputs, dict):
-            return {k: self._hydrate_inputs(v, world_id, bucket, storage, timeout) for k, v in inputs.items()}
+            return {k: self._hydrate_inputs(v, world_id, bucket, storage, timeout, paths) for k, v in inputs.items()}
         elif isinstance(inputs, list):
-            return [self._hydrate_inputs(item, world_id, bucket, storage, timeout) for item in inputs]
+            return [self._hydrate_inputs(item, world_id, bucket, storage, timeout, paths) for item in inputs]
         elif isinstance(inputs, str) and inputs.startswith("world://"):
             # Check if it's a scalar (has ?data=)
             if "?data=" in inputs:
@@ -160,8 +270,8 @@ class BaseWsAdapter:
             if uri_world_id != str(world_id):
                 raise PermissionError(f"Cannot access artifacts from other worlds: {inputs}")
 
-            # Generate presigned GET URL
-            s3_key = f"{uri_world_id}/{run_id}/{path}"
+            # Generate presigned GET URL (deduplicated artifacts point at another run's object)
+            s3_key = (paths or {}).get(inputs) or f"{uri_world_id}/{run_id}/{path}"
             return storage.generate_presigned_get_url(bucket=bucket, key=s3_key, expires_in=timeout)
         else:
             # Primitive value or non-world URI
@@ -180,13 +290,15 @@ class BaseWsAdapter:
         - ref: tool ref (ns/name@ver) for logging
         - request: Request message with control/inputs/outputs
         - timeout_s: overall deadline for the run (adapter-side)
-        - oci: {"ws_url": ".../run", "headers": {...}, "expected_digest": "..."} (resolved by control plane)
+        - oci: {"ws_url": ".../run", "headers": {...}, "expected_digest": "...", "coalesce_key": "..."}
+          (resolved by control plane). When coalesce_key is set, identical concurrent invocations in this
+          process share one container run and all receive the leader's events and final Response.
         - stream: if True, returns an iterator of events + final Response; else returns Response dict
         """
+        events = self._event_iter(ref, request, timeout_s, oci)
         if stream:
-            return self._sync_event_iter(ref, request, timeout_s, oci)
+            return events
         # non-stream: drain events but only return final Response
-        events = self._sync_event_iter(ref, request, timeout_s, oci)
         final_response = None
         for ev in events:
             if ev.get("kind") == "Response" and ev.get("control", {}).get("final"):
@@ -198,6 +310,18 @@ class BaseWsAdapter:
 
     # ---------------- Internals ----------------
 
+    def _event_iter(
+        self, ref: str, request: Dict[str, Any], timeout_s: int, oci: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """Event iterator for this invocation, coalesced with identical in-flight calls when keyed."""
+        key = oci.get("coalesce_key")
+        if not key:
+            return self._sync_event_iter(ref, request, timeout_s, oci)
+
+        from apps.core.singleflight import inflight
+
+        return inflight.join(key, lambda: self._sync_event_iter(ref, request, timeout_s, oci))
+
     def _sync_event_iter(
         self, ref: str, request: Dict[str, Any], timeout_s: int, oci: Dict[str, Any]
     ) -> Iterator[Dict[str, Any]]:
@@ -214,6 +338,9 @@ class BaseWsAdapter:
             try:
                 async for ev in self._run_async(ref, request, timeout_s, oci):
                     q.put(ev)
+            except Exception as e:
+                # Surface connection failures to the consumer (retries key off the exception type)
+                q.put(e)
             finally:
                 q.put(None)  # sentinel
 
@@ -234,6 +361,8 @@ class BaseWsAdapter:
                 ev = q.get()  # blocking, thread-safe
                 if ev is None:
                     break
+                if isinstance(ev, Exception):
+                    raise ev
                 yield ev
         finally:
             t.join(timeout=1.0)  # Give thread time to cleanup
@@ -272,7 +401,7 @@ class BaseWsAdapter:
                 # Expect Ack or early Response
                 while True:
                     if time.time() > deadline:
-                        raise WsError("Timeout waiting for Ack")
+                        raise TransportError("Timeout waiting for Ack")
                     raw = await asyncio.wait_for(ws.recv(), timeout=5)
                     msg = self._parse_msg(raw)
                     kind = msg.get("kind")
@@ -290,11 +419,15 @@ class BaseWsAdapter:
                         continue
                     # Ignore unknown kinds
 
-                # Stream loop
+                # Stream loop: silence is fine until the run's deadline (pings detect dead connections)
                 while True:
-                    if time.time() > deadline:
-                        raise WsError("Timeout waiting for Response")
-                    raw = await asyncio.wait_for(ws.recv(), timeout=15)
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise ToolTimeoutError(f"No Response within the run's {timeout_s}s deadline")
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), timeout=remaining)
+                    except TimeoutError:
+                        raise ToolTimeoutError(f"No Response within the run's {timeout_s}s deadline") from None
                     msg = self._parse_msg(raw)
                     kind = msg.get("kind")
                     if kind == "Response" and msg.get("control", {}).get("final"):
@@ -305,12 +438,55 @@ class BaseWsAdapter:
                         yield msg
                     # otherwise ignore
         except TimeoutError:
-            raise WsError("WebSocket timeout")
+            raise TransportError("WebSocket timeout")
         except websockets.exceptions.ConnectionClosedOK:
             # normal close after Response
             return
         except websockets.exceptions.ConnectionClosedError as e:
-            raise WsError(f"WebSocket closed unexpectedly: {e.code} {e.reason}") from e
+            raise TransportError(f"WebSocket closed unexpectedly: {e.code} {e.reason}") from e
+        except (OSError, websockets.exceptions.InvalidHandshake) as e:
+            raise TransportError(f"WebSocket connect failed: {e}") from e
+
+    async def _control_async(
+        self, ref: str, run_id: str, content: Dict[str, Any], oci: Dict[str, Any], timeout_s: float
+    ) -> Dict[str, Any]:
+        ws_url: str = oci.get("ws_url") or ""
+        if not ws_url:
+            raise WsError("Missing ws_url in oci")
+        op = str(content.get("op") or "").lower()
+        expected_phase = CONTROL_PHASES.get(op, "control_noop")
+
+        self.logger(event="ws.control.start", ref=ref, run_id=run_id, op=op)
+        try:
+            async with asyncio.timeout(timeout_s):
+                async with ws_connect(
+                    ws_url,
+                    extra_headers=oci.get("headers") or {},
+                    open_timeout=self.connect_timeout_s,
+                    subprotocols=["theory.run.v1"],
+                ) as ws:
+                    # The op rides on the Request, so it applies in one round trip
+                    request = {
+                        "kind": "Request",
+                        "control": {"run_id": run_id, "role": "controller"},
+                        "content": content,
+                    }
+                    await ws.send(json.dumps(request, separators=(",", ":")))
+                    # Controllers also receive the run's fan-out; wait for the Event answering this op
+                    while True:
+                        msg = self._parse_msg(await ws.recv())
+                        if msg.get("kind") == "Error":
+                            raise WsError(msg.get("content", {}).get("message") or f"Control {op} rejected")
+                        phase = msg.get("content", {}).get("phase")
+                        if msg.get("kind") == "Event" and phase in (expected_phase, "control_noop"):
+                            self.logger(event="ws.control.ok", ref=ref, run_id=run_id, op=op, phase=phase)
+                            return msg
+        except TimeoutError:
+            raise TransportError(f"Timeout applying control {op} to run {run_id}")
+        except websockets.exceptions.ConnectionClosed as e:
+            raise WsError(f"Control connection for run {run_id} closed: {e}") from e
+        except (OSError, websockets.exceptions.InvalidHandshake) as e:
+            raise TransportError(f"WebSocket connect failed: {e}") from e
 
     def _parse_msg(self, raw: bytes | str) -> Dict[str, Any]:
         if isinstance(raw, bytes | bytearray):
@@ -6,7 +6,7 @@ from typing import Any, Dict, Iterator
 
 import httpx
 
-from .base_ws_adapter import BaseWsAdapter, WsError
+from .base_ws_adapter import BaseWsAdapter, TransportError, WsError
 
 
 # Port state file location (must match localctl.py)
@@ -63,6 +63,7 @@ class LocalWsAdapter(BaseWsAdapter):
 
         oci fields:
           - expected_digest: sha256:... (for drift detection)
+          - coalesce_key: optional key for sharing identical in-flight runs
           - Headers/auth not needed for local
 
         Expects: `localctl start --ref {ref}` already called
@@ -71,7 +72,6 @@ class LocalWsAdapter(BaseWsAdapter):
 
         # Resolve port from localctl state file
         host_port = self._resolve_port(ref)
-        ws_url = f"ws://127.0.0.1:{host_port}/run"
 
         # Check container is healthy before connecting
         import time
@@ -92,11 +92,19 @@ class LocalWsAdapter(BaseWsAdapter):
             time.sleep(0.5)
 
         if not healthy:
-            raise WsError(
+            raise TransportError(
                 f"Container for {ref} not healthy on port {host_port}. "
                 f"Start container with: python manage.py localctl start --ref {ref}"
             )
 
         # Delegate to base WebSocket adapter
-        oci2 = {"ws_url": ws_url, "headers": {}, "expected_digest": expected_digest}
+        oci2 = {
+            **self._control_oci(ref),
+            "expected_digest": expected_digest,
+            "coalesce_key": oci.get("coalesce_key"),
+        }
         return super().invoke(ref, payload, timeout_s, oci2, stream=stream)
+
+    def _control_oci(self, ref: str) -> Dict[str, Any]:
+        """Endpoint of the local container serving ref."""
+        return {"ws_url": f"ws://127.0.0.1:{self._resolve_port(ref)}/run", "headers": {}}
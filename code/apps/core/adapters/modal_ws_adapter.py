@@ -14,7 +14,7 @@ class ModalWsAdapter(BaseWsAdapter):
     Modal always runs linux/amd64.
     """
 
-    def invoke_run(self, run) -> Dict[str, Any]:
+    def invoke_run(self, run, on_event=None) -> Dict[str, Any]:
         """Override to force amd64 digest selection for Modal."""
         from apps.tools.models import Tool
 
@@ -30,8 +30,8 @@ class ModalWsAdapter(BaseWsAdapter):
         payload = self._build_payload(run)
 
         # Invoke with Modal-resolved URL
-        oci = {"expected_digest": expected_digest}
-        return self.invoke(run.ref, payload, tool.timeout_s, oci, stream=False)
+        oci = {"expected_digest": expected_digest, "coalesce_key": run.coalesce_key or None}
+        return self._invoke_observed(run.ref, payload, tool.timeout_s, oci, on_event)
 
     def invoke(
         self,
@@ -41,6 +41,25 @@ class ModalWsAdapter(BaseWsAdapter):
         oci: Dict[str, Any],
         stream: bool = False,
     ) -> Dict[str, Any] | Iterator[Dict[str, Any]]:
+        expected_digest = oci.get("expected_digest")
+        headers = dict(oci.get("headers") or {})
+
+        oci2 = {
+            "ws_url": self._control_oci(ref)["ws_url"],
+            "headers": headers,
+            "expected_digest": expected_digest,
+            "coalesce_key": oci.get("coalesce_key"),
+        }
+        return super().invoke(ref, payload, timeout_s, oci2, stream=stream)
+
+    def _control_oci(self, ref: str) -> Dict[str, Any]:
+        """
+        Endpoint of the deployed Modal function serving ref.
+
+        Control connections are routed like invocations, so they reach the
+        container holding the run as long as the app serves runs from one
+        container (Modal may route a new connection to another replica).
+        """
         from apps.core.management.commands._modal_common import modal_app_name
         from apps.core.utils.adapters import _get_modal_web_url
 
@@ -54,8 +73,6 @@ class ModalWsAdapter(BaseWsAdapter):
 
         # Get deployed URL via Modal SDK
         base_url = _get_modal_web_url(app_name).rstrip("/")
-        expected_digest = oci.get("expected_digest")
-        headers = dict(oci.get("headers") or {})
 
         # Normalize to wss and attach /run
         if base_url.startswith("http://"):
@@ -68,5 +85,4 @@ class ModalWsAdapter(BaseWsAdapter):
             # assume host without scheme
             ws_url = "wss://" + base_url + "/run"
 
-        oci2 = {"ws_url": ws_url, "headers": headers, "expected_digest": expected_digest}
-        return super().invoke(ref, payload, timeout_s, oci2, stream=stream)
+        return {"ws_url": ws_url, "headers": {}}
@@ -31,3 +31,9 @@ ERR_OUTPUT_DUPLICATE = "ERR_OUTPUT_DUPLICATE"
 # Adapter execution errors
 ERR_ADAPTER_INVOCATION = "ERR_ADAPTER_INVOCATION"
 ERR_FUNCTION_NOT_FOUND = "ERR_FUNCTION_NOT_FOUND"
+
+# Run control errors
+ERR_PREEMPTED = "ERR_PREEMPTED"  # Run cancelled by the control plane
+ERR_DEADLINE_EXCEEDED = "ERR_DEADLINE_EXCEEDED"  # Run outlived its tool's timeout
+ERR_HEARTBEAT_LOST = "ERR_HEARTBEAT_LOST"  # Executing worker stopped reporting
+ERR_QUEUE_TIMEOUT = "ERR_QUEUE_TIMEOUT"  # No worker claimed the run in time
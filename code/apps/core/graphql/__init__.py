@@ -0,0 +1 @@
+"""Shared GraphQL building blocks."""
@@ -0,0 +1,66 @@
+"""
+Keyset (cursor) pagination for GraphQL connections.
+
+Pages are ordered by (-<timestamp>, -id) and the cursor encodes the last row's
+(timestamp, id), so fetching page N costs the same index range scan as page 1
+instead of an OFFSET that reads and discards every earlier row.
+"""
+
+from __future__ import annotations
+
+import base64
+import datetime
+from typing import Any, List, Tuple
+
+import strawberry
+from django.db.models import Q, QuerySet
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@strawberry.type
+class PageInfo:
+    """Position of a page within a connection."""
+
+    has_next_page: bool
+    end_cursor: str | None
+
+
+def encode_cursor(timestamp: datetime.datetime, pk: Any) -> str:
+    """Opaque cursor for a row's (timestamp, id) sort key."""
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{pk}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, str]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        timestamp, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.datetime.fromisoformat(timestamp), pk
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def keyset_page(queryset: QuerySet, time_field: str, after: str | None, first: int) -> Tuple[List[Any], PageInfo]:
+    """
+    One page of primary keys from queryset, newest first.
+
+    Args:
+        queryset: Filtered queryset (filters should match an index led by time_field)
+        time_field: Timestamp column of the sort key (ties broken by id)
+        after: Cursor of the last row of the previous page (None for the first page)
+        first: Page size (clamped to 1..MAX_PAGE_SIZE)
+
+    Returns:
+        (primary keys of the page in order, PageInfo)
+    """
+    first = max(1, min(first, MAX_PAGE_SIZE))
+    if after:
+        timestamp, pk = decode_cursor(after)
+        queryset = queryset.filter(Q(**{f"{time_field}__lt": timestamp}) | Q(**{time_field: timestamp, "pk__lt": pk}))
+
+    # One extra row tells whether another page exists
+    rows = list(queryset.order_by(f"-{time_field}", "-pk").values_list("pk", time_field)[: first + 1])
+    page = rows[:first]
+    end_cursor = encode_cursor(page[-1][1], page[-1][0]) if page else None
+    return [pk for pk, _ in page], PageInfo(has_next_page=len(rows) > first, end_cursor=end_cursor)
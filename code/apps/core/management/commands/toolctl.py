@@ -117,6 +117,7 @@ class Command(BaseCommand):
             cpu = runtime.get("cpu") or "1"
             memory_gb = runtime.get("memory_gb") or 2
             gpu = runtime.get("gpu") or ""  # null in YAML becomes None, coalesce to ""
+            retry_policy = runtime.get("retry") or {}
 
             if dry_run:
                 if not json_mode:
@@ -142,6 +143,7 @@ class Command(BaseCommand):
                     "cpu": cpu,
                     "memory_gb": memory_gb,
                     "gpu": gpu,
+                    "retry_policy": retry_policy,
                 },
             )
 
@@ -86,15 +86,11 @@ def artifact_read_json(path: str) -> Dict[str, Any] | None:
     Returns:
         Parsed JSON dict or None if not found/invalid
     """
-    from backend.storage.service import storage_service
+    from backend.storage.artifact_store import artifact_store
 
     try:
-        # Use storage service (not direct filesystem)
-        content = storage_service.read_file(path)
-        if not content:
-            return None
-
-        return json.loads(content.decode("utf-8"))
+        # Parse straight from the storage stream (no full-body buffer, no local FS)
+        return artifact_store.read_json(path)
     except Exception:
         return None
 
@@ -135,14 +131,14 @@ def artifact_exists(path: str) -> bool:
     Returns:
         True if artifact exists, False otherwise
     """
-    from backend.storage.service import storage_service
+    from backend.storage.artifact_store import artifact_store
 
     try:
         # Canonicalize path
         canonical_path = canon_path_facet_root(path)
 
-        # Use storage service to stat (no local FS, no network)
-        return storage_service.file_exists(canonical_path)
+        # Stat via artifact store (no local FS, no body transfer)
+        return artifact_store.exists(canonical_path)
     except (ValueError, Exception):
         # Invalid path or any error means artifact doesn't exist
         return False
@@ -0,0 +1,213 @@
+"""
+Request coalescing for identical in-flight tool invocations.
+
+When several callers invoke the same tool with the same digest, mode and inputs
+at the same time, only the first caller (the leader) opens a container run.
+Everyone else attaches to the leader's event stream and receives the same
+events and final Response.
+
+Two layers:
+  - SingleFlight: in-process coalescing of event iterators (threads).
+  - advisory_lock: Postgres advisory lock keyed by the same coalesce key, held
+    by RunService only while electing the leader among identical runs in any
+    process; followers then wait on the leader's Run row, not on the lock.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+def coalesce_key(ref: str, digest: str | None, mode: str, inputs: Any, scope: str = "") -> str:
+    """
+    Compute a stable key identifying an invocation.
+
+    Args:
+        ref: Tool ref (e.g., "llm/litellm@1")
+        digest: Expected image digest (None if unpinned)
+        mode: Execution mode ("mock" | "real")
+        inputs: Raw (un-hydrated) inputs; must be JSON-serializable
+        scope: Isolation scope (e.g., world id) - calls in different scopes never coalesce
+
+    Returns:
+        Hex sha256 of the canonical invocation description
+    """
+    canonical = json.dumps(
+        {"ref": ref, "digest": digest or "", "mode": mode, "inputs": inputs, "scope": scope},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """
+    One in-flight invocation shared by a leader and any number of followers.
+
+    Events are buffered so late joiners replay the stream from the start.
+    Whichever subscriber needs the next event pulls it from the source, so the
+    flight keeps making progress even if the leader stops consuming.
+    """
+
+    def __init__(self, source: Iterator[Dict[str, Any]], on_done: Callable[[], None]):
+        self._source = source
+        self._on_done = on_done
+        self._events: list[Dict[str, Any]] = []
+        self._error: BaseException | None = None
+        self._done = False
+        self._pumping = False
+        self._subscribers = 0
+        self._cond = threading.Condition()
+
+    def subscribe(self) -> Iterator[Dict[str, Any]]:
+        # Count the subscriber at join time, not first iteration, so a follower
+        # that has not started reading yet keeps the flight alive.
+        with self._cond:
+            self._subscribers += 1
+        return self._consume()
+
+    def _consume(self) -> Iterator[Dict[str, Any]]:
+        try:
+            yield from self._replay()
+        finally:
+            with self._cond:
+                self._subscribers -= 1
+                abandoned = self._subscribers == 0 and not self._done
+            if abandoned:
+                # Last subscriber walked away mid-stream: stop the source so the
+                # next identical call starts a fresh invocation.
+                self._close_source()
+                self._finish(None)
+
+    def _replay(self) -> Iterator[Dict[str, Any]]:
+        idx = 0
+        while True:
+            with self._cond:
+                while idx >= len(self._events) and not self._done and self._pumping:
+                    self._cond.wait()
+                if idx < len(self._events):
+                    ev = self._events[idx]
+                    idx += 1
+                elif self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                else:
+                    self._pumping = True
+                    ev = None
+
+            if ev is not None:
+                yield ev
+                continue
+
+            self._pump_one()
+
+    def _pump_one(self) -> None:
+        try:
+            nxt = next(self._source)
+        except StopIteration:
+            self._finish(None)
+            return
+        except BaseException as e:
+            self._finish(e)
+            return
+        with self._cond:
+            self._events.append(nxt)
+            self._pumping = False
+            self._cond.notify_all()
+        if nxt.get("kind") == "Response" and nxt.get("control", {}).get("final"):
+            # Terminal Response settles the flight even if nobody drains the source
+            self._close_source()
+            self._finish(None)
+
+    def _close_source(self) -> None:
+        close = getattr(self._source, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def _finish(self, error: BaseException | None) -> None:
+        with self._cond:
+            if self._done:
+                return
+            self._error = error
+            self._done = True
+            self._pumping = False
+            self._cond.notify_all()
+        self._on_done()
+
+
+class SingleFlight:
+    """In-process coalescing of event iterators keyed by coalesce_key()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    def join(self, key: str, start: Callable[[], Iterator[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Attach to the in-flight invocation for key, or start one.
+
+        Args:
+            key: Coalesce key
+            start: Zero-arg callable returning the leader's event iterator (only called by the leader)
+
+        Returns:
+            Iterator over the shared event stream (replayed from the first event)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = _Flight(iter(start()), on_done=lambda: self._forget(key, flight))
+                self._flights[key] = flight
+            else:
+                logger.info("singleflight.join key=%s", key[:12])
+        return flight.subscribe()
+
+    def inflight(self) -> int:
+        """Number of distinct invocations currently in flight."""
+        with self._lock:
+            return len(self._flights)
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+
+@contextmanager
+def advisory_lock(key: str):
+    """
+    Hold a Postgres session advisory lock for key (blocking).
+
+    No-op on other database vendors (SQLite in dev/unit tests), where the
+    in-process SingleFlight is the only coalescing layer.
+    """
+    from django.db import connection
+
+    if connection.vendor != "postgresql":
+        yield
+        return
+
+    lock_id = int(key[:15], 16)  # fits in signed bigint
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", [lock_id])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [lock_id])
+
+
+# Process-wide coalescing group
+inflight = SingleFlight()
@@ -20,6 +20,7 @@ from apps.core.adapters.modal_ws_adapter import ModalWsAdapter
 # Services
 from backend.storage.service import storage_service
 from apps.core.registry.loader import load_processor_spec
+from apps.core.singleflight import coalesce_key
 from apps.core.utils.adapters import _get_newest_build_tag, _load_registry_for_ref
 
 # --- Logging (use project logger if available; fall back to stdlib) ----------
@@ -130,6 +131,10 @@ class ToolRunner:
         # 6) Pick adapter (local vs modal)
         adapter_instance, oci = self._pick_adapter(adapter, expected_digest, ref, reg)
 
+        # Identical concurrent invocations attach to the leader's stream instead of re-running
+        if self._coalesce_enabled():
+            oci["coalesce_key"] = coalesce_key(ref, expected_digest, mode, inputs, scope=f"{adapter}:{artifact_scope}")
+
         # 7) Invoke over WS
         info("invoke.ws.start", ref=ref, adapter=adapter, run_id=rid)
         if stream:
@@ -240,6 +245,11 @@ class ToolRunner:
 
     # ---------- Utilities ----------
 
+    def _coalesce_enabled(self) -> bool:
+        from django.conf import settings
+
+        return getattr(settings, "TOOL_COALESCE_ENABLED", False)
+
     def _host_platform(self) -> str:
         # crude: let registry pick; fallback based on arch
         import platform
@@ -6,6 +6,7 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
+from apps.core.predicates.builtins import canon_path_facet_root
 from backend.storage.artifact_store import artifact_store
 
 
@@ -72,12 +73,8 @@ def materialize_attachments(attachments: List[str]) -> Dict[str, Dict[str, Any]]
         if not file_path.exists():
             raise FileNotFoundError(f"Attachment file not found: {path}")
 
-        # Read file data
-        with open(file_path, "rb") as f:
-            data = f.read()
-
-        # Compute CID
-        cid = artifact_store.compute_cid(data)
+        # Hash in constant memory (mmap); the CID names the path, so identical content shares it
+        cid = artifact_store.compute_file_cid(file_path)
 
         # Determine MIME type
         import mimetypes
@@ -86,9 +83,10 @@ def materialize_attachments(attachments: List[str]) -> Dict[str, Dict[str, Any]]
         if not mime_type:
             mime_type = "application/octet-stream"
 
-        # Store in artifact store
-        artifact_path = f"/artifacts/inputs/{cid}/{file_path.name}"
-        artifact_store.put_bytes(artifact_path, data, mime_type)
+        # Stored at the path itself, which tools read directly; streams from disk, skipped if already attached
+        artifact_path = canon_path_facet_root(f"/artifacts/inputs/{cid}/{file_path.name}")
+        if not artifact_store.exists(artifact_path):
+            artifact_store.put_file(artifact_path, str(file_path), mime_type)
 
         attachment_map[name] = {"$artifact": artifact_path, "cid": cid, "mime": mime_type}
 
@@ -123,11 +121,7 @@ def download_all_outputs(outputs: List[Dict[str, Any]], save_dir: str) -> None:
         rel_path = world_path.lstrip("/")
         local_path = save_path / rel_path
 
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-
-        content = artifact_store.get_bytes(world_path)
-        with open(local_path, "wb") as f:
-            f.write(content)
+        artifact_store.download_to(world_path, local_path)
 
 
 def download_first_output(outputs: List[Dict[str, Any]], save_path: str) -> None:
@@ -137,10 +131,5 @@ def download_first_output(outputs: List[Dict[str, Any]], save_path: str) -> None
 
     output = outputs[0]
     world_path = output["path"]
-    local_path = Path(save_path)
-
-    local_path.parent.mkdir(parents=True, exist_ok=True)
 
-    content = artifact_store.get_bytes(world_path)
-    with open(local_path, "wb") as f:
-        f.write(content)
+    artifact_store.download_to(world_path, Path(save_path))
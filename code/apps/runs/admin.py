@@ -1,5 +1,5 @@
 from django.contrib import admin
-from apps.runs.models import Run, RunOutput
+from apps.runs.models import Run, RunOutput, RunStat
 
 
 class RunOutputInline(admin.TabularInline):
@@ -32,3 +32,25 @@ class RunOutputAdmin(admin.ModelAdmin):
     list_display = ("run_id", "key", "path", "content_type", "size_bytes")
     search_fields = ("run__id", "key", "uri", "path")
     readonly_fields = ("run", "key", "uri", "path", "content_type", "size_bytes", "etag", "sha256")
+
+
+@admin.register(RunStat)
+class RunStatAdmin(admin.ModelAdmin):
+    list_display = ("day", "ref", "world", "runs", "error_rate_pct", "p50_ms", "p95_ms", "cost_micro")
+    list_filter = ("day", "ref")
+    search_fields = ("ref",)
+    readonly_fields = [f.name for f in RunStat._meta.fields]
+
+    @admin.display(description="error %")
+    def error_rate_pct(self, obj):
+        return round(obj.error_rate * 100, 1)
+
+    @admin.display(description="p50 ms")
+    def p50_ms(self, obj):
+        value = obj.quantile_ms(0.5)
+        return None if value is None else round(value)
+
+    @admin.display(description="p95 ms")
+    def p95_ms(self, obj):
+        value = obj.quantile_ms(0.95)
+        return None if value is None else round(value)
@@ -0,0 +1,170 @@
+"""
+Persisted run event log.
+
+Every event a run streams (Ack, Token, Frame, Log, Event, final Response) is
+appended to immutable NDJSON segments under the run's write prefix:
+
+    <world_id>/<run_id>/events/000000.ndjson    zstd at rest (codec marker)
+    <world_id>/<run_id>/events/000001.ndjson
+    <world_id>/<run_id>/events/index.json       {"segments": [{"key", "first_seq", "last_seq", ...}]}
+
+Each line is {"seq": n, "event": {...}}. Writers buffer in memory and upload
+from a background thread, so the adapter's event loop never waits on storage.
+A segment is cut when it reaches RUN_EVENT_LOG_SEGMENT_BYTES or
+RUN_EVENT_LOG_FLUSH_INTERVAL_S has passed; the index is rewritten after each
+segment, so readers can find the segment holding any sequence number without
+reading the ones before it.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+from django.conf import settings
+
+from backend.storage.service import storage_service
+
+logger = logging.getLogger(__name__)
+
+EVENTS_DIR = "events"
+INDEX_NAME = "index.json"
+SEGMENT_CONTENT_TYPE = "application/x-ndjson"
+
+_CLOSE = object()
+
+
+def events_prefix(run) -> str:
+    """Storage key prefix for a run's event log (no leading or trailing slash)."""
+    prefix = run.write_prefix.strip("/") or f"{run.world_id}/{run.id}"
+    return f"{prefix}/{EVENTS_DIR}"
+
+
+class RunEventLogWriter:
+    """
+    Append-only, asynchronously flushed event log for one run.
+
+    append() only enqueues; close() flushes what is left and waits for the
+    uploads to finish. Upload errors are logged, never raised into the run.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._bucket = settings.STORAGE.get("BUCKET")
+        self._segment_bytes = settings.RUN_EVENT_LOG_SEGMENT_BYTES
+        self._flush_interval = settings.RUN_EVENT_LOG_FLUSH_INTERVAL_S
+        self._queue: queue.Queue = queue.Queue()
+        self._next_seq = 0
+        self._segments: List[Dict[str, Any]] = []
+        self._buffer: List[bytes] = []
+        self._buffer_bytes = 0
+        self._buffer_first_seq = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"event-log:{prefix}", daemon=True)
+        self._thread.start()
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """Queue an event for persistence and return its sequence number."""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._queue.put((seq, event))
+        return seq
+
+    def close(self) -> None:
+        """Flush buffered events and wait for the background uploads (idempotent)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    # ---------------- Background thread ----------------
+
+    def _run(self) -> None:
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _CLOSE:
+                self._flush()
+                return
+            if item is not None:
+                seq, event = item
+                line = json.dumps({"seq": seq, "event": event}, separators=(",", ":"), default=str).encode() + b"\n"
+                if not self._buffer:
+                    self._buffer_first_seq = seq
+                    deadline = time.monotonic() + self._flush_interval
+                self._buffer.append(line)
+                self._buffer_bytes += len(line)
+
+            if self._buffer and (self._buffer_bytes >= self._segment_bytes or time.monotonic() >= deadline):
+                self._flush()
+                deadline = None
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        data = b"".join(self._buffer)
+        count = len(self._buffer)
+        first_seq = self._buffer_first_seq
+        self._buffer, self._buffer_bytes = [], 0
+
+        key = f"{self.prefix}/{len(self._segments):06d}.ndjson"
+        segment = {"key": key, "first_seq": first_seq, "last_seq": first_seq + count - 1, "bytes": len(data)}
+        try:
+            storage_service.upload_bytes(
+                data, key, content_type=SEGMENT_CONTENT_TYPE, bucket=self._bucket, compress=True
+            )
+            self._segments.append(segment)
+            index = json.dumps({"segments": self._segments}, separators=(",", ":")).encode()
+            storage_service.upload_bytes(
+                index,
+                f"{self.prefix}/{INDEX_NAME}",
+                content_type="application/json",
+                bucket=self._bucket,
+            )
+        except Exception as e:
+            logger.error(f"Failed to persist run events {key}: {e}")
+
+
+class RunEventLog:
+    """Reader over a persisted run event log."""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._bucket = settings.STORAGE.get("BUCKET")
+
+    @classmethod
+    def for_run(cls, run) -> RunEventLog:
+        return cls(events_prefix(run))
+
+    def segments(self) -> List[Dict[str, Any]]:
+        """Segment index (empty if nothing was persisted yet)."""
+        try:
+            return json.loads(storage_service.download_file(f"{self.prefix}/{INDEX_NAME}", self._bucket))["segments"]
+        except Exception:
+            return []
+
+    def read(self, after_seq: int = -1) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Iterate (seq, event) for events with seq > after_seq, in order.
+
+        Segments entirely before after_seq are skipped via the index.
+        """
+        segments = self.segments()
+        start = bisect.bisect_right([s["last_seq"] for s in segments], after_seq)
+        for segment in segments[start:]:
+            data = storage_service.download_file(segment["key"], self._bucket)
+            for line in data.splitlines():
+                record = json.loads(line)
+                if record["seq"] > after_seq:
+                    yield record["seq"], record["event"]
@@ -0,0 +1,162 @@
+"""
+In-process fan-out of live run events.
+
+RunService.execute publishes every adapter event (Ack, Token, Frame, Log,
+Event, final Response) for the run it executes; GraphQL `runEvents`
+subscribers in the same process receive them as they arrive.
+
+The hub is process-local by design. Runs claimed by `manage.py runworker`
+execute in another process, and their subscribers tail the persisted event
+log instead (apps.runs.event_log), checking every RUN_EVENTS_POLL_INTERVAL_S.
+Those subscribers see events up to RUN_EVENT_LOG_FLUSH_INTERVAL_S plus one
+poll interval late. Object storage and the database are the only state the
+API and the workers share, so no broker (channel layer, LISTEN/NOTIFY) is
+involved. Token-latency streaming applies to runs executed in the API
+process itself (RunService.invoke_tool).
+
+Producers are never blocked by consumers. Each subscriber has a bounded buffer
+(settings.RUN_EVENTS_BUFFER): when a slow client falls behind, the oldest
+Token/Frame/Log frames are dropped first and the next delivered event reports
+how many were skipped. Ack, Event and Response frames are never dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Set
+
+from django.conf import settings
+
+# Frames a lagging subscriber may lose (high-rate, superseded by later frames)
+DROPPABLE_KINDS = frozenset({"Token", "Frame", "Log"})
+
+
+def is_final(event: Dict[str, Any]) -> bool:
+    """Whether event is the terminal Response of a run."""
+    return event.get("kind") == "Response" and bool(event.get("control", {}).get("final"))
+
+
+@dataclass
+class RunEvent:
+    """One delivered event: sequence number within the run, frames skipped before it, raw message."""
+
+    seq: int
+    dropped: int
+    data: Dict[str, Any]
+
+
+class _Subscriber:
+    """Bounded, lossy-for-tokens buffer drained by one async consumer."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self._loop = loop
+        self._maxsize = max(1, maxsize)
+        self._buffer: Deque[RunEvent] = deque()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._dropped = 0
+
+    def offer(self, seq: int, event: Dict[str, Any]) -> None:
+        """Called on the subscriber's loop (via call_soon_threadsafe)."""
+        if len(self._buffer) >= self._maxsize:
+            index = next((i for i, e in enumerate(self._buffer) if e.data.get("kind") in DROPPABLE_KINDS), None)
+            if index is not None:
+                # The frame that followed the victim now also reports the victim's skipped frames
+                victim = self._buffer[index]
+                del self._buffer[index]
+                if index < len(self._buffer):
+                    self._buffer[index].dropped += 1 + victim.dropped
+                else:
+                    self._dropped += 1 + victim.dropped
+            elif event.get("kind") in DROPPABLE_KINDS:
+                self._dropped += 1
+                return
+        self._buffer.append(RunEvent(seq=seq, dropped=self._dropped, data=event))
+        self._dropped = 0
+        self._wakeup.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wakeup.set()
+
+    async def __aiter__(self) -> AsyncIterator[RunEvent]:
+        while True:
+            while self._buffer:
+                event = self._buffer.popleft()
+                yield event
+                if is_final(event.data):
+                    return
+            if self._closed:
+                return
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+
+class RunEventHub:
+    """Registry of live runs in this process and their subscribers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # run_id -> recent events, replayed to late subscribers
+        self._backlog: Dict[str, Deque[tuple[int, Dict[str, Any]]]] = {}
+        self._seq: Dict[str, int] = {}
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+
+    def begin(self, run_id: str) -> None:
+        """Mark run_id as executing in this process."""
+        with self._lock:
+            self._backlog[run_id] = deque(maxlen=settings.RUN_EVENTS_BUFFER)
+            self._seq[run_id] = 0
+            self._subscribers.setdefault(run_id, set())
+
+    def publish(self, run_id: str, event: Dict[str, Any]) -> None:
+        """Deliver event to every subscriber of run_id. Thread-safe and non-blocking."""
+        with self._lock:
+            if run_id not in self._seq:
+                return
+            seq = self._seq[run_id]
+            self._seq[run_id] = seq + 1
+            self._backlog[run_id].append((seq, event))
+            subscribers = list(self._subscribers.get(run_id, ()))
+        for sub in subscribers:
+            sub._loop.call_soon_threadsafe(sub.offer, seq, event)
+
+    def end(self, run_id: str) -> None:
+        """Run finished (or failed): close subscribers and forget it."""
+        with self._lock:
+            self._backlog.pop(run_id, None)
+            self._seq.pop(run_id, None)
+            subscribers = self._subscribers.pop(run_id, set())
+        for sub in subscribers:
+            sub._loop.call_soon_threadsafe(sub.close)
+
+    def is_live(self, run_id: str) -> bool:
+        with self._lock:
+            return run_id in self._seq
+
+    def subscribe(self, run_id: str) -> _Subscriber | None:
+        """
+        Subscribe to a run executing in this process (call from the consumer's event loop).
+
+        Returns:
+            Async-iterable subscriber primed with the recent backlog, or None if the run is not live here
+        """
+        sub = _Subscriber(asyncio.get_running_loop(), settings.RUN_EVENTS_BUFFER)
+        with self._lock:
+            if run_id not in self._seq:
+                return None
+            for seq, event in self._backlog[run_id]:
+                sub.offer(seq, event)
+            self._subscribers[run_id].add(sub)
+        return sub
+
+    def unsubscribe(self, run_id: str, sub: _Subscriber) -> None:
+        with self._lock:
+            self._subscribers.get(run_id, set()).discard(sub)
+
+
+# Process-wide hub
+run_events = RunEventHub()
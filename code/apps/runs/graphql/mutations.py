@@ -4,12 +4,14 @@ from __future__ import annotations
 
 import uuid
 import strawberry
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from strawberry.types import Info
 from typing import Optional
 
-from apps.runs.graphql.types import RunType
+from apps.runs.graphql.types import RunBudgetType, RunType
+from apps.runs.models import Run
 from apps.runs.services import RunService
-from apps.runs.models import RunArtifact
 from apps.worlds.models import World
 from apps.agents.models import Agent
 from apps.artifacts.services import ArtifactService
@@ -42,13 +44,14 @@ class RunMutation:
     @strawberry.mutation
     def create_run(self, input: CreateRunInput, info: Info) -> RunType:
         """
-        Create and execute a run.
+        Create a run.
 
         Flow:
         1. Write inline inputData as artifacts
         2. Merge with inputReferences
         3. Create Run with world:// URIs
-        4. Invoke tool (adapter hydrates URIs)
+        4. Enqueue it for `runworker` (returns status=pending), or invoke the
+           tool inline when RUN_ASYNC_ENABLED is off (adapter hydrates URIs)
         """
         # Validate world exists
         try:
@@ -68,18 +71,18 @@ class RunMutation:
         # Build final inputs dict
         final_inputs = {}
 
-        # Write inline data as artifacts
+        # Write inline data as artifacts (concurrent uploads, one bulk insert)
         if input.input_data:
-            for key, value in input.input_data.items():
-                artifact = ArtifactService.create_inline_artifact(world=world, run_id=run_id, key=key, value=value)
-                final_inputs[key] = artifact.uri
+            artifacts = ArtifactService.create_many(world=world, run_id=run_id, items=input.input_data)
+            final_inputs.update({key: artifact.uri for key, artifact in artifacts.items()})
 
         # Merge with references (references override inline if conflict)
         if input.input_references:
             final_inputs.update(input.input_references)
 
-        # Invoke tool via RunService
-        run = RunService.invoke_tool(
+        # Enqueue (or invoke inline) via RunService; input artifacts are linked when the run is created
+        submit = RunService.enqueue if settings.RUN_ASYNC_ENABLED else RunService.invoke_tool
+        run = submit(
             world=world,
             agent=agent,
             tool_ref=input.tool_ref,
@@ -89,19 +92,29 @@ class RunMutation:
             run_id=run_id,
         )
 
-        # Create RunArtifact links for inputs
-        for key, uri in final_inputs.items():
-            # Find artifact by URI
-            try:
-                artifact = world.artifacts.get(uri=uri)
-                RunArtifact.objects.create(
-                    run=run,
-                    artifact=artifact,
-                    direction=RunArtifact.DIRECTION_IN,
-                    key=key,
-                )
-            except Exception:
-                # Skip if artifact not found (may be external reference)
-                pass
-
         return run
+
+    @strawberry.mutation
+    def cancel_run(self, run_id: strawberry.ID, info: Info) -> RunType:
+        """
+        Cancel a pending or running run.
+
+        Pending runs turn preempted immediately; running runs are preempted in
+        their container and turn preempted once the executing worker settles.
+        """
+        return RunService.cancel(_get_run(run_id))
+
+    @strawberry.mutation
+    def set_run_budget(
+        self, run_id: strawberry.ID, info: Info, tokens: int | None = None, time_s: float | None = None
+    ) -> RunBudgetType:
+        """Update the token and/or wall-time budget of a running run; returns the budgets now in effect."""
+        budgets = RunService.set_budget(_get_run(run_id), tokens=tokens, time_s=time_s)
+        return RunBudgetType(tokens=budgets.get("tokens"), time_s=budgets.get("time_s"))
+
+
+def _get_run(run_id: str) -> Run:
+    try:
+        return Run.objects.get(id=run_id)
+    except (Run.DoesNotExist, ValidationError):
+        raise ValueError(f"Run {run_id} not found")
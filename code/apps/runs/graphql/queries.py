@@ -0,0 +1,99 @@
+"""GraphQL queries for runs."""
+
+from __future__ import annotations
+
+import datetime
+from typing import List
+
+import strawberry
+import strawberry_django
+
+from apps.core.graphql.pagination import DEFAULT_PAGE_SIZE, PageInfo, keyset_page
+from apps.runs import models
+from apps.runs.graphql.types import RunStatsType, RunType
+
+
+@strawberry.type
+class RunConnection:
+    """One page of runs, newest first."""
+
+    page_info: PageInfo
+    ids: strawberry.Private[List]
+
+    @strawberry_django.field
+    def nodes(self) -> List[RunType]:
+        return models.Run.objects.filter(id__in=self.ids).order_by("-started_at", "-id")
+
+
+@strawberry.type
+class RunQuery:
+    """Run queries."""
+
+    @strawberry.field
+    def runs(
+        self,
+        world_id: strawberry.ID | None = None,
+        goal_id: strawberry.ID | None = None,
+        plan_id: strawberry.ID | None = None,
+        ref: str | None = None,
+        after: str | None = None,
+        first: int = DEFAULT_PAGE_SIZE,
+    ) -> RunConnection:
+        """
+        List runs newest first, keyset-paginated on (-started_at, id).
+
+        Each filter matches a (<column>, -started_at) index, so every page is an index range scan.
+        """
+        queryset = models.Run.objects.all()
+        if world_id:
+            queryset = queryset.filter(world_id=world_id)
+        if goal_id:
+            queryset = queryset.filter(goal_id=goal_id)
+        if plan_id:
+            queryset = queryset.filter(plan_id=plan_id)
+        if ref:
+            queryset = queryset.filter(ref=ref)
+
+        ids, page_info = keyset_page(queryset, "started_at", after, first)
+        return RunConnection(page_info=page_info, ids=ids)
+
+    @strawberry_django.field
+    def run(self, id: strawberry.ID) -> RunType | None:
+        """Get run by id."""
+        return models.Run.objects.filter(id=id).first()
+
+    @strawberry.field
+    def run_stats(
+        self,
+        world_id: strawberry.ID | None = None,
+        ref: str | None = None,
+        since: datetime.date | None = None,
+        until: datetime.date | None = None,
+    ) -> List[RunStatsType]:
+        """Daily run statistics per (world, ref), newest day first, read from the RunStat rollup."""
+        rows = _stat_rows(world_id, ref, since, until).order_by("-day", "ref")
+        return [RunStatsType.from_rows([row], str(row.world_id), row.ref, row.day) for row in rows]
+
+    @strawberry.field
+    def run_stats_summary(
+        self,
+        world_id: strawberry.ID | None = None,
+        ref: str | None = None,
+        since: datetime.date | None = None,
+        until: datetime.date | None = None,
+    ) -> RunStatsType:
+        """Run statistics merged over the matching rollup rows (e.g. one tool across all worlds for a week)."""
+        return RunStatsType.from_rows(_stat_rows(world_id, ref, since, until), world_id, ref)
+
+
+def _stat_rows(world_id, ref, since, until):
+    rows = models.RunStat.objects.all()
+    if world_id:
+        rows = rows.filter(world_id=world_id)
+    if ref:
+        rows = rows.filter(ref=ref)
+    if since:
+        rows = rows.filter(day__gte=since)
+    if until:
+        rows = rows.filter(day__lte=until)
+    return rows
@@ -0,0 +1,88 @@
+"""GraphQL subscriptions for runs."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncGenerator
+
+import strawberry
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from apps.runs.event_log import RunEventLog
+from apps.runs.events import RunEvent, is_final, run_events
+from apps.runs.models import Run
+
+TERMINAL_STATUSES = {Run.Status.SUCCEEDED, Run.Status.FAILED, Run.Status.PREEMPTED}
+
+
+@strawberry.type
+class RunEventType:
+    """One run event (Ack, Token, Frame, Log, Event or the final Response)."""
+
+    seq: int
+    kind: str
+    dropped: int  # Token/Frame/Log frames skipped before this one because the client fell behind
+    data: strawberry.scalars.JSON
+
+    @staticmethod
+    def from_event(event: RunEvent) -> RunEventType:
+        return RunEventType(seq=event.seq, kind=event.data.get("kind", ""), dropped=event.dropped, data=event.data)
+
+
+def _read_log(run: Run, after_seq: int) -> list:
+    if not settings.RUN_EVENT_LOG_ENABLED:
+        return []
+    return list(RunEventLog.for_run(run).read(after_seq=after_seq))
+
+
+def _get_run(run_id: str) -> Run:
+    try:
+        return Run.objects.get(id=run_id)
+    except (Run.DoesNotExist, ValidationError):
+        raise ValueError(f"Run {run_id} not found")
+
+
+@strawberry.type
+class RunSubscription:
+    """Run subscriptions."""
+
+    @strawberry.subscription
+    async def run_events(self, run_id: strawberry.ID, after_seq: int = -1) -> AsyncGenerator[RunEventType, None]:
+        """
+        Stream a run's events (those after after_seq) until its final Response.
+
+        Runs executing in this process stream live from the adapter. Others
+        (e.g. claimed by runworker) are replayed, then polled, from the persisted
+        event log, which is the cross-process transport (see apps.runs.events);
+        if no log exists the final Response is sent once the run settles.
+        """
+        run_id = str(run_id)
+        next_seq = after_seq + 1
+        while True:
+            sub = run_events.subscribe(run_id)
+            if sub is not None:
+                try:
+                    async for event in sub:
+                        if event.seq < next_seq:
+                            continue
+                        next_seq = event.seq + 1
+                        yield RunEventType.from_event(event)
+                        if is_final(event.data):
+                            return
+                finally:
+                    run_events.unsubscribe(run_id, sub)
+
+            run = await sync_to_async(_get_run)(run_id)
+            # Status is read before the log: the log is complete before a run turns terminal
+            for seq, data in await sync_to_async(_read_log)(run, next_seq - 1):
+                next_seq = seq + 1
+                yield RunEventType.from_event(RunEvent(seq=seq, dropped=0, data=data))
+                if is_final(data):
+                    return
+            if run.status in TERMINAL_STATUSES:
+                response = await sync_to_async(run.as_response)()
+                yield RunEventType.from_event(RunEvent(seq=next_seq, dropped=0, data=response))
+                return
+            await asyncio.sleep(settings.RUN_EVENTS_POLL_INTERVAL_S)
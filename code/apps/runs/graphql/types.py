@@ -2,11 +2,32 @@
 
 from __future__ import annotations
 
-from typing import List
+import datetime
+from typing import Dict, Iterable, List
 import strawberry
+import strawberry_django
 from strawberry import auto
+from strawberry.types import Info
 
+from apps.artifacts.graphql.types import ArtifactType
 from apps.runs import models
+from apps.tools.graphql.types import ToolType
+from apps.tools.models import Tool
+from apps.worlds.graphql.types import WorldType
+
+
+def _tools_by_ref(info: Info) -> Dict[str, Tool]:
+    """
+    Tools keyed by ref, loaded once per request.
+
+    Run.ref is not a foreign key, so the optimizer cannot join it; the tool
+    registry is small, so one query serves every run in the result.
+    """
+    tools = getattr(info.context, "_tools_by_ref", None)
+    if tools is None:
+        tools = {tool.ref: tool for tool in Tool.objects.all()}
+        info.context._tools_by_ref = tools
+    return tools
 
 
 @strawberry.django.type(models.RunOutput)
@@ -22,6 +43,16 @@ class RunOutputType:
     sha256: auto
 
 
+@strawberry.django.type(models.RunArtifact)
+class RunArtifactType:
+    """RunArtifact GraphQL type (an input or output artifact of a run)."""
+
+    key: auto
+    direction: auto
+    created_at: auto
+    artifact: ArtifactType
+
+
 @strawberry.django.type(models.Run)
 class RunType:
     """Run GraphQL type."""
@@ -41,10 +72,64 @@ class RunType:
     ended_at: auto
     cost_micro: auto
 
-    @strawberry.field
-    def outputs(self) -> List[RunOutputType]:
-        return self.outputs.all()
+    # Relations are batched per query by DjangoOptimizerExtension (select_related / prefetch_related)
+    world: WorldType
+    outputs: List[RunOutputType]
+    artifacts: List[RunArtifactType]
+
+    @strawberry_django.field(only=["ref"])
+    def tool(self, info: Info) -> ToolType | None:
+        return _tools_by_ref(info).get(self.ref)
 
-    @strawberry.field
+    @strawberry_django.field(only=["started_at", "ended_at"])
     def duration_ms(self) -> int:
         return self.duration_ms
+
+
+@strawberry.type
+class RunStatsType:
+    """Run statistics merged from RunStat rollup rows (one day, or a whole range)."""
+
+    world_id: strawberry.ID | None
+    ref: str | None
+    day: datetime.date | None
+    runs: int
+    succeeded: int
+    failed: int
+    error_rate: float
+    cost_micro: int
+    avg_duration_ms: float | None
+    p50_duration_ms: float | None
+    p95_duration_ms: float | None
+
+    @staticmethod
+    def from_rows(
+        rows: Iterable[models.RunStat], world_id: str | None = None, ref: str | None = None, day=None
+    ) -> RunStatsType:
+        from apps.runs import stats
+
+        rows = list(rows)
+        runs = sum(row.runs for row in rows)
+        failed = sum(row.failed for row in rows)
+        histogram = stats.merge(row.latency_histogram for row in rows)
+        return RunStatsType(
+            world_id=world_id,
+            ref=ref,
+            day=day,
+            runs=runs,
+            succeeded=sum(row.succeeded for row in rows),
+            failed=failed,
+            error_rate=failed / runs if runs else 0.0,
+            cost_micro=sum(row.cost_micro for row in rows),
+            avg_duration_ms=sum(row.duration_ms_sum for row in rows) / runs if runs else None,
+            p50_duration_ms=stats.quantile(histogram, 0.5),
+            p95_duration_ms=stats.quantile(histogram, 0.95),
+        )
+
+
+@strawberry.type
+class RunBudgetType:
+    """Budgets in effect for a running run (None = unlimited)."""
+
+    tokens: int | None
+    time_s: float | None
@@ -0,0 +1,64 @@
+"""
+Settle stale runs.
+
+Runs whose worker crashed, whose WebSocket was lost, or that outlived their
+tool's timeout would otherwise stay pending/running forever. Each pass marks
+them preempted or failed in bulk (see apps.runs.reaper) and, unless
+--no-preempt is given, sends preempt control to their containers.
+
+Usage:
+    python manage.py reapruns              # every RUN_REAPER_INTERVAL_S until stopped
+    python manage.py reapruns --once       # one pass, then exit (cron)
+"""
+
+import logging
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.runs.reaper import reap_stale_runs
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Mark runs past their deadline or without a worker heartbeat as preempted / failed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval", type=float, default=settings.RUN_REAPER_INTERVAL_S, help="Seconds between passes"
+        )
+        parser.add_argument("--once", action="store_true", help="Run one pass, then exit")
+        parser.add_argument(
+            "--no-preempt",
+            action="store_false",
+            dest="preempt",
+            default=settings.RUN_REAPER_PREEMPT,
+            help="Only update the database; do not send preempt to containers",
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        if not options["once"]:
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            signal.signal(signal.SIGINT, lambda *_: stop.set())
+            self.stdout.write(f"reapruns: every {options['interval']}s")
+
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                reaped = reap_stale_runs(preempt=options["preempt"])
+            except Exception as e:
+                # Keep reaping on the next pass (e.g. database briefly unavailable)
+                logger.error(f"reapruns.failed: {e}")
+                reaped = {}
+            if options["once"]:
+                summary = ", ".join(f"{count} {reason}" for reason, count in reaped.items())
+                self.stdout.write(self.style.SUCCESS(f"Reaped runs: {summary}"))
+                return
+            if any(reaped.values()):
+                logger.info(f"reapruns.reaped {reaped}")
+            stop.wait(options["interval"])
@@ -0,0 +1,103 @@
+"""
+Execute queued runs.
+
+createRun only enqueues (Run.status=pending). Each worker process claims the
+oldest pending run with SELECT ... FOR UPDATE SKIP LOCKED, invokes the adapter
+and finalizes the run (running -> succeeded | failed), so web workers never
+wait on tool execution.
+
+Usage:
+    python manage.py runworker --concurrency 4
+    python manage.py runworker --once   # drain the queue in-process, then exit
+"""
+
+import logging
+import multiprocessing
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from apps.runs.services import RunService
+
+logger = logging.getLogger(__name__)
+
+
+def work(stop: threading.Event, poll_interval: float, once: bool = False) -> int:
+    """
+    Claim and execute runs until stop is set (or the queue is empty when once=True).
+
+    Returns:
+        Number of runs executed
+    """
+    executed = 0
+    while not stop.is_set():
+        close_old_connections()
+        run = RunService.claim_next()
+        if run is None:
+            if once:
+                break
+            stop.wait(poll_interval)
+            continue
+
+        logger.info(f"runworker.claimed run_id={run.id} ref={run.ref}")
+        try:
+            RunService.execute(run)
+        except Exception as e:
+            # Run is already marked failed; keep the worker alive
+            logger.error(f"runworker.failed run_id={run.id}: {e}")
+        executed += 1
+    return executed
+
+
+def _child(poll_interval: float) -> None:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    work(stop, poll_interval)
+
+
+class Command(BaseCommand):
+    help = "Claim pending runs and execute them in a pool of worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=settings.RUN_WORKER_CONCURRENCY, help="Worker processes")
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.RUN_WORKER_POLL_INTERVAL_S,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument("--once", action="store_true", help="Drain pending runs in-process, then exit")
+
+    def handle(self, *args, **options):
+        poll_interval = options["poll_interval"]
+
+        if options["once"]:
+            executed = work(threading.Event(), poll_interval, once=True)
+            self.stdout.write(self.style.SUCCESS(f"Executed {executed} runs"))
+            return
+
+        # Children must not share the parent's DB connections
+        connections.close_all()
+        ctx = multiprocessing.get_context("fork")
+        procs = [
+            ctx.Process(target=_child, args=(poll_interval,), name=f"runworker-{i}")
+            for i in range(max(1, options["concurrency"]))
+        ]
+        for proc in procs:
+            proc.start()
+        self.stdout.write(f"runworker: {len(procs)} processes, poll every {poll_interval}s")
+
+        def shutdown(*_):
+            # Children finish their current run, then exit
+            for proc in procs:
+                if proc.is_alive():
+                    proc.terminate()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+        for proc in procs:
+            proc.join()
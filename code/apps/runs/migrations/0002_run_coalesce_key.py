@@ -0,0 +1,18 @@
+# Generated by Django 5.1.12 on 2026-10-18 21:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('runs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='run',
+            name='coalesce_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.12 on 2026-10-18 21:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('runs', '0002_run_coalesce_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='run',
+            name='write_prefix',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.12 on 2026-10-18 21:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('runs', '0003_run_write_prefix'),
+        ('worlds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ref', models.CharField(max_length=128)),
+                ('day', models.DateField()),
+                ('runs', models.PositiveIntegerField(default=0)),
+                ('succeeded', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('duration_ms_sum', models.BigIntegerField(default=0)),
+                ('cost_micro', models.BigIntegerField(default=0)),
+                ('latency_histogram', models.JSONField(default=dict)),
+                ('world', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='run_stats', to='worlds.world')),
+            ],
+            options={
+                'db_table': 'run_stat',
+                'indexes': [models.Index(fields=['ref', 'day'], name='run_stat_ref_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('world', 'ref', 'day'), name='run_stat_world_ref_day_unique')],
+            },
+        ),
+    ]
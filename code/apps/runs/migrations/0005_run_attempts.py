@@ -0,0 +1,18 @@
+# Generated by Django 5.1.12 on 2026-10-18 21:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('runs', '0004_run_stat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='run',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
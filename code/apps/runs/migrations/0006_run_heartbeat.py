@@ -0,0 +1,30 @@
+# Generated by Django 5.1.12 on 2026-10-18 21:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0002_initial'),
+        ('goals', '0001_initial'),
+        ('plans', '0001_initial'),
+        ('runs', '0005_run_attempts'),
+        ('worlds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='run',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='run',
+            index=models.Index(fields=['status', 'started_at'], name='run_status_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='run',
+            index=models.Index(fields=['status', 'heartbeat_at'], name='run_status_heartbeat_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.12 on 2026-10-18 22:09
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_running(apps, schema_editor):
+    # Runs in flight during the upgrade: creation time is the best available claim time
+    Run = apps.get_model('runs', 'Run')
+    Run.objects.filter(status='running', claimed_at__isnull=True).update(claimed_at=F('started_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0002_initial'),
+        ('goals', '0001_initial'),
+        ('plans', '0001_initial'),
+        ('runs', '0006_run_heartbeat'),
+        ('worlds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='run',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='run',
+            index=models.Index(fields=['status', 'claimed_at'], name='run_status_claimed_idx'),
+        ),
+        migrations.RunPython(backfill_running, migrations.RunPython.noop),
+    ]
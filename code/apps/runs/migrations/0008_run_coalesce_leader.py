@@ -0,0 +1,19 @@
+# Generated by Django 5.1.12 on 2026-10-18 22:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('runs', '0007_run_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='run',
+            name='coalesce_leader',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='coalesced_runs', to='runs.run'),
+        ),
+    ]
@@ -1,8 +1,11 @@
 # apps/runs/models.py
 import uuid
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Func
 from django.utils import timezone
 
+from apps.core.errors import ERR_PREEMPTED
+
 
 class Run(models.Model):
     class Status(models.TextChoices):
@@ -32,9 +35,21 @@ class Run(models.Model):
     drift_ok = models.BooleanField(default=True)
 
     inputs = models.JSONField(default=dict)  # redacted input snapshot (for audit)
+    write_prefix = models.CharField(max_length=255, blank=True, default="")  # "/{world_id}/{run_id}/"
+
+    # sha256 of (ref, digest, mode, inputs, scope) - identical concurrent runs share one execution
+    coalesce_key = models.CharField(max_length=64, blank=True, default="", db_index=True)
+    # Run whose result this one reuses; a leader points at itself (see RunService._coalesced_response)
+    coalesce_leader = models.ForeignKey(
+        "self", on_delete=models.SET_NULL, null=True, blank=True, related_name="coalesced_runs"
+    )
 
-    started_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(auto_now_add=True)  # creation (enqueue) time
+    claimed_at = models.DateTimeField(null=True, blank=True)  # when a worker (or invoke_tool) began executing
     ended_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)  # last sign of life from the executing worker
+
+    attempts = models.PositiveSmallIntegerField(default=0)  # adapter invocations (retries after transport failures)
 
     cost_micro = models.BigIntegerField(default=0)  # total micro-dollars
 
@@ -44,6 +59,10 @@ class Run(models.Model):
             models.Index(fields=["goal", "-started_at"], name="run_goal_started_idx"),
             models.Index(fields=["plan", "-started_at"], name="run_plan_started_idx"),
             models.Index(fields=["ref", "-started_at"], name="run_ref_started_idx"),
+            # Worker queue and stale-run reaper scans
+            models.Index(fields=["status", "started_at"], name="run_status_started_idx"),
+            models.Index(fields=["status", "heartbeat_at"], name="run_status_heartbeat_idx"),
+            models.Index(fields=["status", "claimed_at"], name="run_status_claimed_idx"),
         ]
         ordering = ["-started_at"]
 
@@ -55,10 +74,17 @@ class Run(models.Model):
     def succeeded(self) -> bool:
         return self.status == self.Status.SUCCEEDED
 
+    @property
+    def idempotency_key(self) -> str:
+        """Stable across retries of this run; tools use it to dedupe side effects."""
+        return f"run:{self.id}"
+
     @property
     def duration_ms(self) -> int:
-        if self.started_at and self.ended_at:
-            return (self.ended_at - self.started_at).total_seconds() * 1000
+        """Execution time: from the claim (queue time excluded) to the end; rows from before claimed_at use started_at."""
+        began = self.claimed_at or self.started_at
+        if began and self.ended_at:
+            return (self.ended_at - began).total_seconds() * 1000
         return 0
 
     @property
@@ -69,8 +95,36 @@ class Run(models.Model):
     def duration_min(self) -> int:
         return self.duration_sec // 60
 
+    def as_response(self) -> dict:
+        """Rebuild the terminal Response envelope from a finalized run."""
+        outputs = {
+            link.key: link.artifact.uri
+            for link in self.artifacts.filter(direction=RunArtifact.DIRECTION_OUT).select_related("artifact")
+        }
+        response = {
+            "kind": "Response",
+            "control": {
+                "run_id": str(self.id),
+                "status": "success" if self.succeeded else "error",
+                "cost_micro": self.cost_micro,
+                "final": True,
+            },
+            "outputs": outputs,
+        }
+        if not self.succeeded:
+            response["error"] = {"code": self.error_code or "UNKNOWN", "message": self.error_message or ""}
+        return response
+
     def finalize(self, response: dict) -> None:
-        """Update run from terminal Response message."""
+        """
+        Update run from terminal Response message.
+
+        Runs as one transaction with a constant number of queries: the run
+        update (conditional on the run still running, see save_terminal), one
+        lookup of already-known output URIs, one bulk insert of new Artifacts
+        (insert-or-keep on (world, uri)), and one bulk insert of the output
+        RunArtifact links.
+        """
         from apps.artifacts.models import Artifact
 
         control = response.get("control", {})
@@ -94,65 +148,98 @@ class Run(models.Model):
             error = response.get("error", {})
             self.error_code = error.get("code", "UNKNOWN")
             self.error_message = error.get("message", "")
+            if self.error_code == ERR_PREEMPTED:
+                self.status = self.Status.PREEMPTED
 
-        self.save()
-
-        # Create Artifact + RunArtifact records for each output
         # Outputs now dict: {key: uri, ...}
         outputs = response.get("outputs", {})
-        for key, uri in outputs.items():
-            # Parse URI to determine if scalar or file
-            is_scalar = "?data=" in uri
-
-            if is_scalar:
-                # Scalar artifact - extract data from URI
-                from libs.runtime_common.hydration import resolve_artifact_uri
-
-                data = resolve_artifact_uri(uri)
-
-                artifact, created = Artifact.objects.get_or_create(
-                    world=self.world,
-                    uri=uri,
-                    defaults={
-                        "path": "",
-                        "data": data,
-                        "is_scalar": True,
-                        "content_type": "application/json" if isinstance(data, (dict, list)) else "text/plain",
-                    },
-                )
-            else:
-                # File artifact - extract path from URI
-                # URI format: world://world_id/run_id/path or local://run_id/path
-                if uri.startswith("world://"):
-                    path_part = uri.split("://", 1)[1]
-                    parts = path_part.split("/", 2)
-                    path = parts[2] if len(parts) > 2 else key
-                elif uri.startswith("local://"):
-                    path_part = uri.split("://", 1)[1]
-                    parts = path_part.split("/", 1)
-                    path = parts[1] if len(parts) > 1 else key
-                else:
-                    path = key
-
-                artifact, created = Artifact.objects.get_or_create(
-                    world=self.world,
-                    uri=uri,
-                    defaults={
-                        "path": f"{self.world.id}/{self.id}/{path}",
-                        "data": None,
-                        "is_scalar": False,
-                        "content_type": "application/octet-stream",
-                    },
+
+        with transaction.atomic():
+            if not self.save_terminal():
+                return
+            RunStat.record(self)
+            if not outputs:
+                return
+
+            uris = set(outputs.values())
+            by_uri = {a.uri: a for a in Artifact.objects.filter(world_id=self.world_id, uri__in=uris)}
+
+            # Only outputs not seen before are parsed and inserted; concurrent inserts of the same URI are ignored
+            missing = [uri for uri in dict.fromkeys(outputs.values()) if uri not in by_uri]
+            if missing:
+                keys = {uri: key for key, uri in outputs.items()}
+                Artifact.objects.bulk_create(
+                    [self._output_artifact(keys[uri], uri) for uri in missing], ignore_conflicts=True
                 )
+                by_uri.update((a.uri, a) for a in Artifact.objects.filter(world_id=self.world_id, uri__in=missing))
+
+            # Link to run as outputs
+            RunArtifact.objects.bulk_create(
+                [
+                    RunArtifact(run=self, artifact=by_uri[uri], direction=RunArtifact.DIRECTION_OUT, key=key)
+                    for key, uri in outputs.items()
+                ]
+            )
+
+    def save_terminal(self) -> bool:
+        """
+        Persist this run's terminal fields, only if the row is still running.
+
+        The reaper or a cancel may have settled the run while a worker was
+        executing it; that outcome wins, this instance is reloaded from the
+        row, and False is returned so the caller skips outputs and RunStat.
+        """
+        settled = Run.objects.filter(id=self.id, status=self.Status.RUNNING).update(
+            status=self.status,
+            ended_at=self.ended_at,
+            cost_micro=self.cost_micro,
+            error_code=self.error_code,
+            error_message=self.error_message,
+        )
+        if not settled:
+            self.refresh_from_db()
+        return bool(settled)
+
+    def _output_artifact(self, key: str, uri: str):
+        """Unsaved Artifact for an output URI (scalar if data is inlined in the URI)."""
+        from apps.artifacts.models import Artifact
 
-            # Link to run as output
-            RunArtifact.objects.create(
-                run=self,
-                artifact=artifact,
-                direction=RunArtifact.DIRECTION_OUT,
-                key=key,
+        if "?data=" in uri:
+            # Scalar artifact - extract data from URI
+            from libs.runtime_common.hydration import resolve_artifact_uri
+
+            data = resolve_artifact_uri(uri)
+            return Artifact(
+                world_id=self.world_id,
+                uri=uri,
+                path="",
+                data=data,
+                is_scalar=True,
+                content_type="application/json" if isinstance(data, (dict, list)) else "text/plain",
             )
 
+        # File artifact - extract path from URI
+        # URI format: world://world_id/run_id/path or local://run_id/path
+        if uri.startswith("world://"):
+            path_part = uri.split("://", 1)[1]
+            parts = path_part.split("/", 2)
+            path = parts[2] if len(parts) > 2 else key
+        elif uri.startswith("local://"):
+            path_part = uri.split("://", 1)[1]
+            parts = path_part.split("/", 1)
+            path = parts[1] if len(parts) > 1 else key
+        else:
+            path = key
+
+        return Artifact(
+            world_id=self.world_id,
+            uri=uri,
+            path=f"{self.world_id}/{self.id}/{path}",
+            data=None,
+            is_scalar=False,
+            content_type="application/octet-stream",
+        )
+
 
 class RunArtifact(models.Model):
     """
@@ -189,6 +276,109 @@ class RunArtifact(models.Model):
         return f"{self.run.id}:{self.direction}:{self.key}"
 
 
+class RunStat(models.Model):
+    """
+    Rollup of finished runs per (world, ref, day), maintained by Run.finalize.
+
+    Dashboards read these rows instead of scanning Run. latency_histogram is a
+    sparse log-bucket histogram (apps.runs.stats) that merges across rows by
+    adding counts.
+    """
+
+    world = models.ForeignKey("worlds.World", on_delete=models.CASCADE, related_name="run_stats")
+    ref = models.CharField(max_length=128)
+    day = models.DateField()
+
+    runs = models.PositiveIntegerField(default=0)
+    succeeded = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    duration_ms_sum = models.BigIntegerField(default=0)
+    cost_micro = models.BigIntegerField(default=0)
+    latency_histogram = models.JSONField(default=dict)
+
+    class Meta:
+        db_table = "run_stat"
+        constraints = [models.UniqueConstraint(fields=["world", "ref", "day"], name="run_stat_world_ref_day_unique")]
+        indexes = [models.Index(fields=["ref", "day"], name="run_stat_ref_day_idx")]
+
+    def __str__(self):
+        return f"RunStat({self.ref} {self.day}) runs={self.runs}"
+
+    @property
+    def error_rate(self) -> float:
+        return self.failed / self.runs if self.runs else 0.0
+
+    def quantile_ms(self, q: float) -> float | None:
+        from apps.runs import stats
+
+        return stats.quantile(self.latency_histogram, q)
+
+    @classmethod
+    def record(cls, run: Run) -> None:
+        """
+        Fold a finished run into its (world, ref, day) row. Call inside the finalize transaction.
+
+        One UPDATE of F() increments (the histogram bucket is incremented by the
+        database too), so concurrent finalizes of a bucket never read-modify-write
+        it. The first run of a bucket inserts the row instead.
+        """
+        from apps.runs import stats
+
+        day = (run.ended_at or timezone.now()).date()
+        duration_ms = int(run.duration_ms)
+        succeeded = int(run.status == Run.Status.SUCCEEDED)
+        cost_micro = run.cost_micro or 0
+
+        bucket = cls.objects.filter(world_id=run.world_id, ref=run.ref, day=day)
+        increments = {
+            "runs": F("runs") + 1,
+            "succeeded": F("succeeded") + succeeded,
+            "failed": F("failed") + (1 - succeeded),
+            "duration_ms_sum": F("duration_ms_sum") + duration_ms,
+            "cost_micro": F("cost_micro") + cost_micro,
+            "latency_histogram": _JSONIncrement("latency_histogram", str(stats.bucket_of(duration_ms))),
+        }
+        if bucket.update(**increments):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    world_id=run.world_id,
+                    ref=run.ref,
+                    day=day,
+                    runs=1,
+                    succeeded=succeeded,
+                    failed=1 - succeeded,
+                    duration_ms_sum=duration_ms,
+                    cost_micro=cost_micro,
+                    latency_histogram=stats.add({}, duration_ms),
+                )
+        except IntegrityError:
+            # A concurrent finalize inserted the row first
+            bucket.update(**increments)
+
+
+class _JSONIncrement(Func):
+    """json_column[key] + 1, computed by the database so it is atomic within an UPDATE."""
+
+    output_field = models.JSONField()
+
+    def __init__(self, column: str, key: str):
+        super().__init__(F(column))
+        self.key = key
+
+    def as_sql(self, compiler, connection, **extra_context):
+        column, params = compiler.compile(self.source_expressions[0])
+        path = f'$."{self.key}"'
+        sql = f"json_set({column}, %s, COALESCE(json_extract({column}, %s), 0) + 1)"
+        return sql, (*params, path, *params, path)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        column, params = compiler.compile(self.source_expressions[0])
+        sql = f"jsonb_set({column}, %s, to_jsonb(COALESCE(({column} ->> %s)::bigint, 0) + 1))"
+        return sql, (*params, [self.key], *params, self.key)
+
+
 # Legacy model - to be removed after migration
 class RunOutput(models.Model):
     """Tracks one file artifact produced by a Run."""
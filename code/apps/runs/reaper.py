@@ -0,0 +1,168 @@
+"""
+Run liveness: worker heartbeats and the stale-run reaper.
+
+A worker executing a run touches Run.heartbeat_at every
+RUN_HEARTBEAT_INTERVAL_S. `manage.py reapruns` periodically settles runs that
+can no longer finish on their own:
+
+    running, past the tool's deadline   -> preempted (ERR_DEADLINE_EXCEEDED)
+    running, no heartbeat for a while   -> failed    (ERR_HEARTBEAT_LOST)
+    pending, never claimed              -> failed    (ERR_QUEUE_TIMEOUT)
+
+The deadline is Tool.timeout_s for every retry attempt the tool's policy
+allows, plus the backoff between attempts and RUN_DEADLINE_GRACE_S, counted
+from Run.claimed_at (when execution began, so queue time does not count).
+Each class of stale runs is one indexed scan on (status, claimed_at),
+(status, heartbeat_at) or (status, started_at) and one bulk UPDATE. Reaped
+running runs are optionally preempted in their container, so they stop
+spending.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.errors import ERR_DEADLINE_EXCEEDED, ERR_HEARTBEAT_LOST, ERR_QUEUE_TIMEOUT
+from apps.runs.models import Run, RunStat
+
+logger = logging.getLogger(__name__)
+
+# Timeout of runs whose tool is not registered (matches the adapter's presign expiry fallback)
+DEFAULT_TIMEOUT_S = 3600
+
+
+class RunHeartbeat:
+    """Background thread touching Run.heartbeat_at while a run executes (start() / stop())."""
+
+    def __init__(self, run_id, interval_s: float | None = None):
+        self.run_id = run_id
+        self.interval_s = settings.RUN_HEARTBEAT_INTERVAL_S if interval_s is None else interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat:{run_id}", daemon=True)
+
+    def start(self) -> RunHeartbeat:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self.interval_s):
+                try:
+                    Run.objects.filter(id=self.run_id, status=Run.Status.RUNNING).update(heartbeat_at=timezone.now())
+                except Exception as e:
+                    logger.error(f"Heartbeat for run {self.run_id} failed: {e}")
+        finally:
+            # The thread's own DB connection
+            connection.close()
+
+
+def reap_stale_runs(now: datetime.datetime | None = None, preempt: bool | None = None) -> Dict[str, int]:
+    """
+    Settle stale runs in bulk.
+
+    Args:
+        now: Reference time (default: now)
+        preempt: Send preempt control to the containers of reaped running runs (default: RUN_REAPER_PREEMPT)
+
+    Returns:
+        Number of runs reaped per reason: {"deadline": n, "heartbeat": n, "pending": n}
+    """
+    now = now or timezone.now()
+    preempt = settings.RUN_REAPER_PREEMPT if preempt is None else preempt
+
+    heartbeat_cutoff = now - datetime.timedelta(seconds=settings.RUN_HEARTBEAT_TIMEOUT_S)
+    pending_cutoff = now - datetime.timedelta(seconds=settings.RUN_PENDING_TIMEOUT_S)
+
+    past_deadline = _reap(
+        Run.Status.RUNNING,
+        _past_deadline(now),
+        Run.Status.PREEMPTED,
+        ERR_DEADLINE_EXCEEDED,
+        "Run exceeded its deadline",
+        now,
+    )
+    lost = _reap(
+        Run.Status.RUNNING,
+        Q(heartbeat_at__lt=heartbeat_cutoff) | Q(heartbeat_at__isnull=True, claimed_at__lt=heartbeat_cutoff),
+        Run.Status.FAILED,
+        ERR_HEARTBEAT_LOST,
+        "Worker stopped sending heartbeats",
+        now,
+    )
+    unclaimed = _reap(
+        Run.Status.PENDING,
+        Q(started_at__lt=pending_cutoff),
+        Run.Status.FAILED,
+        ERR_QUEUE_TIMEOUT,
+        "No worker claimed the run",
+        now,
+    )
+
+    if preempt:
+        for run in past_deadline + lost:
+            _preempt(run)
+
+    return {"deadline": len(past_deadline), "heartbeat": len(lost), "pending": len(unclaimed)}
+
+
+def _past_deadline(now: datetime.datetime) -> Q:
+    """Running runs claimed longer ago than their tool's deadline: one claimed_at range per distinct deadline."""
+    from apps.runs.retry import RetryPolicy
+    from apps.tools.models import Tool
+
+    refs_by_deadline: Dict[float, List[str]] = defaultdict(list)
+    for ref, timeout_s, retry_policy in Tool.objects.values_list("ref", "timeout_s", "retry_policy"):
+        policy = RetryPolicy.from_config(settings.RUN_RETRY_DEFAULTS, retry_policy)
+        attempts = max(1, policy.max_attempts)
+        refs_by_deadline[timeout_s * attempts + policy.max_delay_s * (attempts - 1)].append(ref)
+
+    grace = settings.RUN_DEADLINE_GRACE_S
+    # Runs of unregistered tools get DEFAULT_TIMEOUT_S
+    known_refs = [ref for refs in refs_by_deadline.values() for ref in refs]
+    condition = ~Q(ref__in=known_refs) & Q(claimed_at__lt=now - datetime.timedelta(seconds=DEFAULT_TIMEOUT_S + grace))
+    for deadline_s, refs in refs_by_deadline.items():
+        condition |= Q(ref__in=refs, claimed_at__lt=now - datetime.timedelta(seconds=deadline_s + grace))
+    return condition
+
+
+def _reap(status: str, condition: Q, new_status: str, error_code: str, message: str, now) -> List[Run]:
+    """Move runs in status matching condition to new_status in one UPDATE; returns the reaped runs."""
+    with transaction.atomic():
+        # Rows a worker is settling right now are skipped; the next pass sees them terminal
+        runs = list(Run.objects.select_for_update(skip_locked=True).filter(condition, status=status))
+        if not runs:
+            return []
+        Run.objects.filter(id__in=[run.id for run in runs], status=status).update(
+            status=new_status, error_code=error_code, error_message=message, ended_at=now
+        )
+        for run in runs:
+            run.status, run.error_code, run.error_message, run.ended_at = new_status, error_code, message, now
+            # Runs that executed count in the per-day rollups; never-claimed ones have no latency to record
+            if status == Run.Status.RUNNING:
+                RunStat.record(run)
+    for run in runs:
+        logger.warning(f"Reaped run {run.id} ({run.ref}): {status} -> {new_status} [{error_code}]")
+    return runs
+
+
+def _preempt(run: Run) -> None:
+    """Best-effort preempt of a reaped run in its container (it may already be gone)."""
+    from apps.core.utils.adapters import get_adapter_for_run
+
+    try:
+        get_adapter_for_run(run.adapter).control_run(run, {"op": "preempt"})
+    except Exception as e:
+        logger.info(f"Preempt of reaped run {run.id} skipped: {e}")
@@ -0,0 +1,74 @@
+"""
+Retry policy for tool invocations.
+
+Only transport failures are retried (TransportError: connect failures,
+handshake timeouts, unexpected WebSocket closes). A Response with
+status="error" is the tool's answer and is final, and a tool that outlives
+its deadline (ToolTimeoutError) is not run again. Every attempt sends the
+run's idempotency key so a container that already acted on an earlier
+attempt can dedupe.
+
+Policy sources, later ones overriding earlier keys:
+    settings.RUN_RETRY_DEFAULTS
+    registry.yaml runtime.retry        (Tool.retry_policy, synced by toolctl)
+    WorldTool.config["retry"]          (per-world override)
+
+Keys: max_attempts, base_delay_s, max_delay_s, multiplier.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, fields
+from typing import Any, Dict
+
+from django.conf import settings
+
+from apps.core.adapters.base_ws_adapter import TransportError
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay_s: float = 1.0
+    max_delay_s: float = 30.0
+    multiplier: float = 2.0
+
+    @classmethod
+    def from_config(cls, *configs: Dict[str, Any] | None) -> RetryPolicy:
+        """Policy from config dicts merged left to right (unknown keys ignored)."""
+        merged: Dict[str, Any] = {}
+        for config in configs:
+            merged.update(config or {})
+        known = {f.name for f in fields(cls)}
+        values = {}
+        for key, value in merged.items():
+            if key in known:
+                values[key] = int(value) if key == "max_attempts" else float(value)
+        return cls(**values)
+
+    @classmethod
+    def for_run(cls, run) -> RetryPolicy:
+        """Effective policy for run's tool in run's world."""
+        from apps.tools.models import Tool, WorldTool
+
+        tool_policy = Tool.objects.filter(ref=run.ref).values_list("retry_policy", flat=True).first()
+        world_config = (
+            WorldTool.objects.filter(world_id=run.world_id, tool__ref=run.ref).values_list("config", flat=True).first()
+        )
+        return cls.from_config(settings.RUN_RETRY_DEFAULTS, tool_policy, (world_config or {}).get("retry"))
+
+    def delay(self, attempt: int, rng: random.Random | None = None) -> float:
+        """
+        Seconds to wait after failed attempt number attempt (1-based).
+
+        Full jitter: uniform in [0, min(max_delay_s, base_delay_s * multiplier ** (attempt - 1))],
+        so workers retrying after a shared outage spread out instead of reconnecting in lockstep.
+        """
+        cap = min(self.max_delay_s, self.base_delay_s * self.multiplier ** (attempt - 1))
+        return (rng or random).uniform(0, cap)
+
+
+def is_transport_error(error: BaseException) -> bool:
+    """Whether error is a retryable transport failure (as opposed to a tool or protocol error)."""
+    return isinstance(error, TransportError | OSError)
@@ -1,9 +1,21 @@
 """RunService - single entrypoint for tool invocation."""
 
-from apps.runs.models import Run
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.core.errors import ERR_PREEMPTED
+from apps.core.singleflight import advisory_lock, coalesce_key
+from apps.runs.models import Run, RunArtifact, RunStat
 from apps.worlds.models import World
 from apps.agents.models import Agent
 
+logger = logging.getLogger(__name__)
+
 
 class RunService:
     """Orchestrates tool invocation: auth, create Run, invoke adapter, finalize."""
@@ -20,7 +32,7 @@ class RunService:
         run_id: str | None = None,
     ) -> Run:
         """
-        Invoke a tool and return the finalized Run.
+        Invoke a tool synchronously and return the finalized Run.
 
         Args:
             world: World context
@@ -34,40 +46,361 @@ class RunService:
         Returns:
             Run instance (finalized with outputs)
         """
+        # Created running: a pending row would be claimable by runworker before this call executes it
+        run = RunService.enqueue(
+            world, agent, tool_ref, inputs, adapter, mode, run_id=run_id, status=Run.Status.RUNNING
+        )
+        return RunService.execute(run)
+
+    @staticmethod
+    def enqueue(
+        world: World,
+        agent: Agent,
+        tool_ref: str,
+        inputs: dict,
+        adapter: str,
+        mode: str,
+        *,
+        run_id: str | None = None,
+        status: str = Run.Status.PENDING,
+    ) -> Run:
+        """
+        Create a pending Run for a worker to pick up (see `manage.py runworker`).
+
+        Same arguments as invoke_tool, plus:
+            status: PENDING (default) to queue the run; RUNNING when the caller executes it
+                itself (invoke_tool), so no worker can claim it
+
+        Returns:
+            Run instance with the given status
+        """
         import uuid
 
         # Generate run ID
         if not run_id:
             run_id = str(uuid.uuid4())
 
+        # Identical concurrent invocations in the same world share one execution
+        key = ""
+        if settings.TOOL_COALESCE_ENABLED:
+            key = coalesce_key(
+                tool_ref, RunService._tool_digests(tool_ref), mode, inputs, scope=f"{world.id}:{adapter}"
+            )
+
         # Create Run with world-scoped path (world_id is security boundary)
         write_prefix = f"/{world.id}/{run_id}/"
-        run = Run.objects.create(
-            id=run_id,
-            world=world,
-            caller_agent=agent,
-            ref=tool_ref,
-            mode=mode,
-            adapter=adapter,
-            status=Run.Status.PENDING,
-            write_prefix=write_prefix,
-            inputs=inputs,
+        now = timezone.now()
+        with transaction.atomic():
+            run = Run.objects.create(
+                id=run_id,
+                world=world,
+                caller_agent=agent,
+                ref=tool_ref,
+                mode=mode,
+                adapter=adapter,
+                status=status,
+                claimed_at=now if status == Run.Status.RUNNING else None,
+                heartbeat_at=now if status == Run.Status.RUNNING else None,
+                write_prefix=write_prefix,
+                inputs=inputs,
+                coalesce_key=key,
+            )
+            # Lineage exists before any worker can claim the run
+            RunService._link_inputs(run, inputs)
+        return run
+
+    @staticmethod
+    def _link_inputs(run: Run, inputs: dict) -> None:
+        """
+        Link input artifacts to the run (one uri__in query, one bulk insert).
+
+        Inputs that are not artifacts of the run's world (external references,
+        literals) are skipped.
+        """
+        from apps.artifacts.models import Artifact
+
+        uris = {value for value in inputs.values() if isinstance(value, str)}
+        if not uris:
+            return
+        by_uri = dict(Artifact.objects.filter(world_id=run.world_id, uri__in=uris).values_list("uri", "id"))
+        RunArtifact.objects.bulk_create(
+            [
+                RunArtifact(run=run, artifact_id=by_uri[uri], direction=RunArtifact.DIRECTION_IN, key=key)
+                for key, uri in inputs.items()
+                if isinstance(uri, str) and uri in by_uri
+            ]
         )
 
+    @staticmethod
+    def claim_next() -> Run | None:
+        """
+        Claim the oldest pending run and mark it running.
+
+        Uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers never block
+        on, or claim, the same row. The conditional update keeps claims exclusive
+        on databases without row locks (SQLite).
+
+        Returns:
+            Claimed Run, or None if the queue is empty
+        """
+        with transaction.atomic():
+            run = (
+                Run.objects.select_for_update(skip_locked=True)
+                .filter(status=Run.Status.PENDING)
+                .order_by("started_at")
+                .first()
+            )
+            if run is None:
+                return None
+            now = timezone.now()
+            claimed = Run.objects.filter(id=run.id, status=Run.Status.PENDING).update(
+                status=Run.Status.RUNNING, claimed_at=now, heartbeat_at=now
+            )
+            if not claimed:
+                return None
+        run.status = Run.Status.RUNNING
+        run.claimed_at = run.heartbeat_at = now
+        return run
+
+    @staticmethod
+    def execute(run: Run) -> Run:
+        """
+        Invoke the adapter for a claimed run and finalize it.
+
+        Run.heartbeat_at is refreshed while the adapter runs, so the reaper
+        (apps.runs.reaper) can tell a slow run from one whose worker died.
+
+        Returns:
+            Run instance (succeeded or failed); adapter errors are re-raised after the run is marked failed
+        """
         # Get adapter and invoke
         from apps.core.utils.adapters import get_adapter_for_run
+        from apps.runs.event_log import RunEventLogWriter, events_prefix
+        from apps.runs.events import run_events
+        from apps.runs.reaper import RunHeartbeat
 
-        adapter_impl = get_adapter_for_run(adapter)
+        run_id = str(run.id)
+        log = RunEventLogWriter(events_prefix(run)) if settings.RUN_EVENT_LOG_ENABLED else None
 
-        try:
-            # Adapter handles full invocation and returns envelope
-            envelope = adapter_impl.invoke_run(run)
+        def on_event(event):
+            run_events.publish(run_id, event)
+            if log is not None:
+                log.append(event)
+
+        def settle(envelope):
+            # Persist the whole event log before the run turns terminal, so readers never see it truncated
+            if log is not None:
+                log.close()
             run.finalize(envelope)
+
+        run_events.begin(run_id)
+        heartbeat = RunHeartbeat(run.id).start()
+        try:
+            adapter_impl = get_adapter_for_run(run.adapter)
+            if run.coalesce_key:
+                # Cross-process: identical runs elect one leader; followers wait for and reuse its result
+                envelope = RunService._coalesced_response(run)
+                if envelope is not None:
+                    on_event(envelope)
+                else:
+                    envelope = RunService._invoke_with_retry(adapter_impl, run, on_event)
+                settle(envelope)
+            else:
+                # Adapter handles full invocation and returns envelope
+                envelope = RunService._invoke_with_retry(adapter_impl, run, on_event)
+                settle(envelope)
         except Exception as e:
+            if log is not None:
+                log.close()
             # Mark run as failed
             run.status = Run.Status.FAILED
             run.error_message = str(e)
-            run.save()
+            run.ended_at = timezone.now()
+            with transaction.atomic():
+                if run.save_terminal():
+                    RunStat.record(run)
             raise
+        finally:
+            heartbeat.stop()
+            run_events.end(run_id)
 
         return run
+
+    @staticmethod
+    def _invoke_with_retry(adapter_impl, run: Run, on_event) -> dict:
+        """
+        Invoke the adapter, retrying transport failures per the tool's RetryPolicy.
+
+        Each attempt is counted on Run.attempts; tool errors and exhausted retries propagate.
+        """
+        from apps.runs.retry import RetryPolicy, is_transport_error
+
+        policy = RetryPolicy.for_run(run)
+        while True:
+            run.attempts += 1
+            Run.objects.filter(id=run.id).update(attempts=run.attempts)
+            try:
+                return adapter_impl.invoke_run(run, on_event=on_event)
+            except Exception as e:
+                if not is_transport_error(e) or run.attempts >= policy.max_attempts:
+                    raise
+                delay = policy.delay(run.attempts)
+                logger.warning(f"Run {run.id} attempt {run.attempts} failed ({e}); retrying in {delay:.1f}s")
+                on_event(
+                    {
+                        "kind": "Event",
+                        "content": {"type": "retry", "attempt": run.attempts, "delay_s": delay, "error": str(e)},
+                    }
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    def cancel(run: Run) -> Run:
+        """
+        Cancel a pending or running run.
+
+        Pending runs are marked preempted before any worker claims them. Running
+        runs get a preempt control op: the container stops the tool and settles
+        the client with an ERR_PREEMPTED Response, which the executing worker
+        finalizes as preempted. If the container cannot be reached, nothing
+        would ever settle the run, so it is marked preempted here (a worker
+        finishing it later keeps that status).
+
+        Returns:
+            Run instance (preempted if it was pending or its container is unreachable;
+            still running until the worker finalizes otherwise)
+        """
+        cancelled = Run.objects.filter(id=run.id, status=Run.Status.PENDING).update(
+            status=Run.Status.PREEMPTED,
+            error_code=ERR_PREEMPTED,
+            error_message="Cancelled before start",
+            ended_at=timezone.now(),
+        )
+        if cancelled:
+            run.refresh_from_db()
+            return run
+        try:
+            RunService._control(run, {"op": "preempt"})
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.warning(f"Preempt of run {run.id} failed, marking it preempted: {e}")
+            run.status, run.error_code = Run.Status.PREEMPTED, ERR_PREEMPTED
+            run.error_message, run.ended_at = f"Cancelled; container unreachable: {e}", timezone.now()
+            with transaction.atomic():
+                if run.save_terminal():
+                    RunStat.record(run)
+        return run
+
+    @staticmethod
+    def set_budget(run: Run, tokens: int | None = None, time_s: float | None = None) -> dict:
+        """
+        Update the token and/or wall-time budget of a running run.
+
+        Returns:
+            Budgets now in effect in the container ({"tokens": ..., "time_s": ...})
+        """
+        content = {"op": "set_budget"}
+        if tokens is not None:
+            content["tokens"] = tokens
+        if time_s is not None:
+            content["time_s"] = time_s
+        event = RunService._control(run, content)
+        return event.get("content", {}).get("budgets") or {}
+
+    @staticmethod
+    def _control(run: Run, content: dict) -> dict:
+        """Apply a control op to the container executing run; returns its acknowledging Event."""
+        from apps.core.utils.adapters import get_adapter_for_run
+
+        run.refresh_from_db(fields=["status"])
+        if run.status != Run.Status.RUNNING:
+            raise ValueError(f"Run {run.id} is {run.status}, not running")
+        return get_adapter_for_run(run.adapter).control_run(run, content)
+
+    @staticmethod
+    def _tool_digests(tool_ref: str) -> str:
+        """Pinned image digests for a tool (part of the coalesce key so redeploys never share runs)."""
+        from apps.tools.models import Tool
+
+        digests = Tool.objects.filter(ref=tool_ref).values_list("digest_amd64", "digest_arm64").first()
+        return "|".join(digests) if digests else ""
+
+    @staticmethod
+    def _coalesced_response(run: Run) -> dict | None:
+        """
+        Response to reuse for run from an identical run (its coalesce leader).
+
+        Elects the leader under the advisory lock, which is held only for the
+        election: an identical run that succeeded since run was enqueued, or one
+        executing right now, or else run itself. Followers then poll the
+        leader's status without holding anything. If the leader fails, the
+        election is held again: the first follower to get the lock leads, and
+        the others (and newly started identical runs) follow it.
+
+        Returns:
+            The leader's Response; run's own terminal Response if run was settled
+            (cancelled, reaped) while waiting; None if run must execute itself
+        """
+        while True:
+            with advisory_lock(run.coalesce_key), transaction.atomic():
+                leader = RunService._succeeded_leader(run)
+                if leader is not None:
+                    return RunService._reuse(leader)
+                leader_id = (
+                    Run.objects.filter(
+                        coalesce_key=run.coalesce_key, status=Run.Status.RUNNING, coalesce_leader=F("id")
+                    )
+                    .exclude(id=run.id)
+                    .values_list("id", flat=True)
+                    .first()
+                ) or run.id
+                Run.objects.filter(id=run.id).update(coalesce_leader_id=leader_id)
+            if str(leader_id) == str(run.id):
+                return None
+
+            logger.info(f"Run {run.id} waits for coalesce leader {leader_id}")
+            response = RunService._await_leader(run, leader_id)
+            if response is not None:
+                return response
+
+    @staticmethod
+    def _await_leader(run: Run, leader_id) -> dict | None:
+        """Poll until run or its leader settles; None if the leader ended without succeeding."""
+        while True:
+            time.sleep(settings.TOOL_COALESCE_POLL_INTERVAL_S)
+            statuses = {
+                str(id_): status
+                for id_, status in Run.objects.filter(id__in=[run.id, leader_id]).values_list("id", "status")
+            }
+            if statuses.get(str(run.id)) != Run.Status.RUNNING:
+                run.refresh_from_db()
+                return run.as_response()
+            if statuses.get(str(leader_id)) == Run.Status.SUCCEEDED:
+                return RunService._reuse(Run.objects.get(id=leader_id))
+            if statuses.get(str(leader_id)) != Run.Status.RUNNING:
+                # Leader failed, was preempted or deleted
+                return None
+
+    @staticmethod
+    def _succeeded_leader(run: Run) -> Run | None:
+        """An identical run that succeeded after run was enqueued."""
+        return (
+            Run.objects.filter(
+                coalesce_key=run.coalesce_key,
+                status=Run.Status.SUCCEEDED,
+                ended_at__gte=run.started_at,
+            )
+            .exclude(id=run.id)
+            .order_by("-ended_at")
+            .first()
+        )
+
+    @staticmethod
+    def _reuse(leader: Run) -> dict:
+        """Leader's Response as a follower's own."""
+        response = leader.as_response()
+        # Followers did not spend anything; keep the leader's id for lineage
+        response["control"]["cost_micro"] = 0
+        response["control"]["coalesced_from"] = str(leader.id)
+        return response
@@ -11,7 +11,7 @@ class ToolAdmin(admin.ModelAdmin):
 
     fieldsets = (
         ("Identity", {"fields": ("ref", "name", "namespace", "version", "enabled")}),
-        ("Runtime", {"fields": ("timeout_s", "cpu", "memory_gb", "gpu")}),
+        ("Runtime", {"fields": ("timeout_s", "cpu", "memory_gb", "gpu", "retry_policy")}),
         ("Images", {"fields": ("digest_amd64", "digest_arm64")}),
         ("Schema", {"fields": ("inputs_schema", "outputs_decl")}),
     )
@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import List
 
 import strawberry
+import strawberry_django
 
 from apps.tools import models
 from apps.tools.graphql.types import ToolType
@@ -14,7 +15,7 @@ from apps.tools.graphql.types import ToolType
 class ToolQuery:
     """Tool queries."""
 
-    @strawberry.field
+    @strawberry_django.field
     def tools(self) -> List[ToolType]:
         """List all tools."""
         return models.Tool.objects.all()
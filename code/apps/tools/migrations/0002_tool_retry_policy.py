@@ -0,0 +1,18 @@
+# Generated by Django 5.1.12 on 2026-10-18 21:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tool',
+            name='retry_policy',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
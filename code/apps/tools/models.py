@@ -50,6 +50,8 @@ class Tool(models.Model):
     cpu = models.CharField(max_length=8, blank=True, default="1")
     memory_gb = models.PositiveIntegerField(default=2)
     gpu = models.CharField(max_length=32, blank=True, default="")  # e.g., "A10G", "T4", or empty
+    # registry.yaml runtime.retry, e.g. {"max_attempts": 3, "base_delay_s": 1.0} (see apps.runs.retry)
+    retry_policy = models.JSONField(default=dict, blank=True)
 
     class Meta:
         unique_together = [("namespace", "name", "version")]
@@ -74,7 +76,9 @@ class WorldTool(models.Model):
     tool = models.ForeignKey("tools.Tool", on_delete=models.CASCADE, related_name="world_bindings")
 
     # Optional per-world overrides
-    config = models.JSONField(default=dict, blank=True)  # e.g., tuned defaults for params
+    config = models.JSONField(
+        default=dict, blank=True
+    )  # e.g., tuned defaults for params; "retry" overrides Tool.retry_policy
     quota_micro = models.BigIntegerField(null=True, blank=True)  # optional per-world budget cap for this tool
 
     enabled = models.BooleanField(default=True)
@@ -0,0 +1,18 @@
+"""GraphQL types for worlds."""
+
+from __future__ import annotations
+
+import strawberry
+from strawberry import auto
+
+from apps.worlds import models
+
+
+@strawberry.django.type(models.World)
+class WorldType:
+    """World GraphQL type."""
+
+    id: auto
+    name: auto
+    title: auto
+    description: auto
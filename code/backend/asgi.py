@@ -3,4 +3,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings.development")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up (the schema imports models)
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from django.urls import re_path  # noqa: E402
+from strawberry.channels import GraphQLWSConsumer  # noqa: E402
+
+from backend.schema import schema  # noqa: E402
+
+# HTTP stays on Django (GraphQLView at /graphql/); GraphQL subscriptions use WebSocket on the same path
+application = ProtocolTypeRouter(
+    {
+        "http": django_application,
+        "websocket": URLRouter([re_path(r"^graphql/?$", GraphQLWSConsumer.as_asgi(schema=schema))]),
+    }
+)
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import strawberry
+from strawberry_django.optimizer import DjangoOptimizerExtension
 
+from apps.artifacts.graphql.queries import ArtifactQuery
+from apps.runs.graphql.queries import RunQuery
 from apps.tools.graphql.queries import ToolQuery
 from apps.runs.graphql.mutations import RunMutation
+from apps.runs.graphql.subscriptions import RunSubscription
 
 
 @strawberry.type
-class Query(ToolQuery):
+class Query(ToolQuery, RunQuery, ArtifactQuery):
     """Root Query - combines all app queries."""
 
     pass
@@ -22,4 +26,14 @@ class Mutation(RunMutation):
     pass
 
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+@strawberry.type
+class Subscription(RunSubscription):
+    """Root Subscription - combines all app subscriptions (served over WebSocket by backend.asgi)."""
+
+    pass
+
+
+# The optimizer turns nested relation fields into select_related/prefetch_related (no N+1 in list queries)
+schema = strawberry.Schema(
+    query=Query, mutation=Mutation, subscription=Subscription, extensions=[DjangoOptimizerExtension]
+)
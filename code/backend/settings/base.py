@@ -262,6 +262,31 @@ STORAGE = {
         "ACCESS_KEY": env("MINIO_STORAGE_ACCESS_KEY", "minioadmin"),
         "SECRET_KEY": env("MINIO_STORAGE_SECRET_KEY", "minioadmin"),
         "USE_HTTPS": env("MINIO_STORAGE_USE_HTTPS", "false", cast=bool),
+        "REGION": env("MINIO_STORAGE_REGION", "us-east-1"),
+    },
+    "FS": {
+        # STORAGE_BACKEND=fs: objects live under ROOT/<bucket>/<key>
+        "ROOT": env("STORAGE_FS_ROOT", str(BASE_DIR / ".storage")),
+    },
+    "TRANSFER": {
+        # Objects above MULTIPART_THRESHOLD upload as PART_SIZE parts, CONCURRENCY at a time
+        "MULTIPART_THRESHOLD": env("STORAGE_MULTIPART_THRESHOLD", str(64 * 1024**2), cast=int),
+        "PART_SIZE": env("STORAGE_PART_SIZE", str(16 * 1024**2), cast=int),
+        "CONCURRENCY": env("STORAGE_TRANSFER_CONCURRENCY", "10", cast=int),
+        # HTTP connections per client, shared by all threads (parts, batch copies, request handlers)
+        "MAX_POOL_CONNECTIONS": env("STORAGE_MAX_POOL_CONNECTIONS", "64", cast=int),
+    },
+    "COMPRESSION": {
+        # zstd level for objects uploaded with compress=True (run event log segments); decoded on read
+        "LEVEL": env("STORAGE_COMPRESSION_LEVEL", "3", cast=int),
+    },
+    "CACHE": {
+        # Read-through disk cache in front of the backend (LRU keyed by bucket, key, etag)
+        "ENABLED": env("STORAGE_CACHE_ENABLED", "false", cast=bool),
+        "DIR": env("STORAGE_CACHE_DIR", str(BASE_DIR / ".cache" / "storage")),
+        "MAX_BYTES": env("STORAGE_CACHE_MAX_BYTES", str(2 * 1024**3), cast=int),
+        # Keys under these prefixes are never overwritten, so hits skip the ETag revalidation HEAD
+        "IMMUTABLE_PREFIXES": [p.strip() for p in env("STORAGE_CACHE_IMMUTABLE_PREFIXES", "").split(",") if p.strip()],
     },
 }
 
@@ -274,6 +299,40 @@ LOG_CONFIG = {
     "RELEASE": env("RELEASE", ""),
 }
 
+# Tool invocation
+# Identical concurrent invocations (same ref, digest, mode, inputs) share one container run. Opt-in: only
+# safe for tools whose result depends on nothing but their inputs
+TOOL_COALESCE_ENABLED = env("TOOL_COALESCE_ENABLED", "false", cast=bool)
+# How often a coalesced follower checks whether its leader finished
+TOOL_COALESCE_POLL_INTERVAL_S = env("TOOL_COALESCE_POLL_INTERVAL_S", "0.5", cast=float)
+# createRun enqueues a pending run for `manage.py runworker` instead of executing inside the request
+RUN_ASYNC_ENABLED = env("RUN_ASYNC_ENABLED", "true", cast=bool)
+RUN_WORKER_CONCURRENCY = env("RUN_WORKER_CONCURRENCY", "4", cast=int)  # worker processes
+RUN_WORKER_POLL_INTERVAL_S = env("RUN_WORKER_POLL_INTERVAL_S", "1.0", cast=float)
+# Retries of transport failures (overridden by registry.yaml runtime.retry and WorldTool.config["retry"])
+RUN_RETRY_DEFAULTS = {
+    "max_attempts": env("RUN_RETRY_MAX_ATTEMPTS", "3", cast=int),
+    "base_delay_s": env("RUN_RETRY_BASE_DELAY_S", "1.0", cast=float),
+    "max_delay_s": env("RUN_RETRY_MAX_DELAY_S", "30.0", cast=float),
+    "multiplier": env("RUN_RETRY_MULTIPLIER", "2.0", cast=float),
+}
+# runEvents subscriptions: per-subscriber buffer (oldest Token/Frame/Log frames dropped when full)
+RUN_EVENTS_BUFFER = env("RUN_EVENTS_BUFFER", "1000", cast=int)
+# How often a subscription polls the event log / status of a run executing in another process (runworker)
+RUN_EVENTS_POLL_INTERVAL_S = env("RUN_EVENTS_POLL_INTERVAL_S", "1.0", cast=float)
+# Persisted event log: zstd NDJSON segments under <write_prefix>/events/ (apps.runs.event_log)
+RUN_EVENT_LOG_ENABLED = env("RUN_EVENT_LOG_ENABLED", "true", cast=bool)
+RUN_EVENT_LOG_SEGMENT_BYTES = env("RUN_EVENT_LOG_SEGMENT_BYTES", str(1024 * 1024), cast=int)
+RUN_EVENT_LOG_FLUSH_INTERVAL_S = env("RUN_EVENT_LOG_FLUSH_INTERVAL_S", "2.0", cast=float)
+# Liveness: executing workers touch Run.heartbeat_at; `manage.py reapruns` settles runs that stopped beating
+RUN_HEARTBEAT_INTERVAL_S = env("RUN_HEARTBEAT_INTERVAL_S", "15", cast=float)
+RUN_HEARTBEAT_TIMEOUT_S = env("RUN_HEARTBEAT_TIMEOUT_S", "120", cast=float)
+# Running runs are preempted past Tool.timeout_s (times retry attempts) plus this grace
+RUN_DEADLINE_GRACE_S = env("RUN_DEADLINE_GRACE_S", "60", cast=float)
+RUN_PENDING_TIMEOUT_S = env("RUN_PENDING_TIMEOUT_S", "3600", cast=float)  # unclaimed pending runs fail after this
+RUN_REAPER_INTERVAL_S = env("RUN_REAPER_INTERVAL_S", "30", cast=float)
+RUN_REAPER_PREEMPT = env("RUN_REAPER_PREEMPT", "true", cast=bool)  # also send preempt to the run's container
+
 # Agent defaults
 DEFAULT_AGENT_BUDGET_MICRO = env("DEFAULT_AGENT_BUDGET_MICRO", "1000000", cast=int)
 DEFAULT_AGENT_CONCURRENCY = env("DEFAULT_AGENT_CONCURRENCY", "5", cast=int)
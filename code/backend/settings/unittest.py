@@ -22,6 +22,9 @@ CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
+# No object store in unit tests: event log tests enable it against a tmp filesystem backend
+RUN_EVENT_LOG_ENABLED = False
+
 # Test-specific settings
 SECRET_KEY = "test-secret-key-not-for-production-unit-tests"
 
@@ -1,16 +1,109 @@
+import contextlib
+import hashlib
+import io
+import json
 import logging
-from datetime import timedelta
-from typing import Dict, Any, BinaryIO
+import mmap
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, BinaryIO, Callable, Iterable, Iterator, List, Tuple, TypeVar
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from minio import Minio
+from minio.commonconfig import CopySource
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 from django.conf import settings
 
-from .interfaces import StorageInterface
+from .metrics import transfer_metrics
+from .interfaces import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    DELETE_BATCH_SIZE,
+    BatchResult,
+    ByteRange,
+    ObjectInfo,
+    ObjectStream,
+    StorageInterface,
+    range_header,
+)
 
 logger = logging.getLogger(__name__)
 
+# Concurrent server-side copies (copies have no batch API)
+COPY_CONCURRENCY = 16
+# Pairs taken from the (possibly lazy) input per round of copies
+COPY_WINDOW = COPY_CONCURRENCY * 4
+
+T = TypeVar("T")
+
+
+def _batches(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split an iterable (possibly a lazy listing) into lists of at most size items."""
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _copy_concurrently(copy_one: Callable[[str, str], None], pairs: Iterable[Tuple[str, str]]) -> BatchResult:
+    """
+    Run copy_one(source_key, dest_key) over pairs on a bounded thread pool.
+
+    Pairs are submitted COPY_WINDOW at a time, so a large or lazy listing
+    is never materialised as one future per pair.
+    """
+    result = BatchResult()
+
+    def attempt(pair: Tuple[str, str]) -> Tuple[str, str | None]:
+        src, dst = pair
+        try:
+            copy_one(src, dst)
+            return dst, None
+        except Exception as e:
+            return dst, str(e)
+
+    with ThreadPoolExecutor(max_workers=COPY_CONCURRENCY) as pool:
+        for window in _batches(pairs, COPY_WINDOW):
+            for dst, error in pool.map(attempt, window):
+                if error is None:
+                    result.succeeded.append(dst)
+                else:
+                    result.failed[dst] = error
+    return result
+
+
+# MinIO/S3 minimum multipart part size
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+def _transfer_settings() -> Dict[str, int]:
+    """Multipart/concurrency tuning from settings.STORAGE["TRANSFER"] with safe defaults."""
+    transfer = settings.STORAGE.get("TRANSFER", {})
+    return {
+        "MULTIPART_THRESHOLD": transfer.get("MULTIPART_THRESHOLD", 64 * 1024 * 1024),
+        "PART_SIZE": max(transfer.get("PART_SIZE", 16 * 1024 * 1024), MIN_PART_SIZE),
+        "CONCURRENCY": transfer.get("CONCURRENCY", 10),
+        "MAX_POOL_CONNECTIONS": transfer.get("MAX_POOL_CONNECTIONS", 64),
+    }
+
+
+def _remaining_length(file: BinaryIO) -> int | None:
+    """Bytes from the current position to EOF for seekable files, else None."""
+    try:
+        pos = file.tell()
+        end = file.seek(0, io.SEEK_END)
+        file.seek(pos)
+        return end - pos
+    except (AttributeError, OSError, ValueError):
+        return None
+
 
 class MinIOAdapter(StorageInterface):
     """MinIO storage adapter for local development"""
@@ -19,16 +112,68 @@ class MinIOAdapter(StorageInterface):
         storage = settings.STORAGE
         minio_config = storage.get("MINIO", {})
 
-        endpoint = minio_config.get("ENDPOINT", "localhost:9000")
-        use_https = minio_config.get("USE_HTTPS", False)
-
-        self.client = Minio(
-            endpoint=endpoint,
-            access_key=minio_config.get("ACCESS_KEY", "minioadmin"),
-            secret_key=minio_config.get("SECRET_KEY", "minioadmin"),
-            secure=use_https,
+        self.endpoint = minio_config.get("ENDPOINT", "localhost:9000")
+        self.use_https = minio_config.get("USE_HTTPS", False)
+        # Pinning the region keeps presigning local (otherwise MinIO looks up the bucket location)
+        self.region = minio_config.get("REGION") or storage.get("REGION") or "us-east-1"
+        self._access_key = minio_config.get("ACCESS_KEY", "minioadmin")
+        self._secret_key = minio_config.get("SECRET_KEY", "minioadmin")
+        self.base_url = f"{'https' if self.use_https else 'http'}://{self.endpoint}"
+        self.transfer = _transfer_settings()
+
+        # Client is built on first use; bucket existence is cached per adapter
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._known_buckets: set[str] = set()
+        self._bucket_lock = threading.Lock()
+
+    @property
+    def client(self) -> Minio:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = Minio(
+                        endpoint=self.endpoint,
+                        access_key=self._access_key,
+                        secret_key=self._secret_key,
+                        secure=self.use_https,
+                        region=self.region,
+                        http_client=self._http_client(),
+                    )
+        return self._client
+
+    def _http_client(self):
+        """minio-py's default pool, sized for parallel part uploads instead of its fixed 10 connections."""
+        import certifi
+        import urllib3
+
+        timeout = timedelta(minutes=5).seconds
+        return urllib3.PoolManager(
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+            maxsize=self.transfer["MAX_POOL_CONNECTIONS"],
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
         )
-        self.base_url = f"{'https' if use_https else 'http'}://{endpoint}"
+
+    def ensure_bucket(self, bucket: str) -> None:
+        """Create bucket if missing. Checked once per adapter; later calls are a set lookup."""
+        if bucket in self._known_buckets:
+            return
+        with self._bucket_lock:
+            if bucket in self._known_buckets:
+                return
+            if not self.client.bucket_exists(bucket):
+                self.client.make_bucket(bucket, location=self.region)
+            self._known_buckets.add(bucket)
+
+    def invalidate_bucket_cache(self, bucket: str | None = None) -> None:
+        """Forget cached bucket existence (one bucket, or all when bucket is None)."""
+        with self._bucket_lock:
+            if bucket is None:
+                self._known_buckets.clear()
+            else:
+                self._known_buckets.discard(bucket)
 
     def upload_file(
         self,
@@ -39,34 +184,64 @@ class MinIOAdapter(StorageInterface):
         metadata: Dict[str, Any] | None = None,
     ) -> str:
         try:
-            # Ensure bucket exists
-            if not self.client.bucket_exists(bucket):
-                self.client.make_bucket(bucket)
+            self.ensure_bucket(bucket)
 
-            # Upload file
             file.seek(0)
+            length = _remaining_length(file)
+            if length is not None and length <= self.transfer["MULTIPART_THRESHOLD"]:
+                # Single PUT: minio-py only goes multipart when length exceeds part_size
+                part_size = max(length, MIN_PART_SIZE)
+            else:
+                part_size = self.transfer["PART_SIZE"]
+
+            started = time.monotonic()
             self.client.put_object(
                 bucket,
                 key,
                 file,
-                length=-1,
-                part_size=10 * 1024 * 1024,
+                length=-1 if length is None else length,
+                part_size=part_size,
+                num_parallel_uploads=self.transfer["CONCURRENCY"],
                 content_type=content_type,
                 metadata=metadata or {},
             )
+            transfer_metrics.record("minio", "upload", file.tell(), time.monotonic() - started)
             return f"{self.base_url}/{bucket}/{key}"
         except S3Error as e:
+            if e.code == "NoSuchBucket":
+                # Bucket deleted behind our back - recheck on next call
+                self.invalidate_bucket_cache(bucket)
             logger.error(f"MinIO upload error: {e}")
             raise
 
     def download_file(self, key: str, bucket: str) -> bytes:
+        with self.open_stream(key, bucket) as stream:
+            return stream.read()
+
+    def open_stream(self, key: str, bucket: str, range: ByteRange | None = None) -> ObjectStream:
+        header = range_header(range)
         try:
-            response = self.client.get_object(bucket, key)
-            return response.read()
+            response = self.client.get_object(bucket, key, request_headers={"Range": header} if header else None)
         except S3Error as e:
             logger.error(f"MinIO download error: {e}")
             raise
 
+        def release():
+            response.close()
+            response.release_conn()
+
+        headers = response.headers
+        length = headers.get("Content-Length")
+        return ObjectStream(
+            response,
+            release=release,
+            content_length=int(length) if length is not None else None,
+            content_type=headers.get("Content-Type"),
+            etag=(headers.get("ETag") or "").strip('"'),
+            metadata={k[len("x-amz-meta-") :]: v for k, v in headers.items() if k.lower().startswith("x-amz-meta-")},
+            backend="minio",
+        )
+
     def delete_file(self, key: str, bucket: str) -> bool:
         try:
             self.client.remove_object(bucket, key)
@@ -75,6 +250,28 @@ class MinIOAdapter(StorageInterface):
             logger.error(f"MinIO delete error: {e}")
             return False
 
+    def delete_many(self, keys: Iterable[str], bucket: str) -> BatchResult:
+        result = BatchResult()
+        for batch in _batches(keys, DELETE_BATCH_SIZE):
+            try:
+                # remove_objects is lazy: errors only surface while iterating
+                errors = {
+                    err.name: f"{err.code}: {err.message}"
+                    for err in self.client.remove_objects(bucket, [DeleteObject(k) for k in batch])
+                }
+            except S3Error as e:
+                logger.error(f"MinIO batch delete error: {e}")
+                errors = {k: str(e) for k in batch}
+            result.failed.update(errors)
+            result.succeeded.extend(k for k in batch if k not in errors)
+        return result
+
+    def copy_many(self, pairs: Iterable[Tuple[str, str]], bucket: str, source_bucket: str | None = None) -> BatchResult:
+        source_bucket = source_bucket or bucket
+        return _copy_concurrently(
+            lambda src, dst: self.client.copy_object(bucket, dst, CopySource(source_bucket, src)), pairs
+        )
+
     def get_file_url(self, key: str, bucket: str, expires_in: int = 3600) -> str:
         try:
             return self.client.presigned_get_object(bucket, key, expires=timedelta(seconds=expires_in))
@@ -84,9 +281,7 @@ class MinIOAdapter(StorageInterface):
 
     def get_upload_url(self, key: str, bucket: str, expires_in: int = 3600, content_type: str | None = None) -> str:
         try:
-            # Ensure bucket exists
-            if not self.client.bucket_exists(bucket):
-                self.client.make_bucket(bucket)
+            self.ensure_bucket(bucket)
 
             # Use canonical hostname (minio.local in dev, reachable by host and containers)
             return self.client.presigned_put_object(bucket, key, expires=timedelta(seconds=expires_in))
@@ -103,12 +298,25 @@ class MinIOAdapter(StorageInterface):
 
     def list_files(self, bucket: str, prefix: str = "") -> list:
         try:
-            objects = self.client.list_objects(bucket, prefix=prefix)
-            return [obj.object_name for obj in objects]
+            return [obj.key for obj in self.iter_objects(bucket, prefix)]
         except S3Error as e:
             logger.error(f"MinIO list error: {e}")
             return []
 
+    def iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str | None = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[ObjectInfo]:
+        # minio-py already pages lazily; page size is the server default (1000), so page_size is advisory here
+        for obj in self.client.list_objects(bucket, prefix=prefix, recursive=True, start_after=start_after):
+            if obj.is_dir:
+                continue
+            yield ObjectInfo(
+                key=obj.object_name,
+                size=obj.size or 0,
+                etag=(obj.etag or "").strip('"'),
+                mtime=obj.last_modified,
+            )
+
     def get_file_metadata(self, key: str, bucket: str) -> Dict[str, Any]:
         try:
             stat = self.client.stat_object(bucket, key)
@@ -136,7 +344,9 @@ class S3Adapter(StorageInterface):
         access_key = storage.get("ACCESS_KEY")
         secret_key = storage.get("SECRET_KEY")
 
-        config = Config(signature_version="s3v4")
+        self.transfer = _transfer_settings()
+        # One pool shared by every thread using this client (multipart parts, batch copies, requests)
+        config = Config(signature_version="s3v4", max_pool_connections=self.transfer["MAX_POOL_CONNECTIONS"])
         client_kwargs = {"region_name": region, "config": config}
 
         if endpoint_url:
@@ -148,6 +358,12 @@ class S3Adapter(StorageInterface):
         self.client = boto3.client("s3", **client_kwargs)
         self.region = region
         self.endpoint_url = endpoint_url
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.transfer["MULTIPART_THRESHOLD"],
+            multipart_chunksize=self.transfer["PART_SIZE"],
+            max_concurrency=self.transfer["CONCURRENCY"],
+            use_threads=self.transfer["CONCURRENCY"] > 1,
+        )
 
     def upload_file(
         self,
@@ -165,20 +381,42 @@ class S3Adapter(StorageInterface):
                 extra_args["Metadata"] = metadata
 
             file.seek(0)
-            self.client.upload_fileobj(file, bucket, key, ExtraArgs=extra_args)
+            length = _remaining_length(file)
+            started = time.monotonic()
+            self.client.upload_fileobj(file, bucket, key, ExtraArgs=extra_args, Config=self.transfer_config)
+            if length is not None:
+                transfer_metrics.record("s3", "upload", length, time.monotonic() - started)
             return f"https://{bucket}.s3.{self.region}.amazonaws.com/{key}"
         except Exception as e:
             logger.error(f"S3 upload error: {e}")
             raise
 
     def download_file(self, key: str, bucket: str) -> bytes:
+        with self.open_stream(key, bucket) as stream:
+            return stream.read()
+
+    def open_stream(self, key: str, bucket: str, range: ByteRange | None = None) -> ObjectStream:
+        params = {"Bucket": bucket, "Key": key}
+        header = range_header(range)
+        if header:
+            params["Range"] = header
         try:
-            response = self.client.get_object(Bucket=bucket, Key=key)
-            return response["Body"].read()
+            response = self.client.get_object(**params)
         except Exception as e:
             logger.error(f"S3 download error: {e}")
             raise
 
+        body = response["Body"]
+        return ObjectStream(
+            body,
+            release=body.close,
+            content_length=response.get("ContentLength"),
+            content_type=response.get("ContentType"),
+            etag=(response.get("ETag") or "").strip('"'),
+            metadata=response.get("Metadata", {}),
+            backend="s3",
+        )
+
     def delete_file(self, key: str, bucket: str) -> bool:
         try:
             self.client.delete_object(Bucket=bucket, Key=key)
@@ -187,6 +425,29 @@ class S3Adapter(StorageInterface):
             logger.error(f"S3 delete error: {e}")
             return False
 
+    def delete_many(self, keys: Iterable[str], bucket: str) -> BatchResult:
+        result = BatchResult()
+        for batch in _batches(keys, DELETE_BATCH_SIZE):
+            try:
+                response = self.client.delete_objects(
+                    Bucket=bucket, Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True}
+                )
+                # Quiet mode only reports failures
+                errors = {e["Key"]: f"{e.get('Code')}: {e.get('Message')}" for e in response.get("Errors", [])}
+            except Exception as e:
+                logger.error(f"S3 batch delete error: {e}")
+                errors = {k: str(e) for k in batch}
+            result.failed.update(errors)
+            result.succeeded.extend(k for k in batch if k not in errors)
+        return result
+
+    def copy_many(self, pairs: Iterable[Tuple[str, str]], bucket: str, source_bucket: str | None = None) -> BatchResult:
+        source_bucket = source_bucket or bucket
+        # Managed copy switches to multipart UploadPartCopy for objects over 5GB
+        return _copy_concurrently(
+            lambda src, dst: self.client.copy({"Bucket": source_bucket, "Key": src}, bucket, dst), pairs
+        )
+
     def get_file_url(self, key: str, bucket: str, expires_in: int = 3600) -> str:
         try:
             return self.client.generate_presigned_url(
@@ -220,12 +481,33 @@ class S3Adapter(StorageInterface):
 
     def list_files(self, bucket: str, prefix: str = "") -> list:
         try:
-            response = self.client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-            return [obj["Key"] for obj in response.get("Contents", [])]
+            return [obj.key for obj in self.iter_objects(bucket, prefix)]
         except Exception as e:
             logger.error(f"S3 list error: {e}")
             return []
 
+    def iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str | None = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[ObjectInfo]:
+        params = {"Bucket": bucket, "Prefix": prefix, "MaxKeys": page_size}
+        if start_after:
+            params["StartAfter"] = start_after
+
+        while True:
+            response = self.client.list_objects_v2(**params)
+            for obj in response.get("Contents", []):
+                yield ObjectInfo(
+                    key=obj["Key"],
+                    size=obj.get("Size", 0),
+                    etag=(obj.get("ETag") or "").strip('"'),
+                    mtime=obj.get("LastModified"),
+                )
+            if not response.get("IsTruncated"):
+                return
+            # Continuation token supersedes StartAfter on subsequent pages
+            params.pop("StartAfter", None)
+            params["ContinuationToken"] = response["NextContinuationToken"]
+
     def get_file_metadata(self, key: str, bucket: str) -> Dict[str, Any]:
         try:
             response = self.client.head_object(Bucket=bucket, Key=key)
@@ -239,3 +521,249 @@ class S3Adapter(StorageInterface):
         except Exception as e:
             logger.error(f"S3 metadata error: {e}")
             return {}
+
+
+class _MmapReader:
+    """Sequential reader over a memory-mapped byte window [start, end)."""
+
+    def __init__(self, buffer, start: int, end: int):
+        self._buffer = buffer
+        self._pos = start
+        self._end = end
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._end - self._pos
+        data = self._buffer[self._pos : min(self._pos + size, self._end)]
+        self._pos += len(data)
+        return data
+
+
+class FileSystemAdapter(StorageInterface):
+    """
+    Local filesystem storage adapter for single-node deployments, tests and benchmarks.
+
+    Layout under settings.STORAGE["FS"]["ROOT"]:
+        <bucket>/<key>                      object bytes (key prefixes become directories)
+        <bucket>/.meta/ab/cd/<sha256(key)>  JSON sidecar: content_type, metadata, etag
+        <bucket>/.tmp/                      staging area for atomic writes
+
+    Writes land in .tmp and are os.replace()d into place, so readers never see
+    a partial object. Reads are mmap-backed. Presigned URLs are file:// URIs.
+    """
+
+    META_DIR = ".meta"
+    TMP_DIR = ".tmp"
+
+    def __init__(self):
+        fs_config = settings.STORAGE.get("FS", {})
+        self.root = Path(fs_config.get("ROOT") or settings.BASE_DIR / ".storage").resolve()
+
+    # ---------------- Layout ----------------
+
+    def _object_path(self, key: str, bucket: str) -> Path:
+        base = (self.root / bucket).resolve()
+        path = (base / key.lstrip("/")).resolve()
+        if base not in path.parents or path.relative_to(base).parts[0] in (self.META_DIR, self.TMP_DIR):
+            raise ValueError(f"Invalid storage key: {key!r}")
+        return path
+
+    def _meta_path(self, key: str, bucket: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.root / bucket / self.META_DIR / digest[:2] / digest[2:4] / digest
+
+    def _write_atomic(self, dest: Path, bucket: str, chunks: Iterable[bytes]) -> str:
+        """Stream chunks to a temp file, fsync, then rename over dest. Returns the md5 hex (S3-style ETag)."""
+        tmp_dir = self.root / bucket / self.TMP_DIR
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        md5 = hashlib.md5()
+        fd, tmp = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in chunks:
+                    md5.update(chunk)
+                    out.write(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, dest)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp)
+            raise
+        return md5.hexdigest()
+
+    def _read_meta(self, key: str, bucket: str) -> Dict[str, Any]:
+        try:
+            return json.loads(self._meta_path(key, bucket).read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_meta(self, key: str, bucket: str, meta: Dict[str, Any]) -> None:
+        path = self._meta_path(key, bucket)
+        self._write_atomic(path, bucket, [json.dumps(meta).encode("utf-8")])
+
+    def _etag(self, meta: Dict[str, Any], stat: os.stat_result) -> str:
+        # Objects written out-of-band (file:// upload URLs) have no sidecar: derive a cheap validator
+        return meta.get("etag") or f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    # ---------------- StorageInterface ----------------
+
+    def upload_file(
+        self,
+        file: BinaryIO,
+        key: str,
+        bucket: str,
+        content_type: str | None = None,
+        metadata: Dict[str, Any] | None = None,
+    ) -> str:
+        try:
+            path = self._object_path(key, bucket)
+            file.seek(0)
+            etag = self._write_atomic(path, bucket, iter(lambda: file.read(DEFAULT_CHUNK_SIZE), b""))
+            self._write_meta(key, bucket, {"etag": etag, "content_type": content_type, "metadata": metadata or {}})
+            return path.as_uri()
+        except OSError as e:
+            logger.error(f"Filesystem upload error: {e}")
+            raise
+
+    def download_file(self, key: str, bucket: str) -> bytes:
+        with self.open_stream(key, bucket) as stream:
+            return stream.read()
+
+    def open_stream(self, key: str, bucket: str, range: ByteRange | None = None) -> ObjectStream:
+        path = self._object_path(key, bucket)
+        try:
+            f = open(path, "rb")  # noqa: SIM115 - closed by the stream's release()
+        except OSError as e:
+            logger.error(f"Filesystem download error: {e}")
+            raise
+
+        stat = os.fstat(f.fileno())
+        size = stat.st_size
+        start, end = 0, size
+        if range is not None:
+            first, last = range
+            start = max(size + first, 0) if first < 0 else min(first, size)
+            end = size if first < 0 or last is None else min(last + 1, size)
+
+        # mmap(0) is an error; empty objects and empty ranges read from an empty buffer
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except OSError:
+            f.close()
+            raise
+
+        def release():
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+            f.close()
+
+        meta = self._read_meta(key, bucket)
+        return ObjectStream(
+            _MmapReader(buffer, start, max(start, end)),
+            release=release,
+            content_length=max(end - start, 0),
+            content_type=meta.get("content_type"),
+            etag=self._etag(meta, stat),
+            metadata=meta.get("metadata", {}),
+        )
+
+    def delete_file(self, key: str, bucket: str) -> bool:
+        try:
+            self._object_path(key, bucket).unlink(missing_ok=True)
+            self._meta_path(key, bucket).unlink(missing_ok=True)
+            return True
+        except OSError as e:
+            logger.error(f"Filesystem delete error: {e}")
+            return False
+
+    def delete_many(self, keys: Iterable[str], bucket: str) -> BatchResult:
+        result = BatchResult()
+        for key in keys:
+            try:
+                self._object_path(key, bucket).unlink(missing_ok=True)
+                self._meta_path(key, bucket).unlink(missing_ok=True)
+                result.succeeded.append(key)
+            except (OSError, ValueError) as e:
+                result.failed[key] = str(e)
+        return result
+
+    def copy_many(self, pairs: Iterable[Tuple[str, str]], bucket: str, source_bucket: str | None = None) -> BatchResult:
+        source_bucket = source_bucket or bucket
+
+        def copy_one(src: str, dst: str) -> None:
+            with self.open_stream(src, source_bucket) as stream:
+                meta = {"content_type": stream.content_type, "metadata": stream.metadata}
+                meta["etag"] = self._write_atomic(
+                    self._object_path(dst, bucket), bucket, iter(lambda: stream.read(DEFAULT_CHUNK_SIZE), b"")
+                )
+            self._write_meta(dst, bucket, meta)
+
+        return _copy_concurrently(copy_one, pairs)
+
+    def get_file_url(self, key: str, bucket: str, expires_in: int = 3600) -> str:
+        # Local paths need no signature; expires_in is accepted for interface parity
+        return self._object_path(key, bucket).as_uri()
+
+    def get_upload_url(self, key: str, bucket: str, expires_in: int = 3600, content_type: str | None = None) -> str:
+        path = self._object_path(key, bucket)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path.as_uri()
+
+    def file_exists(self, key: str, bucket: str) -> bool:
+        return self._object_path(key, bucket).is_file()
+
+    def list_files(self, bucket: str, prefix: str = "") -> list:
+        try:
+            return [obj.key for obj in self.iter_objects(bucket, prefix)]
+        except OSError as e:
+            logger.error(f"Filesystem list error: {e}")
+            return []
+
+    def iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str | None = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[ObjectInfo]:
+        bucket_root = self.root / bucket
+        # Only walk the directory that can contain the prefix (a prefix may end mid-name)
+        base = bucket_root / prefix.lstrip("/").rpartition("/")[0]
+        if not base.is_dir():
+            return
+
+        keys = []
+        for dirpath, dirnames, filenames in os.walk(base):
+            if Path(dirpath) == bucket_root:
+                dirnames[:] = [d for d in dirnames if d not in (self.META_DIR, self.TMP_DIR)]
+            rel = Path(dirpath).relative_to(bucket_root).as_posix()
+            for name in filenames:
+                key = name if rel == "." else f"{rel}/{name}"
+                if key.startswith(prefix.lstrip("/")) and (start_after is None or key > start_after):
+                    keys.append(key)
+
+        # S3 listing order is lexicographic on the full key, not directory order
+        for key in sorted(keys):
+            try:
+                stat = (bucket_root / key).stat()
+            except FileNotFoundError:
+                continue  # deleted while listing
+            yield ObjectInfo(
+                key=key,
+                size=stat.st_size,
+                etag=self._etag(self._read_meta(key, bucket), stat),
+                mtime=datetime.fromtimestamp(stat.st_mtime, tz=UTC),
+            )
+
+    def get_file_metadata(self, key: str, bucket: str) -> Dict[str, Any]:
+        try:
+            stat = self._object_path(key, bucket).stat()
+        except OSError as e:
+            logger.error(f"Filesystem metadata error: {e}")
+            return {}
+        meta = self._read_meta(key, bucket)
+        return {
+            "size": stat.st_size,
+            "last_modified": datetime.fromtimestamp(stat.st_mtime, tz=UTC),
+            "etag": self._etag(meta, stat),
+            "content_type": meta.get("content_type"),
+            "metadata": meta.get("metadata", {}),
+        }
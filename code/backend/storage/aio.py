@@ -0,0 +1,343 @@
+"""
+Async storage adapters for event-loop callers (ASGI resolvers, async WS adapters).
+
+Sends S3 requests presigned by botocore over httpx, with one pooled
+httpx.AsyncClient per event loop (closed when that loop shuts down), so
+object reads, writes and listings never block the loop or need a thread hop. Batch deletes (which S3 cannot presign)
+run the sync adapter's delete_many in a thread.
+
+Usage:
+    from backend.storage.service import storage_service
+
+    meta = await storage_service.aio.head(key, bucket)
+    async for chunk in storage_service.aio.get_stream(key, bucket):
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Tuple
+from urllib.parse import unquote_plus
+
+import httpx
+from botocore.config import Config
+from django.conf import settings
+
+from .interfaces import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    BatchResult,
+    ByteRange,
+    ObjectInfo,
+    StorageInterface,
+    range_header,
+)
+
+logger = logging.getLogger(__name__)
+
+_S3_NS = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+
+# Pool sizing for each event loop's async HTTP client
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE = 32
+# Lifetime of the presigned URL behind each request (checked when the request starts)
+PRESIGN_EXPIRES_S = 300
+
+
+def _parse_mtime(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class AsyncStorageInterface(ABC):
+    """Abstract base class for async storage adapters (coroutine mirror of StorageInterface)"""
+
+    @abstractmethod
+    async def get_file_url(self, key: str, bucket: str, expires_in: int = 3600) -> str:
+        """Get a presigned URL for downloading the file"""
+        pass
+
+    @abstractmethod
+    async def get_upload_url(
+        self, key: str, bucket: str, expires_in: int = 3600, content_type: str | None = None
+    ) -> str:
+        """Get a presigned URL for uploading a file"""
+        pass
+
+    @abstractmethod
+    async def head(self, key: str, bucket: str) -> Dict[str, Any]:
+        """Get file metadata (same keys as get_file_metadata); empty dict if missing"""
+        pass
+
+    @abstractmethod
+    def get_stream(
+        self, key: str, bucket: str, range: ByteRange | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream a file (optionally a byte range) as chunks"""
+        pass
+
+    @abstractmethod
+    async def put_stream(
+        self,
+        key: str,
+        bucket: str,
+        data: bytes | AsyncIterable[bytes],
+        length: int | None = None,
+        content_type: str | None = None,
+        metadata: Dict[str, str] | None = None,
+    ) -> str:
+        """Upload bytes or an async byte stream (length required for streams); returns the ETag"""
+        pass
+
+    @abstractmethod
+    def iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str | None = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[ObjectInfo]:
+        """Lazily list objects under prefix, one page per request"""
+        pass
+
+    @abstractmethod
+    async def delete_many(self, keys: Iterable[str], bucket: str) -> BatchResult:
+        """Delete many files with batched requests; failures are reported per key"""
+        pass
+
+    @abstractmethod
+    async def aclose(self) -> None:
+        """Release pooled connections"""
+        pass
+
+
+class AsyncS3Adapter(AsyncStorageInterface):
+    """
+    Native async S3-compatible adapter (AWS S3, MinIO, DigitalOcean Spaces).
+
+    Each request is presigned by a botocore S3 client (CPU only, credentials
+    refreshed by botocore) and sent over an httpx.AsyncClient owned by the
+    running event loop, so the adapter can be shared by every loop in the
+    process (ASGI workers, asyncio.run in management commands, tests).
+
+    Args:
+        presigner: Sync adapter used for public presigned URLs and batch deletes
+        endpoint_url: Service endpoint; None means AWS
+        region: Signing region
+        access_key: Access key; None uses the default credential chain (env, instance profile)
+        secret_key: Secret key paired with access_key
+        transport: httpx transport for the per-loop clients (tests)
+    """
+
+    def __init__(
+        self,
+        *,
+        presigner: StorageInterface,
+        endpoint_url: str | None,
+        region: str,
+        access_key: str | None = None,
+        secret_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        import boto3
+
+        self._presigner = presigner
+        self.endpoint_url = endpoint_url
+        self.region = region
+        # Custom endpoints (MinIO, Spaces) are addressed path-style, like the sync adapters
+        config = Config(signature_version="s3v4", s3={"addressing_style": "path"} if endpoint_url else {})
+        self._s3 = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            config=config,
+        )
+        self._transport = transport
+        # Each loop's client and the task that closes it when the loop shuts down
+        self._clients: Dict[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, asyncio.Task]] = {}
+
+    @classmethod
+    def from_settings(cls, presigner: StorageInterface) -> AsyncS3Adapter:
+        """Build from settings.STORAGE (AWS S3 or any S3-compatible ENDPOINT)."""
+        storage = settings.STORAGE
+        access_key = storage.get("ACCESS_KEY")
+        secret_key = storage.get("SECRET_KEY")
+        return cls(
+            presigner=presigner,
+            endpoint_url=storage.get("ENDPOINT"),
+            region=storage.get("REGION", "us-east-1"),
+            access_key=access_key if access_key and secret_key else None,
+            secret_key=secret_key if access_key and secret_key else None,
+        )
+
+    # ---------------- Presign (CPU only) ----------------
+
+    async def get_file_url(self, key: str, bucket: str, expires_in: int = 3600) -> str:
+        return self._presigner.get_file_url(key, bucket, expires_in)
+
+    async def get_upload_url(
+        self, key: str, bucket: str, expires_in: int = 3600, content_type: str | None = None
+    ) -> str:
+        return self._presigner.get_upload_url(key, bucket, expires_in, content_type)
+
+    # ---------------- Object operations ----------------
+
+    async def head(self, key: str, bucket: str) -> Dict[str, Any]:
+        url = self._presign("head_object", Bucket=bucket, Key=key)
+        response = await self.http.head(url)
+        if response.status_code == 404:
+            return {}
+        self._raise_for_status(response, "head")
+        h = response.headers
+        return {
+            "size": int(h.get("content-length", 0)),
+            "last_modified": h.get("last-modified"),
+            "etag": (h.get("etag") or "").strip('"'),
+            "content_type": h.get("content-type"),
+            "metadata": {k[len("x-amz-meta-") :]: v for k, v in h.items() if k.startswith("x-amz-meta-")},
+        }
+
+    async def file_exists(self, key: str, bucket: str) -> bool:
+        return bool(await self.head(key, bucket))
+
+    async def get_stream(
+        self, key: str, bucket: str, range: ByteRange | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        params = {"Bucket": bucket, "Key": key}
+        headers = {}
+        header = range_header(range)
+        if header:
+            # Range is a signed header, so it is sent exactly as presigned
+            params["Range"] = headers["Range"] = header
+        async with self.http.stream("GET", self._presign("get_object", **params), headers=headers) as response:
+            if response.is_error:
+                await response.aread()
+                self._raise_for_status(response, "download")
+            # Raw bytes: content-encoding (if any) is decoded by the caller, same as the sync path
+            async for chunk in response.aiter_raw(chunk_size):
+                yield chunk
+
+    async def put_stream(
+        self,
+        key: str,
+        bucket: str,
+        data: bytes | AsyncIterable[bytes],
+        length: int | None = None,
+        content_type: str | None = None,
+        metadata: Dict[str, str] | None = None,
+    ) -> str:
+        params: Dict[str, Any] = {"Bucket": bucket, "Key": key}
+        headers = {}
+        if content_type:
+            params["ContentType"] = headers["Content-Type"] = content_type
+        if metadata:
+            params["Metadata"] = {name: str(value) for name, value in metadata.items()}
+            headers.update({f"x-amz-meta-{name}": value for name, value in params["Metadata"].items()})
+
+        if not isinstance(data, bytes | bytearray):
+            # S3 rejects chunked uploads without aws-chunked framing, so streams need a length
+            if length is None:
+                raise ValueError("put_stream requires length when data is a stream")
+            headers["Content-Length"] = str(length)
+
+        # Presigned URLs carry UNSIGNED-PAYLOAD, so bodies stream without hashing them first
+        response = await self.http.put(self._presign("put_object", **params), content=data, headers=headers)
+        self._raise_for_status(response, "upload")
+        return (response.headers.get("etag") or "").strip('"')
+
+    async def iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str | None = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[ObjectInfo]:
+        params: Dict[str, Any] = {"Bucket": bucket, "Prefix": prefix, "MaxKeys": page_size}
+        if start_after:
+            params["StartAfter"] = start_after
+
+        while True:
+            response = await self.http.get(self._presign("list_objects_v2", **params))
+            self._raise_for_status(response, "list")
+            root = ET.fromstring(response.content)
+            for item in root.iter(f"{_S3_NS}Contents"):
+                yield ObjectInfo(
+                    # botocore presigns the listing with encoding-type=url
+                    key=unquote_plus(item.findtext(f"{_S3_NS}Key")),
+                    size=int(item.findtext(f"{_S3_NS}Size") or 0),
+                    etag=(item.findtext(f"{_S3_NS}ETag") or "").strip('"'),
+                    mtime=_parse_mtime(item.findtext(f"{_S3_NS}LastModified")),
+                )
+            if root.findtext(f"{_S3_NS}IsTruncated") != "true":
+                return
+            params.pop("StartAfter", None)
+            params["ContinuationToken"] = root.findtext(f"{_S3_NS}NextContinuationToken")
+
+    async def delete_many(self, keys: Iterable[str], bucket: str) -> BatchResult:
+        # DeleteObjects cannot be presigned; the sync adapter batches DELETE_BATCH_SIZE keys per request
+        return await asyncio.to_thread(self._presigner.delete_many, list(keys), bucket)
+
+    async def aclose(self) -> None:
+        entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            client, closer = entry
+            closer.cancel()
+            await client.aclose()
+
+    # ---------------- Internals ----------------
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """The running loop's pooled client (httpx connections cannot be shared across loops)."""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is None:
+            # A loop closed without cancelling its tasks never ran its closer; its client is unusable now
+            for stale in [other for other in self._clients if other.is_closed()]:
+                del self._clients[stale]
+            client = httpx.AsyncClient(
+                transport=self._transport,
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE),
+                timeout=httpx.Timeout(30.0, connect=10.0),
+            )
+            entry = self._clients[loop] = (client, loop.create_task(self._close_with_loop(loop, client)))
+        return entry[0]
+
+    async def _close_with_loop(self, loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+        """
+        Close client when its loop shuts down.
+
+        asyncio.run (and asgiref's per-call loops) cancel leftover tasks and
+        wait for them before closing the loop, so this runs while the
+        client's connections can still be closed on the loop that owns them.
+        """
+        try:
+            await loop.create_future()
+        finally:
+            if self._clients.get(loop, (None,))[0] is client:
+                del self._clients[loop]
+            await client.aclose()
+
+    def _presign(self, operation: str, **params) -> str:
+        return self._s3.generate_presigned_url(operation, Params=params, ExpiresIn=PRESIGN_EXPIRES_S)
+
+    def _raise_for_status(self, response: httpx.Response, op: str) -> None:
+        if response.is_error:
+            logger.error(f"Async storage {op} error: {response.status_code} {response.text[:200]}")
+            response.raise_for_status()
+
+
+class AsyncMinIOAdapter(AsyncS3Adapter):
+    """Async MinIO adapter (path-style S3 API, configured from settings.STORAGE["MINIO"])"""
+
+    @classmethod
+    def from_settings(cls, presigner: StorageInterface) -> AsyncMinIOAdapter:
+        minio_config = settings.STORAGE.get("MINIO", {})
+        scheme = "https" if minio_config.get("USE_HTTPS", False) else "http"
+        return cls(
+            presigner=presigner,
+            endpoint_url=f"{scheme}://{minio_config.get('ENDPOINT', 'localhost:9000')}",
+            region=minio_config.get("REGION", "us-east-1"),
+            access_key=minio_config.get("ACCESS_KEY", "minioadmin"),
+            secret_key=minio_config.get("SECRET_KEY", "minioadmin"),
+        )
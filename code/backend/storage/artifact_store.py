@@ -5,11 +5,22 @@ Thin wrapper over storage_service that enforces WorldPath conventions.
 """
 
 import hashlib
+import io
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
 from django.conf import settings
 
+from .interfaces import DEFAULT_CHUNK_SIZE, ByteRange, ObjectStream
 from .service import storage_service
 from apps.core.predicates.builtins import canon_path_facet_root
 
+# Window size for hashing memory-mapped files
+CID_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 class ArtifactStore:
     """
@@ -17,12 +28,19 @@ class ArtifactStore:
 
     Ensures all paths follow `/artifacts/...` or `/streams/...` convention
     and provides CID computation for content addressing.
+
+    Artifacts are never compressed at rest: presigned GETs serve the stored
+    bytes as-is, and tools cannot decode the zstd marker.
     """
 
     def __init__(self):
         """Initialize artifact store."""
         self._service = storage_service
 
+    @property
+    def _bucket(self) -> str:
+        return settings.STORAGE.get("BUCKET")
+
     def put_bytes(self, world_path: str, data: bytes, content_type: str = "application/octet-stream") -> str:
         """
         Store bytes at canonical WorldPath.
@@ -64,14 +82,94 @@ class ArtifactStore:
         canonical_path = canon_path_facet_root(world_path)
 
         try:
-            # Download via storage service
-            file_obj = self._service.download_file(canonical_path, "default")
-            if hasattr(file_obj, "read"):
-                return file_obj.read()
-            return file_obj
+            with self._service.open_stream(canonical_path, self._bucket) as stream:
+                return stream.read()
         except Exception:
             return None
 
+    def open_stream(self, world_path: str, range: ByteRange | None = None) -> ObjectStream:
+        """
+        Open a streaming reader over an artifact.
+
+        Args:
+            world_path: World path to read
+            range: Optional (start, end) inclusive byte range; negative start reads the tail
+
+        Returns:
+            File-like ObjectStream (close it, or use as a context manager)
+
+        Raises:
+            ValueError: If world_path is invalid
+        """
+        canonical_path = canon_path_facet_root(world_path)
+        return self._service.open_stream(canonical_path, self._bucket, range=range)
+
+    def iter_chunks(
+        self, world_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, range: ByteRange | None = None
+    ) -> Iterator[bytes]:
+        """
+        Iterate over an artifact's bytes in bounded chunks.
+
+        Args:
+            world_path: World path to read
+            chunk_size: Maximum bytes per chunk
+            range: Optional byte range (see open_stream)
+
+        Returns:
+            Iterator of byte chunks
+        """
+        canonical_path = canon_path_facet_root(world_path)
+        return self._service.iter_chunks(canonical_path, self._bucket, chunk_size=chunk_size, range=range)
+
+    def read_range(self, world_path: str, start: int, end: int | None = None) -> bytes:
+        """
+        Read part of an artifact without fetching the rest.
+
+        Args:
+            world_path: World path to read
+            start: First byte offset (negative for the last -start bytes)
+            end: Last byte offset, inclusive (None for end of file)
+
+        Returns:
+            Bytes in the requested range
+        """
+        with self.open_stream(world_path, range=(start, end)) as stream:
+            return stream.read()
+
+    def read_json(self, world_path: str) -> Any:
+        """
+        Parse a JSON artifact straight from the response stream.
+
+        Args:
+            world_path: World path to read
+
+        Returns:
+            Parsed JSON value
+        """
+        with self.open_stream(world_path) as stream:
+            return json.load(io.TextIOWrapper(io.BufferedReader(stream), encoding="utf-8"))
+
+    def download_to(self, world_path: str, local_path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Stream an artifact to a local file in constant memory.
+
+        Args:
+            world_path: World path to download
+            local_path: Destination file (parent directories are created)
+            chunk_size: Read size per chunk
+
+        Returns:
+            Number of bytes written
+        """
+        local_path = Path(local_path)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        written = 0
+        with open(local_path, "wb") as f:
+            for chunk in self.iter_chunks(world_path, chunk_size=chunk_size):
+                f.write(chunk)
+                written += len(chunk)
+        return written
+
     def presign(self, world_path: str, ttl_s: int = 3600) -> str:
         """
         Generate presigned URL for downloading from WorldPath.
@@ -89,9 +187,7 @@ class ArtifactStore:
         # Canonicalize and validate path
         canonical_path = canon_path_facet_root(world_path)
 
-        # Generate presigned URL
-        bucket = settings.STORAGE.get("BUCKET")
-        return self._service.get_file_url(key=canonical_path, bucket=bucket, expires_in=ttl_s)
+        return self._service.generate_presigned_get_url(key=canonical_path, bucket=self._bucket, expires_in=ttl_s)
 
     def presign_upload(self, world_path: str, ttl_s: int = 3600, content_type: str | None = None) -> str:
         """
@@ -129,7 +225,7 @@ class ArtifactStore:
         """
         try:
             canonical_path = canon_path_facet_root(world_path)
-            return self._service.file_exists(canonical_path, "default")
+            return self._service.file_exists(canonical_path, self._bucket)
         except (ValueError, Exception):
             return False
 
@@ -140,15 +236,55 @@ class ArtifactStore:
         Args:
             data: Bytes to compute CID for
 
+        Returns:
+            Content identifier (BLAKE3 or SHA256 prefixed)
+        """
+        return self.compute_cid_stream([data])
+
+    def compute_cid_stream(self, chunks: Iterable[bytes]) -> str:
+        """
+        Compute a content identifier incrementally (same result as compute_cid on the joined bytes).
+
+        Args:
+            chunks: Byte chunks (bytes, bytearray or memoryview)
+
         Returns:
             Content identifier (BLAKE3 or SHA256 prefixed)
         """
         try:
             import blake3
 
-            return "b3:" + blake3.blake3(data).hexdigest()
+            prefix, hasher = "b3:", blake3.blake3()
         except ImportError:
-            return "s256:" + hashlib.sha256(data).hexdigest()
+            prefix, hasher = "s256:", hashlib.sha256()
+        for chunk in chunks:
+            hasher.update(chunk)
+        return prefix + hasher.hexdigest()
+
+    def compute_file_cid(self, file_path: str | Path, chunk_size: int = CID_CHUNK_SIZE) -> str:
+        """
+        Compute a file's content identifier in constant memory.
+
+        The file is memory-mapped and hashed in chunk_size windows, so pages are
+        read by the kernel without copying the file into Python objects.
+
+        Args:
+            file_path: Local file to hash
+            chunk_size: Bytes hashed per update
+
+        Returns:
+            Content identifier (BLAKE3 or SHA256 prefixed)
+        """
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return self.compute_cid(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    return self.compute_cid_stream(view[i : i + chunk_size] for i in range(0, size, chunk_size))
+                finally:
+                    view.release()
 
     def put_file(self, world_path: str, file_path: str, content_type: str | None = None) -> str:
         """
@@ -162,19 +298,21 @@ class ArtifactStore:
         Returns:
             Canonical world path where file was stored
         """
-        # Read file and store as bytes
+        canonical_path = canon_path_facet_root(world_path)
+        content_type = content_type or _guess_content_type(file_path)
+
+        # Stream from disk; the adapter reads the file part by part
         with open(file_path, "rb") as f:
-            data = f.read()
+            self._service.upload_file(f, canonical_path, self._bucket, content_type=content_type)
+
+        return canonical_path
 
-        # Guess content type if not provided
-        if not content_type:
-            import mimetypes
 
-            content_type, _ = mimetypes.guess_type(file_path)
-            if not content_type:
-                content_type = "application/octet-stream"
+def _guess_content_type(file_path: str | Path) -> str:
+    import mimetypes
 
-        return self.put_bytes(world_path, data, content_type)
+    content_type, _ = mimetypes.guess_type(str(file_path))
+    return content_type or "application/octet-stream"
 
 
 # Singleton instance
@@ -0,0 +1,348 @@
+"""
+Read-through local disk cache in front of a StorageInterface adapter.
+
+Full-object reads are served from a size-bounded on-disk LRU keyed by
+(bucket, key, etag). Keys under an immutable prefix are served without a
+round trip; every other key is revalidated with a HEAD (ETag compare) so an
+overwritten object is never served stale. Concurrent misses for the same
+object share one download (single-flight fill).
+
+Enabled with STORAGE_CACHE_ENABLED=true; StorageService wraps its adapter.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Tuple
+
+from .interfaces import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    BatchResult,
+    ByteRange,
+    ObjectInfo,
+    ObjectStream,
+    StorageInterface,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    path: Path
+    size: int
+    etag: str
+    content_type: str | None
+    metadata: Dict[str, str]
+
+
+class _FileWindow:
+    """Sequential reader over bytes [start, end) of a memory-mapped cache file."""
+
+    def __init__(self, path: Path, start: int, end: int | None):
+        self._file = open(path, "rb")  # noqa: SIM115 - closed via close()
+        size = os.fstat(self._file.fileno()).st_size
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except OSError:
+            self._file.close()
+            raise
+        if start < 0:
+            start = max(size + start, 0)
+        self._pos = min(start, size)
+        self._end = size if end is None else min(end + 1, size)
+
+    @property
+    def length(self) -> int:
+        return max(self._end - self._pos, 0)
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._end - self._pos
+        data = self._buffer[self._pos : min(self._pos + max(size, 0), self._end)]
+        self._pos += len(data)
+        return data
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
+
+
+class CachingAdapter(StorageInterface):
+    """
+    StorageInterface decorator adding a read-through disk cache.
+
+    Args:
+        inner: Adapter that owns the data (S3, MinIO, filesystem)
+        directory: Cache directory (created if missing; survives restarts)
+        max_bytes: Evict least-recently-used entries above this total size
+        immutable_prefixes: Keys under these prefixes never change once written
+    """
+
+    def __init__(
+        self,
+        inner: StorageInterface,
+        directory: str | Path,
+        max_bytes: int,
+        immutable_prefixes: Iterable[str] = (),
+    ):
+        self.inner = inner
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.immutable_prefixes = tuple(immutable_prefixes)
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Tuple[str, str], _Entry] = OrderedDict()  # (bucket, key) -> entry, LRU order
+        self._fills: Dict[Tuple[str, str], threading.Lock] = {}
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "revalidations": 0, "evictions": 0}
+
+        (self.directory / "tmp").mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    # ---------------- Metrics ----------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters since start plus current size; hit_ratio is hits / (hits + misses)."""
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), bytes=self._bytes)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    # ---------------- Reads ----------------
+
+    def open_stream(self, key: str, bucket: str, range: ByteRange | None = None) -> ObjectStream:
+        entry = self._lookup(key, bucket)
+        if entry is None:
+            if range is not None:
+                # Don't pull a whole object to serve a slice of it
+                self._count("misses")
+                return self.inner.open_stream(key, bucket, range=range)
+            entry = self._fill(key, bucket)
+        try:
+            return self._serve(entry, range)
+        except FileNotFoundError:
+            # Evicted between lookup and open
+            self._discard(bucket, key, entry)
+            return self.inner.open_stream(key, bucket, range=range)
+
+    def download_file(self, key: str, bucket: str) -> bytes:
+        with self.open_stream(key, bucket) as stream:
+            return stream.read()
+
+    def _lookup(self, key: str, bucket: str) -> _Entry | None:
+        """Return a fresh cached entry (counting a hit) or None."""
+        with self._lock:
+            entry = self._entries.get((bucket, key))
+        if entry is None:
+            return None
+
+        if not key.startswith(self.immutable_prefixes):
+            self._count("revalidations")
+            current = (self.inner.get_file_metadata(key, bucket).get("etag") or "").strip('"')
+            if current != entry.etag:
+                self._discard(bucket, key, entry)
+                return None
+
+        with self._lock:
+            if self._entries.get((bucket, key)) is not entry:
+                return None  # evicted meanwhile
+            self._entries.move_to_end((bucket, key))
+            self._stats["hits"] += 1
+        return entry
+
+    def _fill(self, key: str, bucket: str) -> _Entry:
+        """Download the object into the cache; concurrent callers for the same key wait for one download."""
+        with self._lock:
+            fill_lock = self._fills.setdefault((bucket, key), threading.Lock())
+
+        with fill_lock:
+            with self._lock:
+                entry = self._entries.get((bucket, key))
+                if entry is not None:
+                    # Filled by the caller we waited on
+                    self._entries.move_to_end((bucket, key))
+                    self._stats["hits"] += 1
+                    return entry
+                self._stats["misses"] += 1
+
+            try:
+                entry = self._download(key, bucket)
+                self._insert(bucket, key, entry)
+            finally:
+                with self._lock:
+                    self._fills.pop((bucket, key), None)
+        return entry
+
+    def _download(self, key: str, bucket: str) -> _Entry:
+        fd, tmp = tempfile.mkstemp(dir=self.directory / "tmp")
+        try:
+            with os.fdopen(fd, "wb") as out, self.inner.open_stream(key, bucket) as stream:
+                size = 0
+                while chunk := stream.read(DEFAULT_CHUNK_SIZE):
+                    out.write(chunk)
+                    size += len(chunk)
+                etag = (stream.etag or "").strip('"')
+                content_type, metadata = stream.content_type, stream.metadata
+
+            path = self._entry_path(bucket, key, etag)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+        index = {"bucket": bucket, "key": key, "etag": etag, "content_type": content_type, "metadata": metadata}
+        path.with_suffix(".json").write_text(json.dumps(index))
+        return _Entry(path=path, size=size, etag=etag, content_type=content_type, metadata=metadata)
+
+    def _serve(self, entry: _Entry, range: ByteRange | None) -> ObjectStream:
+        start, end = range if range is not None else (0, None)
+        window = _FileWindow(entry.path, start, end)
+        return ObjectStream(
+            window,
+            release=window.close,
+            content_length=window.length,
+            content_type=entry.content_type,
+            etag=entry.etag,
+            metadata=entry.metadata,
+        )
+
+    # ---------------- Index & eviction ----------------
+
+    def _entry_path(self, bucket: str, key: str, etag: str) -> Path:
+        digest = hashlib.sha256(f"{bucket}\0{key}\0{etag}".encode()).hexdigest()
+        return self.directory / digest[:2] / digest
+
+    def _insert(self, bucket: str, key: str, entry: _Entry) -> None:
+        evicted = []
+        with self._lock:
+            old = self._entries.pop((bucket, key), None)
+            if old is not None:
+                self._bytes -= old.size
+                if old.path != entry.path:
+                    evicted.append(old)
+            self._entries[(bucket, key)] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, victim = self._entries.popitem(last=False)
+                self._bytes -= victim.size
+                self._stats["evictions"] += 1
+                evicted.append(victim)
+        for victim in evicted:
+            self._unlink(victim)
+
+    def _discard(self, bucket: str, key: str, entry: _Entry | None = None) -> None:
+        with self._lock:
+            current = self._entries.get((bucket, key))
+            if current is None or (entry is not None and current is not entry):
+                return
+            del self._entries[(bucket, key)]
+            self._bytes -= current.size
+        self._unlink(current)
+
+    @staticmethod
+    def _unlink(entry: _Entry) -> None:
+        # Open readers keep their mmap; POSIX unlink only drops the name
+        for path in (entry.path, entry.path.with_suffix(".json")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _load(self) -> None:
+        """Rebuild the index from disk, oldest access first."""
+        found = []
+        for index_path in self.directory.glob("*/*.json"):
+            data_path = index_path.with_suffix("")
+            try:
+                index = json.loads(index_path.read_text())
+                stat = data_path.stat()
+            except (OSError, ValueError):
+                continue
+            entry = _Entry(
+                path=data_path,
+                size=stat.st_size,
+                etag=index["etag"],
+                content_type=index.get("content_type"),
+                metadata=index.get("metadata") or {},
+            )
+            found.append((stat.st_atime, index["bucket"], index["key"], entry))
+        for _, bucket, key, entry in sorted(found, key=lambda item: item[0]):
+            self._insert(bucket, key, entry)
+
+    # ---------------- Writes invalidate ----------------
+
+    def upload_file(
+        self,
+        file: BinaryIO,
+        key: str,
+        bucket: str,
+        content_type: str | None = None,
+        metadata: Dict[str, Any] | None = None,
+    ) -> str:
+        self._discard(bucket, key)
+        return self.inner.upload_file(file, key, bucket, content_type, metadata)
+
+    def delete_file(self, key: str, bucket: str) -> bool:
+        self._discard(bucket, key)
+        return self.inner.delete_file(key, bucket)
+
+    def delete_many(self, keys: Iterable[str], bucket: str) -> BatchResult:
+        keys = list(keys)
+        for key in keys:
+            self._discard(bucket, key)
+        return self.inner.delete_many(keys, bucket)
+
+    def copy_many(self, pairs: Iterable[Tuple[str, str]], bucket: str, source_bucket: str | None = None) -> BatchResult:
+        pairs = list(pairs)
+        for _, dst in pairs:
+            self._discard(bucket, dst)
+        return self.inner.copy_many(pairs, bucket, source_bucket)
+
+    # ---------------- Pass-through ----------------
+
+    def get_file_url(self, key: str, bucket: str, expires_in: int = 3600) -> str:
+        return self.inner.get_file_url(key, bucket, expires_in)
+
+    def get_upload_url(self, key: str, bucket: str, expires_in: int = 3600, content_type: str | None = None) -> str:
+        # The object is about to be replaced out of band
+        self._discard(bucket, key)
+        return self.inner.get_upload_url(key, bucket, expires_in, content_type)
+
+    def file_exists(self, key: str, bucket: str) -> bool:
+        return self.inner.file_exists(key, bucket)
+
+    def list_files(self, bucket: str, prefix: str = "") -> list:
+        return self.inner.list_files(bucket, prefix)
+
+    def iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str | None = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[ObjectInfo]:
+        return self.inner.iter_objects(bucket, prefix, start_after=start_after, page_size=page_size)
+
+    def get_file_metadata(self, key: str, bucket: str) -> Dict[str, Any]:
+        return self.inner.get_file_metadata(key, bucket)
+
+    def __getattr__(self, name: str):
+        # Adapter-specific extras (ensure_bucket, invalidate_bucket_cache, client, ...)
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
@@ -0,0 +1,102 @@
+"""
+At-rest compression for text-like objects.
+
+Callers opt in per upload (StorageService.upload_bytes(compress=True)); the
+object is compressed with zstd at settings.STORAGE["COMPRESSION"]["LEVEL"] and
+marked with a "content-encoding" user-metadata entry. The marker is deliberately not the HTTP
+Content-Encoding header, so HTTP clients never decode behind our back and the
+stored bytes and ETag stay stable. StorageService decodes marked objects on read.
+
+Presigned GETs bypass StorageService and return the stored bytes, so only
+objects the backend reads itself (run event log segments) opt in; artifacts,
+which tools fetch through presigned URLs, are stored verbatim.
+"""
+
+import io
+from typing import Dict, Tuple
+
+from django.conf import settings
+
+from .interfaces import ByteRange, ObjectStream
+
+ENCODING_METADATA_KEY = "content-encoding"
+ZSTD = "zstd"
+
+
+def compress_bytes(data: bytes, metadata: Dict[str, str] | None = None) -> Tuple[bytes, Dict[str, str]]:
+    """
+    zstd-compress data and add the encoding marker to metadata.
+
+    Returns:
+        (compressed bytes, metadata including the marker)
+    """
+    import zstandard
+
+    level = settings.STORAGE.get("COMPRESSION", {}).get("LEVEL", 3)
+    compressed = zstandard.ZstdCompressor(level=level).compress(data)
+    return compressed, {**(metadata or {}), ENCODING_METADATA_KEY: ZSTD}
+
+
+def encode(
+    data: bytes, metadata: Dict[str, str] | None = None, compress: bool = False
+) -> Tuple[bytes, Dict[str, str] | None]:
+    """Bytes and metadata exactly as they will be stored."""
+    if compress:
+        return compress_bytes(data, metadata)
+    return data, metadata
+
+
+def encoding_of(metadata: Dict[str, str] | None) -> str | None:
+    """Encoding marker from user metadata (adapters differ in key casing)."""
+    for key, value in (metadata or {}).items():
+        if key.lower() == ENCODING_METADATA_KEY:
+            return value
+    return None
+
+
+def decode_stream(stream: ObjectStream, range: ByteRange | None = None) -> ObjectStream:
+    """
+    Wrap a raw stream of a marked object so reads return the original bytes.
+
+    Unmarked streams are returned unchanged. Byte ranges of compressed objects
+    refer to the original bytes, so they are served by decoding the whole object
+    (only whole-read objects such as event log segments are compressed).
+    """
+    encoding = encoding_of(stream.metadata)
+    if encoding is None:
+        return stream
+    if encoding != ZSTD:
+        stream.close()
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    import zstandard
+
+    reader = zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+    metadata = {k: v for k, v in stream.metadata.items() if k.lower() != ENCODING_METADATA_KEY}
+
+    if range is None:
+        return ObjectStream(
+            reader,
+            release=lambda: (reader.close(), stream.close()),
+            content_type=stream.content_type,
+            etag=stream.etag,
+            metadata=metadata,
+        )
+
+    try:
+        data = reader.read()
+    finally:
+        reader.close()
+        stream.close()
+    start, end = range
+    if start < 0:
+        data = data[start:]
+    else:
+        data = data[start : None if end is None else end + 1]
+    return ObjectStream(
+        io.BytesIO(data),
+        content_length=len(data),
+        content_type=stream.content_type,
+        etag=stream.etag,
+        metadata=metadata,
+    )
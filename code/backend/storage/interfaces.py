@@ -1,5 +1,123 @@
+import io
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, BinaryIO
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, BinaryIO, Callable, Iterable, Iterator, List, Tuple
+
+from .metrics import transfer_metrics
+
+# Default read size for streamed downloads
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Keys per listing request (S3 maximum)
+DEFAULT_PAGE_SIZE = 1000
+
+# Keys per DeleteObjects request (S3 maximum)
+DELETE_BATCH_SIZE = 1000
+
+# (start, end) inclusive byte offsets; end=None reads to EOF; negative start reads the last -start bytes
+ByteRange = Tuple[int, int | None]
+
+
+def range_header(byte_range: ByteRange | None) -> str | None:
+    """Format a ByteRange as an HTTP Range header value (None for a full read)."""
+    if byte_range is None:
+        return None
+    start, end = byte_range
+    if start < 0:
+        if end is not None:
+            raise ValueError("Suffix ranges (negative start) cannot have an end")
+        return f"bytes={start}"
+    if end is None:
+        return f"bytes={start}-"
+    if end < start:
+        raise ValueError(f"Invalid byte range: {start}-{end}")
+    return f"bytes={start}-{end}"
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    """One entry from a prefix listing."""
+
+    key: str
+    size: int
+    etag: str
+    mtime: datetime | None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batched operation: keys that succeeded and per-key failure messages."""
+
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def merge(self, other: "BatchResult") -> None:
+        self.succeeded.extend(other.succeeded)
+        self.failed.update(other.failed)
+
+
+class ObjectStream(io.RawIOBase):
+    """
+    Readable, file-like view of a stored object's body.
+
+    Wraps the adapter's HTTP body so callers can read incrementally, and
+    releases the underlying connection on close(). Use as a context manager.
+    When backend is set, the bytes read are recorded in transfer metrics on close.
+    """
+
+    def __init__(
+        self,
+        body,
+        *,
+        release: Callable[[], None] | None = None,
+        content_length: int | None = None,
+        content_type: str | None = None,
+        etag: str | None = None,
+        metadata: Dict[str, str] | None = None,
+        backend: str | None = None,
+    ):
+        super().__init__()
+        self._body = body
+        self._release = release
+        self.content_length = content_length
+        self.content_type = content_type
+        self.etag = etag
+        self.metadata = metadata or {}
+        self.bytes_read = 0
+        self._backend = backend
+        self._opened_at = time.monotonic()
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        data = self._body.read() if size is None or size < 0 else self._body.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self._body.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        self.bytes_read += n
+        return n
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._release:
+                self._release()
+        finally:
+            super().close()
+            if self._backend and self.bytes_read:
+                transfer_metrics.record(self._backend, "download", self.bytes_read, time.monotonic() - self._opened_at)
 
 
 class StorageInterface(ABC):
@@ -22,11 +140,37 @@ class StorageInterface(ABC):
         """Download a file and return its contents"""
         pass
 
+    @abstractmethod
+    def open_stream(self, key: str, bucket: str, range: ByteRange | None = None) -> ObjectStream:
+        """Open a streaming reader over a file (optionally a byte range); caller must close it"""
+        pass
+
+    def iter_chunks(
+        self, key: str, bucket: str, chunk_size: int = DEFAULT_CHUNK_SIZE, range: ByteRange | None = None
+    ) -> Iterator[bytes]:
+        """Yield a file's contents in chunks of at most chunk_size bytes"""
+        with self.open_stream(key, bucket, range=range) as stream:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
     @abstractmethod
     def delete_file(self, key: str, bucket: str) -> bool:
         """Delete a file and return success status"""
         pass
 
+    @abstractmethod
+    def delete_many(self, keys: Iterable[str], bucket: str) -> BatchResult:
+        """Delete many files with batched requests; failures are reported per key"""
+        pass
+
+    @abstractmethod
+    def copy_many(self, pairs: Iterable[Tuple[str, str]], bucket: str, source_bucket: str | None = None) -> BatchResult:
+        """Server-side copy (source_key, dest_key) pairs into bucket; failures are reported per dest key"""
+        pass
+
     @abstractmethod
     def get_file_url(self, key: str, bucket: str, expires_in: int = 3600) -> str:
         """Get a presigned URL for downloading the file"""
@@ -47,6 +191,13 @@ class StorageInterface(ABC):
         """List files in a bucket with optional prefix"""
         pass
 
+    @abstractmethod
+    def iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str | None = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[ObjectInfo]:
+        """Lazily list every object under prefix (keys after start_after), fetching one page at a time"""
+        pass
+
     @abstractmethod
     def get_file_metadata(self, key: str, bucket: str) -> Dict[str, Any]:
         """Get file metadata"""
@@ -0,0 +1,65 @@
+"""
+Transfer throughput metrics for storage adapters.
+
+Adapters record every upload and every closed download stream; snapshot()
+aggregates bytes, seconds and MB/s per (backend, direction).
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TransferMetrics:
+    """Thread-safe per-process transfer counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def record(self, backend: str, direction: str, nbytes: int, seconds: float) -> None:
+        """
+        Record one completed transfer.
+
+        Args:
+            backend: Adapter label ("s3", "minio", ...)
+            direction: "upload" or "download"
+            nbytes: Bytes transferred
+            seconds: Wall-clock duration
+        """
+        with self._lock:
+            totals = self._totals.setdefault((backend, direction), {"count": 0, "bytes": 0, "seconds": 0.0})
+            totals["count"] += 1
+            totals["bytes"] += nbytes
+            totals["seconds"] += seconds
+        logger.debug(
+            "storage.%s backend=%s bytes=%d seconds=%.3f mbps=%.1f",
+            direction,
+            backend,
+            nbytes,
+            seconds,
+            _mbps(nbytes, seconds),
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Totals keyed "backend.direction", each with count, bytes, seconds and mbps (MB/s)."""
+        with self._lock:
+            items = [(k, dict(v)) for k, v in self._totals.items()]
+        return {
+            f"{backend}.{direction}": {**t, "mbps": _mbps(t["bytes"], t["seconds"])}
+            for (backend, direction), t in items
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+def _mbps(nbytes: float, seconds: float) -> float:
+    return nbytes / seconds / 1_000_000 if seconds > 0 else 0.0
+
+
+# Process-wide transfer metrics
+transfer_metrics = TransferMetrics()
@@ -1,16 +1,21 @@
 from django.conf import settings
-from .adapters import MinIOAdapter, S3Adapter
-from .interfaces import StorageInterface
+from . import codec
+from .adapters import FileSystemAdapter, MinIOAdapter, S3Adapter
+from .cache import CachingAdapter
+from .aio import AsyncMinIOAdapter, AsyncS3Adapter, AsyncStorageInterface
+from .interfaces import DEFAULT_CHUNK_SIZE, DEFAULT_PAGE_SIZE, StorageInterface
 
 
 class StorageService:
     """
     Vendor-neutral storage service that automatically switches between
-    MinIO (development) and S3 (production) based on configuration
+    MinIO (development), S3 (production) and the local filesystem (single-node)
+    based on configuration
     """
 
     _instance = None
     _adapter = None
+    _aio = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -22,13 +27,27 @@ class StorageService:
             self._adapter = self._get_adapter()
 
     def _get_adapter(self) -> StorageInterface:
-        """Factory method to get the appropriate storage adapter"""
+        """Factory method to get the appropriate storage adapter (wrapped in the disk cache if enabled)"""
+        adapter = self._get_backend_adapter()
+        cache_config = settings.STORAGE.get("CACHE", {})
+        if cache_config.get("ENABLED"):
+            return CachingAdapter(
+                adapter,
+                directory=cache_config["DIR"],
+                max_bytes=cache_config["MAX_BYTES"],
+                immutable_prefixes=cache_config.get("IMMUTABLE_PREFIXES", ()),
+            )
+        return adapter
+
+    def _get_backend_adapter(self) -> StorageInterface:
         storage_backend = settings.STORAGE_BACKEND.lower()
 
         if storage_backend == "s3":
             return S3Adapter()
         elif storage_backend == "minio":
             return MinIOAdapter()
+        elif storage_backend == "fs":
+            return FileSystemAdapter()
         else:
             raise ValueError(f"Unsupported storage backend: {storage_backend}")
 
@@ -36,16 +55,56 @@ class StorageService:
     def adapter(self) -> StorageInterface:
         return self._adapter
 
+    @property
+    def aio(self) -> AsyncStorageInterface:
+        """Async adapter for the same backend (built on first use, shares one connection pool)."""
+        if self._aio is None:
+            storage_backend = settings.STORAGE_BACKEND.lower()
+            if storage_backend == "s3":
+                self._aio = AsyncS3Adapter.from_settings(presigner=self.adapter)
+            elif storage_backend == "minio":
+                self._aio = AsyncMinIOAdapter.from_settings(presigner=self.adapter)
+            else:
+                raise ValueError(f"No async adapter for storage backend: {storage_backend}")
+        return self._aio
+
     # Delegate all interface methods to the adapter
     def upload_file(self, file, key, bucket, content_type=None, metadata=None):
         return self.adapter.upload_file(file, key, bucket, content_type, metadata)
 
     def download_file(self, key, bucket):
-        return self.adapter.download_file(key, bucket)
+        with self.open_stream(key, bucket) as stream:
+            return stream.read()
+
+    def open_stream(self, key, bucket, range=None):
+        """Open a reader over an object, transparently decoding compressed objects."""
+        stream = self.adapter.open_stream(key, bucket, range=range)
+        if range is not None and codec.encoding_of(stream.metadata):
+            # Ranges address the original bytes; a compressed object has to be read whole
+            stream.close()
+            stream = self.adapter.open_stream(key, bucket)
+        return codec.decode_stream(stream, range)
+
+    def iter_chunks(self, key, bucket, chunk_size=DEFAULT_CHUNK_SIZE, range=None):
+        with self.open_stream(key, bucket, range=range) as stream:
+            while chunk := stream.read(chunk_size):
+                yield chunk
 
     def delete_file(self, key, bucket):
         return self.adapter.delete_file(key, bucket)
 
+    def delete_many(self, keys, bucket):
+        return self.adapter.delete_many(keys, bucket)
+
+    def copy_many(self, pairs, bucket, source_bucket=None):
+        return self.adapter.copy_many(pairs, bucket, source_bucket)
+
+    def delete_prefix(self, bucket, prefix):
+        """Delete every object under prefix (e.g. a world or run) with batched deletes."""
+        if not prefix:
+            raise ValueError("Refusing to delete an empty prefix (whole bucket)")
+        return self.delete_many((obj.key for obj in self.iter_objects(bucket, prefix)), bucket)
+
     def generate_presigned_get_url(self, key, bucket, expires_in=3600):
         return self.adapter.get_file_url(key, bucket, expires_in)
 
@@ -61,25 +120,28 @@ class StorageService:
     def list_files(self, bucket, prefix=""):
         return self.adapter.list_files(bucket, prefix)
 
+    def iter_objects(self, bucket, prefix="", start_after=None, page_size=DEFAULT_PAGE_SIZE):
+        return self.adapter.iter_objects(bucket, prefix, start_after=start_after, page_size=page_size)
+
     def get_file_metadata(self, key, bucket):
         return self.adapter.get_file_metadata(key, bucket)
 
-    def upload_bytes(self, data, key, content_type="application/json", bucket=None, metadata=None):
-        """Upload bytes data as a file. Convenience wrapper around upload_file."""
+    def upload_bytes(self, data, key, content_type="application/json", bucket=None, metadata=None, compress=False):
+        """
+        Upload bytes data as a file. Convenience wrapper around upload_file.
+
+        compress=True stores it zstd-compressed (see codec), decoded transparently
+        on read. Only for objects the backend reads: presigned GETs serve stored bytes.
+        """
         import io
         from django.conf import settings
 
         bucket = bucket or settings.STORAGE.get("BUCKET")
+        data, metadata = codec.encode(data, metadata, compress)
         return self.upload_file(
             file=io.BytesIO(data), key=key, bucket=bucket, content_type=content_type, metadata=metadata
         )
 
-    def write_file(self, path: str, data, mime: str = "application/octet-stream"):
-        """Write file data to storage. Accepts str or bytes data."""
-        if isinstance(data, str):
-            data = data.encode("utf-8")
-        return self.upload_bytes(data, path, content_type=mime)
-
 
 # Singleton instance
 storage_service = StorageService()
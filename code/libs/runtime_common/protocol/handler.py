@@ -5,7 +5,8 @@ Contract:
   entry(payload: dict, emit: callable | None, ctrl: Event | None) -> envelope: dict
 
 Where:
-  - payload: {"run_id": str, "mode": str, "inputs": dict, "outputs": dict | None}
+  - payload: {"run_id": str, "mode": str, "idempotency_key": str, "attempt": int, "inputs": dict, "outputs": dict | None}
+  - idempotency_key: same on every attempt of a run; tools with side effects dedupe on it
   - emit: callable to send events ({"kind": "Token"|"Event"|"Log", "content": {...}})
   - ctrl: multiprocessing.Event for cancellation (check ctrl.is_set())
   - outputs: If present, dict of {key: presigned_put_url}. If absent, write to /artifacts/{run_id}/
@@ -55,6 +56,8 @@ def entry(payload: Dict[str, Any], emit: Callable[[Dict], None] | None = None, c
         payload: {
             "run_id": str,
             "mode": "mock" | "real",
+            "idempotency_key": str,  # stable across retries of the run
+            "attempt": int,  # 1 for the first attempt
             "inputs": {
                 "key": <presigned_url> | <local_path> | <inline_value>
             },
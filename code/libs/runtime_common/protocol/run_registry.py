@@ -40,6 +40,9 @@ class RunRegistry:
                 info("run.registry.open", run_id=rid)
             return run
 
+    def has(self, rid: str) -> bool:
+        return rid in self._runs
+
     async def state(self, rid: str) -> RunState:
         r = await self.get_or_create(rid)
         return r.state
@@ -114,6 +117,22 @@ class RunRegistry:
         run = await self.get_or_create(rid)
 
         if op == "preempt":
+            if run.state in (RunState.PREEMPTED, RunState.COMPLETED, RunState.ERROR):
+                # already settled; nothing to stop
+                await self.emit(
+                    rid,
+                    {
+                        "kind": "Event",
+                        "content": {
+                            "phase": "control_noop",
+                            "op": op,
+                            "by": controller_id,
+                            "noop": True,
+                            "ts": int(time.time() * 1000),
+                        },
+                    },
+                )
+                return
             # mark state
             run.state = RunState.PREEMPTED
             # signal worker cooperatively
@@ -129,6 +148,16 @@ class RunRegistry:
                     "content": {"phase": "preempted", "by": controller_id, "ts": int(time.time() * 1000)},
                 },
             )
+            # settle clients now; the worker's own final Response (if any) is dropped by the pump
+            await self.emit(
+                rid,
+                {
+                    "kind": "Response",
+                    "control": {"run_id": rid, "status": "error", "cost_micro": 0, "final": True},
+                    "error": {"code": "ERR_PREEMPTED", "message": f"Run preempted by {controller_id}"},
+                    "outputs": {},
+                },
+            )
 
         elif op == "pause":
             run.state = RunState.PAUSED
@@ -10,6 +10,20 @@ from multiprocessing import get_context
 from .handler import entry
 
 
+def handler_payload(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Handler payload (see handler.entry) from the run's first Request message."""
+    control = request.get("control") or {}
+    return {
+        "run_id": str(control.get("run_id", "")).strip(),
+        "mode": control.get("mode", "mock"),
+        # Stable across retries of the same run; attempt counts from 1
+        "idempotency_key": control.get("idempotency_key") or "",
+        "attempt": int(control.get("attempt") or 1),
+        "inputs": request.get("inputs", {}),
+        "outputs": request.get("outputs", {}),
+    }
+
+
 def _emit_to_q(q):
     def _emit(ev: Dict[str, Any]):
         # Defensive: ensure small JSON-able dicts (large media goes via PUT)
@@ -1,4 +1,5 @@
 import asyncio
+import itertools
 import time
 import json
 import os
@@ -7,11 +8,14 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from starlette.exceptions import WebSocketException
 from .types import ConnectionRole, RunState
 from .run_registry import registry
-from .worker import spawn_worker
+from .worker import handler_payload, spawn_worker
 from .logging import info
 
 app = FastAPI()
 
+# Distinguishes connections opened in the same millisecond (e.g. a client and its controller)
+_conn_seq = itertools.count()
+
 
 @app.get("/healthz")
 def healthz():
@@ -30,7 +34,7 @@ async def run_ws(ws: WebSocket):
         raise WebSocketException(code=1002)
 
     await ws.accept(subprotocol=required)
-    connection_id = f"conn-{int(time.time() * 1000)}"
+    connection_id = f"conn-{int(time.time() * 1000)}-{next(_conn_seq)}"
     run_id: str | None = None
     role: ConnectionRole | None = None
 
@@ -49,15 +53,19 @@ async def run_ws(ws: WebSocket):
             return
 
         # Build payload for handler
-        payload = {
-            "run_id": run_id,
-            "mode": control.get("mode", "mock"),
-            "inputs": msg.get("inputs", {}),
-            "outputs": msg.get("outputs", {}),
-        }
+        payload = handler_payload(msg)
+
+        # Role: clients start the run; controllers (the control plane) steer it; observers only listen
+        role = ConnectionRole.__members__.get(str(control.get("role") or "client").upper())
+        if role is None:
+            await ws.close(code=1008)
+            return
 
-        # Default role to client (simplified - no multi-role protocol)
-        role = ConnectionRole.CLIENT
+        # Controllers and observers attach to a run started by a client on this container
+        if role is not ConnectionRole.CLIENT and not registry.has(run_id):
+            await ws.send_json({"kind": "Error", "content": {"message": f"Unknown run {run_id}"}})
+            await ws.close(code=1008)
+            return
 
         # Register connection
         run = await registry.get_or_create(run_id)
@@ -85,6 +93,9 @@ async def run_ws(ws: WebSocket):
                             break
                         # If terminal Response, update state and log settlement
                         if ev.get("kind") == "Response" and ev.get("control", {}).get("final"):
+                            if await registry.state(run_id) == RunState.PREEMPTED:
+                                # registry already sent the preempted Response
+                                continue
                             status = ev.get("control", {}).get("status")
                             new_state = RunState.COMPLETED if status == "success" else RunState.ERROR
                             await registry.update_state(run_id, new_state)
@@ -123,8 +134,10 @@ async def run_ws(ws: WebSocket):
 
             asyncio.create_task(watch_cancel())
 
-        # Controllers read control frames; observers just keep the socket open
+        # Controllers read control frames (a first control op may ride on the Request); observers just listen
         if role is ConnectionRole.CONTROLLER:
+            if msg.get("content"):
+                await registry.apply_control(run_id, connection_id, msg["content"])
             while True:
                 m = await ws.receive_json()
                 if m.get("kind") == "control":
@@ -0,0 +1,82 @@
+"""
+Shared fixtures for unit tests of the run pipeline.
+
+make_run enqueues runs in the test DB. fake_adapter stands in for the
+WebSocket adapters; tests configure what it answers and read what it was
+asked. use_adapter installs any other adapter the same way.
+"""
+
+import pytest
+
+
+class FakeAdapter:
+    """
+    Configurable container adapter.
+
+    invoke_run raises the next of `failures`, else streams `events` and returns
+    `response`. control_run raises `control_error` if set, else acknowledges the
+    op. Calls are recorded in invoked (run ids), keys (idempotency keys) and ops.
+    """
+
+    def __init__(self):
+        self.response = {
+            "kind": "Response",
+            "control": {"status": "success", "cost_micro": 5, "final": True},
+            "outputs": {},
+        }
+        self.failures = []
+        self.events = []
+        self.control_error = None
+        self.invoked = []
+        self.keys = []
+        self.ops = []
+
+    def invoke_run(self, run, on_event=None):
+        self.invoked.append(str(run.id))
+        self.keys.append(run.idempotency_key)
+        if self.failures:
+            raise self.failures.pop(0)
+        for event in self.events:
+            on_event(event)
+        return self.response
+
+    def control_run(self, run, content, timeout_s=5):
+        self.ops.append((str(run.id), content))
+        if self.control_error:
+            raise self.control_error
+        if content["op"] == "set_budget":
+            budgets = {"tokens": content.get("tokens"), "time_s": content.get("time_s")}
+            return {"kind": "Event", "content": {"phase": "budget_updated", "budgets": budgets}}
+        return {"kind": "Event", "content": {"phase": "preempted"}}
+
+
+@pytest.fixture
+def use_adapter(monkeypatch):
+    """use_adapter(adapter) routes every run to adapter and returns it."""
+
+    def use(adapter):
+        monkeypatch.setattr("apps.core.utils.adapters.get_adapter_for_run", lambda name: adapter)
+        return adapter
+
+    return use
+
+
+@pytest.fixture
+def fake_adapter(use_adapter):
+    return use_adapter(FakeAdapter())
+
+
+@pytest.fixture
+def make_run(db):
+    """make_run(inputs=None, ref=..., status="pending") enqueues a run in one world (make_run.world / .agent)."""
+    from apps.agents.models import Agent
+    from apps.runs.services import RunService
+    from apps.worlds.models import World
+
+    world, agent = World.objects.create(name="w"), Agent.objects.create(name="a")
+
+    def make(inputs=None, ref="llm/litellm@1", status="pending"):
+        return RunService.enqueue(world, agent, ref, inputs or {}, "local", "mock", status=status)
+
+    make.world, make.agent = world, agent
+    return make
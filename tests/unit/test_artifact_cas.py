@@ -0,0 +1,68 @@
+"""
+Unit tests for content identifiers and CID-addressed attachment ingestion in ArtifactStore.
+
+Hermetic: an in-memory fake replaces the storage service.
+"""
+
+import pytest
+
+
+class FakeStorageService:
+    def __init__(self):
+        self.objects = {}
+        self.uploads = 0
+
+    def upload_bytes(self, data, key, content_type="application/json", bucket=None, metadata=None, compress=None):
+        self.uploads += 1
+        self.objects[key] = data
+
+    def upload_file(self, file, key, bucket, content_type=None, metadata=None):
+        self.uploads += 1
+        self.objects[key] = b"".join(iter(lambda: file.read(4), b""))  # read incrementally, like an adapter
+
+    def open_stream(self, key, bucket, range=None):
+        import io
+
+        from backend.storage.interfaces import ObjectStream
+
+        if key not in self.objects:
+            raise FileNotFoundError(key)
+        return ObjectStream(io.BytesIO(self.objects[key]))
+
+    def file_exists(self, key, bucket):
+        return key in self.objects
+
+
+@pytest.fixture
+def store():
+    from backend.storage.artifact_store import ArtifactStore
+
+    s = ArtifactStore()
+    s._service = FakeStorageService()
+    return s
+
+
+@pytest.mark.unit
+def test_file_cid_matches_in_memory_cid_across_windows(store, tmp_path):
+    for size in (0, 1, 10, 25):
+        path = tmp_path / f"f{size}"
+        path.write_bytes(bytes(range(size)))
+        assert store.compute_file_cid(path, chunk_size=8) == store.compute_cid(bytes(range(size)))
+
+
+@pytest.mark.unit
+def test_attachments_are_readable_at_their_artifact_path(store, tmp_path, monkeypatch):
+    from apps.core.utils import run_utils
+
+    monkeypatch.setattr(run_utils, "artifact_store", store)
+    path = tmp_path / "Report.TXT"
+    path.write_bytes(b"attached")
+
+    first = run_utils.materialize_attachments([f"doc={path}"])["doc"]
+    again = run_utils.materialize_attachments([f"doc={path}"])["doc"]
+
+    # Tools read the $artifact path by raw key
+    assert store._service.objects[first["$artifact"]] == b"attached"
+    assert first["$artifact"] == f"/artifacts/inputs/{first['cid']}/report.txt"
+    assert again == first and store._service.uploads == 1
+    assert store.get_bytes(first["$artifact"]) == b"attached"
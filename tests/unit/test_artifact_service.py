@@ -0,0 +1,150 @@
+"""
+Unit tests for ArtifactService file and bulk ingestion.
+
+Hermetic: a recording fake replaces the storage service; rows live in the test DB.
+"""
+
+import hashlib
+
+import pytest
+
+
+class RecordingStorage:
+    def __init__(self):
+        self.uploads = []
+        self.heads = 0
+
+    def upload_bytes(self, data, key, content_type="application/json", bucket=None, metadata=None, compress=None):
+        self.uploads.append((key, data, metadata))
+
+    def get_file_metadata(self, key, bucket):
+        self.heads += 1
+        return {}
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    fake = RecordingStorage()
+    monkeypatch.setattr("apps.artifacts.services.StorageService", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def world(db):
+    from apps.worlds.models import World
+
+    return World.objects.create(name="w")
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_size_sha256_and_etag_computed_locally(storage, world):
+    from apps.artifacts.services import ArtifactService
+
+    artifact = ArtifactService.create_file_artifact(world, "run-1", "doc.bin", b"abc")
+
+    assert artifact.size_bytes == 3
+    assert artifact.sha256 == hashlib.sha256(b"abc").hexdigest()
+    assert artifact.etag == hashlib.md5(b"abc").hexdigest()
+    assert artifact.path == f"{world.id}/run-1/doc.bin"
+    assert len(storage.uploads) == 1 and storage.heads == 0
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_identical_content_in_world_skips_upload(storage, world):
+    from apps.artifacts.services import ArtifactService
+    from apps.worlds.models import World
+
+    first = ArtifactService.create_file_artifact(world, "run-1", "a.json", b'{"x": 1}', "application/json")
+    second = ArtifactService.create_file_artifact(world, "run-2", "b.json", b'{"x": 1}', "application/json")
+
+    assert len(storage.uploads) == 1
+    assert second.uri == f"world://{world.id}/run-2/b.json"
+    assert (second.path, second.etag) == (first.path, first.etag)
+
+    # Dedup is world-scoped
+    other = World.objects.create(name="other")
+    ArtifactService.create_file_artifact(other, "run-3", "a.json", b'{"x": 1}', "application/json")
+    assert len(storage.uploads) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_create_many_uploads_distinct_contents_and_bulk_inserts(storage, world, django_assert_max_num_queries):
+    from apps.artifacts.services import ArtifactService
+
+    ArtifactService.create_file_artifact(world, "run-0", "old.json", b'"seen before"', "application/json")
+    items = {
+        "config": {"temperature": 0.2},
+        "prompt": "hello",
+        "again": "hello",
+        "old": "seen before",
+        "blob": b"\x00\x01",
+        "n": 3,
+    }
+
+    with django_assert_max_num_queries(2):
+        artifacts = ArtifactService.create_many(world, "run-1", items)
+
+    assert list(artifacts) == list(items)
+    assert artifacts["config"].is_scalar and artifacts["n"].data == 3
+    assert artifacts["prompt"].uri == f"world://{world.id}/run-1/prompt.json"
+    assert artifacts["again"].path == artifacts["prompt"].path
+    assert artifacts["old"].path == f"{world.id}/run-0/old.json"
+    # Pre-existing upload + "hello" + blob
+    assert len(storage.uploads) == 3
+    assert world.artifacts.count() == 7
+
+
+class PresignStub:
+    def generate_presigned_put_url(self, bucket, key, expires_in):
+        return f"https://put/{key}"
+
+    def generate_presigned_get_url(self, bucket, key, expires_in):
+        return f"https://get/{key}"
+
+
+def _hydrated(world, monkeypatch, inputs):
+    from apps.agents.models import Agent
+    from apps.core.adapters.base_ws_adapter import BaseWsAdapter
+    from apps.runs.models import Run
+
+    monkeypatch.setattr("backend.storage.service.StorageService", PresignStub)
+    run = Run.objects.create(
+        world=world, caller_agent=Agent.objects.create(name="a"), ref="t@1", mode="mock", adapter="local", inputs=inputs
+    )
+    return BaseWsAdapter()._build_payload(run)["inputs"]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_repeated_input_hydrates_to_the_stored_object(storage, world, monkeypatch):
+    from apps.artifacts.services import ArtifactService
+
+    first = ArtifactService.create_file_artifact(world, "run-1", "doc.bin", b"same bytes")
+    second = ArtifactService.create_file_artifact(world, "run-2", "doc.bin", b"same bytes")
+    assert len(storage.uploads) == 1
+
+    inputs = _hydrated(world, monkeypatch, {"doc": second.uri, "nested": [first.uri]})
+
+    # Only run-1's object exists; both URIs must presign it
+    assert inputs == {"doc": f"https://get/{first.path}", "nested": [f"https://get/{first.path}"]}
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_create_many_duplicates_hydrate_to_the_uploaded_object(storage, world, monkeypatch):
+    from apps.artifacts.services import ArtifactService
+
+    ArtifactService.create_file_artifact(world, "run-0", "old.json", b'"seen before"', "application/json")
+    artifacts = ArtifactService.create_many(world, "run-1", {"a": "hello", "b": "hello", "old": "seen before"})
+    uploaded = {key for key, _, _ in storage.uploads}
+    assert len(uploaded) == 2
+
+    inputs = _hydrated(world, monkeypatch, {key: artifact.uri for key, artifact in artifacts.items()})
+
+    # In-call duplicate "b" and the world-level duplicate resolve to objects that were actually written
+    assert inputs["a"] == inputs["b"] == f"https://get/{world.id}/run-1/a.json"
+    assert inputs["old"] == f"https://get/{world.id}/run-0/old.json"
+    assert {url.removeprefix("https://get/") for url in inputs.values()} <= uploaded
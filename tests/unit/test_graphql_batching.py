@@ -0,0 +1,83 @@
+"""
+Unit tests for N+1-free GraphQL resolution of runs and their relations.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+QUERY = """
+{
+  runs {
+    id
+    status
+    world { name }
+    tool { ref }
+    outputs { key uri }
+    artifacts { key direction artifact { uri contentType } }
+  }
+}
+"""
+
+
+@pytest.fixture
+def schema():
+    from typing import List
+
+    import strawberry
+    import strawberry_django
+    from strawberry_django.optimizer import DjangoOptimizerExtension
+
+    from apps.runs.graphql.types import RunType
+    from apps.runs.models import Run
+
+    @strawberry.type
+    class Query:
+        @strawberry_django.field
+        def runs(self) -> List[RunType]:
+            return Run.objects.all()
+
+    return strawberry.Schema(query=Query, extensions=[DjangoOptimizerExtension])
+
+
+def _add_runs(n):
+    from apps.agents.models import Agent
+    from apps.artifacts.models import Artifact
+    from apps.runs.models import Run, RunArtifact, RunOutput
+    from apps.tools.models import Tool
+    from apps.worlds.models import World
+
+    agent = Agent.objects.get_or_create(name="a")[0]
+    Tool.objects.get_or_create(
+        ref="llm/litellm@1", defaults={"namespace": "llm", "name": "litellm", "version": 1, "ref_slug": "llm_litellm_1"}
+    )
+    for _ in range(n):
+        world = World.objects.create(name=f"w{World.objects.count()}")
+        run = Run.objects.create(world=world, caller_agent=agent, ref="llm/litellm@1", mode="mock", adapter="local")
+        RunOutput.objects.create(run=run, key="text", uri=f"world://{world.id}/{run.id}/text.txt", path="text.txt")
+        for direction in (RunArtifact.DIRECTION_IN, RunArtifact.DIRECTION_OUT):
+            artifact = Artifact.objects.create(world=world, uri=f"world://{world.id}/{run.id}/{direction}")
+            RunArtifact.objects.create(run=run, artifact=artifact, direction=direction, key=direction)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_run_list_query_count_is_constant(schema):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    counts = {}
+    total = 0
+    for n in (1, 5, 20):
+        _add_runs(n - total)
+        total = n
+        with CaptureQueriesContext(connection) as ctx:
+            result = schema.execute_sync(QUERY, context_value=SimpleNamespace())
+        assert result.errors is None, result.errors
+        assert len(result.data["runs"]) == n
+        counts[n] = len(ctx)
+
+    run = result.data["runs"][0]
+    assert run["tool"] == {"ref": "llm/litellm@1"}
+    assert sorted(a["direction"] for a in run["artifacts"]) == ["in", "out"]
+    assert counts[1] == counts[5] == counts[20]
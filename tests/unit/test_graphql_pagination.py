@@ -0,0 +1,103 @@
+"""
+Unit tests for keyset-paginated runs/artifacts connections.
+"""
+
+from datetime import timedelta
+
+import pytest
+
+RUNS = """
+query ($world: ID!, $after: String, $first: Int!) {
+  runs(worldId: $world, after: $after, first: $first) {
+    pageInfo { hasNextPage endCursor }
+    nodes { id }
+  }
+}
+"""
+
+ARTIFACTS = """
+query ($world: ID!, $after: String, $first: Int!) {
+  artifacts(worldId: $world, after: $after, first: $first) {
+    pageInfo { hasNextPage endCursor }
+    nodes { uri }
+  }
+}
+"""
+
+
+def _pages(query, field, key, world_id, first):
+    from backend.schema import schema
+
+    after, pages = None, []
+    while True:
+        result = schema.execute_sync(query, variable_values={"world": str(world_id), "after": after, "first": first})
+        assert result.errors is None, result.errors
+        connection = result.data[field]
+        pages.append([node[key] for node in connection["nodes"]])
+        if not connection["pageInfo"]["hasNextPage"]:
+            return pages
+        after = connection["pageInfo"]["endCursor"]
+
+
+@pytest.fixture
+def world(db):
+    from apps.worlds.models import World
+
+    return World.objects.create(name="w")
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_runs_pages_cover_every_run_once_including_timestamp_ties(world):
+    from django.utils import timezone
+
+    from apps.agents.models import Agent
+    from apps.runs.models import Run
+
+    agent = Agent.objects.create(name="a")
+    other = Run.objects.create(
+        world=type(world).objects.create(name="other"), caller_agent=agent, ref="t@1", mode="mock", adapter="local"
+    )
+    now = timezone.now()
+    runs = [
+        Run.objects.create(world=world, caller_agent=agent, ref="t@1", mode="mock", adapter="local") for _ in range(7)
+    ]
+    for i, run in enumerate(runs):
+        # Pairs share a timestamp so the id tie-break is exercised
+        Run.objects.filter(id=run.id).update(started_at=now - timedelta(seconds=i // 2))
+
+    pages = _pages(RUNS, "runs", "id", world.id, first=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    seen = [run_id for page in pages for run_id in page]
+    assert len(set(seen)) == 7 and str(other.id) not in seen
+    expected = Run.objects.filter(world=world).order_by("-started_at", "-id").values_list("id", flat=True)
+    assert seen == [str(run_id) for run_id in expected]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_artifacts_pages_and_constant_queries_per_page(world, django_assert_num_queries):
+    from apps.artifacts.models import Artifact
+    from backend.schema import schema
+
+    for i in range(5):
+        Artifact.objects.create(world=world, uri=f"world://{world.id}/r/{i}")
+
+    pages = _pages(ARTIFACTS, "artifacts", "uri", world.id, first=2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sorted(uri for page in pages for uri in page) == sorted(f"world://{world.id}/r/{i}" for i in range(5))
+
+    # Key lookup + node fetch, whatever the depth
+    with django_assert_num_queries(2):
+        schema.execute_sync(ARTIFACTS, variable_values={"world": str(world.id), "after": None, "first": 2})
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_invalid_cursor_is_an_error(world):
+    from backend.schema import schema
+
+    result = schema.execute_sync(ARTIFACTS, variable_values={"world": str(world.id), "after": "nope", "first": 2})
+
+    assert result.errors and "Invalid cursor" in result.errors[0].message
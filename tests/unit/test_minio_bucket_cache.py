@@ -0,0 +1,67 @@
+"""
+Unit tests for MinIOAdapter bucket-existence caching.
+
+Fast, hermetic, no I/O. A fake client counts network round trips.
+"""
+
+import pytest
+
+
+class FakeMinio:
+    def __init__(self, existing=()):
+        self.buckets = set(existing)
+        self.exists_calls = 0
+        self.made = []
+
+    def bucket_exists(self, bucket):
+        self.exists_calls += 1
+        return bucket in self.buckets
+
+    def make_bucket(self, bucket, location=None):
+        self.made.append(bucket)
+        self.buckets.add(bucket)
+
+    def presigned_put_object(self, bucket, key, expires=None):
+        return f"http://minio.local:9000/{bucket}/{key}?sig"
+
+
+@pytest.fixture
+def adapter():
+    from backend.storage.adapters import MinIOAdapter
+
+    a = MinIOAdapter()
+    a._client = FakeMinio(existing={"outputs"})
+    return a
+
+
+@pytest.mark.unit
+def test_presign_checks_bucket_once(adapter):
+    """Repeated presigns hit bucket_exists only on the first call."""
+    for i in range(5):
+        adapter.get_upload_url(f"k{i}", "outputs")
+    assert adapter.client.exists_calls == 1
+    assert adapter.client.made == []
+
+
+@pytest.mark.unit
+def test_missing_bucket_created_once(adapter):
+    adapter.ensure_bucket("new-bucket")
+    adapter.ensure_bucket("new-bucket")
+    assert adapter.client.made == ["new-bucket"]
+    assert adapter.client.exists_calls == 1
+
+
+@pytest.mark.unit
+def test_invalidate_forces_recheck(adapter):
+    adapter.ensure_bucket("outputs")
+    adapter.invalidate_bucket_cache("outputs")
+    adapter.ensure_bucket("outputs")
+    assert adapter.client.exists_calls == 2
+
+
+@pytest.mark.unit
+def test_client_is_lazy():
+    """Constructing the adapter must not build a client (no DNS/network at import)."""
+    from backend.storage.adapters import MinIOAdapter
+
+    assert MinIOAdapter()._client is None
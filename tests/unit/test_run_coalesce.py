@@ -0,0 +1,115 @@
+"""
+Unit tests for cross-process coalescing of identical runs in RunService.
+
+Hermetic: the shared fake adapter stands in for containers; the leader's
+progress is simulated from the follower's poll loop (time.sleep is patched).
+"""
+
+import pytest
+
+SUCCESS = {"kind": "Response", "control": {"status": "success", "cost_micro": 5, "final": True}, "outputs": {}}
+
+
+@pytest.fixture
+def coalesced(make_run, fake_adapter, settings):
+    """Returns make() -> running run in one coalesce group (make.adapter: the shared fake)."""
+    settings.TOOL_COALESCE_ENABLED = True
+
+    def make():
+        return make_run({"prompt": "hi"}, status="running")
+
+    make.adapter = fake_adapter
+    return make
+
+
+def _leader_settles_on_first_poll(monkeypatch, leader, response):
+    def sleep(seconds):
+        if leader.status == "running":
+            leader.finalize(response)
+
+    monkeypatch.setattr("apps.runs.services.time.sleep", sleep)
+
+
+@pytest.mark.unit
+def test_coalescing_is_off_by_default():
+    from django.conf import settings
+
+    assert settings.TOOL_COALESCE_ENABLED is False
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_follower_waits_for_executing_leader_and_reuses_its_result(coalesced, monkeypatch):
+    from apps.runs.models import Run
+    from apps.runs.services import RunService
+
+    leader, follower = coalesced(), coalesced()
+    assert RunService._coalesced_response(leader) is None  # elected: executes itself
+    _leader_settles_on_first_poll(monkeypatch, leader, SUCCESS)
+
+    RunService.execute(follower)
+
+    assert coalesced.adapter.invoked == []
+    assert (follower.status, follower.cost_micro) == (Run.Status.SUCCEEDED, 0)
+    assert str(Run.objects.get(id=follower.id).coalesce_leader_id) == leader.id
+    assert str(Run.objects.get(id=leader.id).coalesce_leader_id) == leader.id
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_follower_executes_itself_when_leader_fails(coalesced, monkeypatch):
+    from apps.runs.services import RunService
+
+    leader, follower = coalesced(), coalesced()
+    RunService._coalesced_response(leader)
+    error = {"kind": "Response", "control": {"status": "error", "final": True}, "error": {"code": "X"}, "outputs": {}}
+    _leader_settles_on_first_poll(monkeypatch, leader, error)
+
+    RunService.execute(follower)
+
+    assert coalesced.adapter.invoked == [str(follower.id)]
+    assert (follower.status, follower.cost_micro) == ("succeeded", 5)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_failed_leader_is_replaced_by_one_follower_the_others_follow(coalesced, monkeypatch):
+    from apps.runs.models import Run
+    from apps.runs.services import RunService
+
+    leader, first, second = coalesced(), coalesced(), coalesced()
+    RunService._coalesced_response(leader)
+    error = {"kind": "Response", "control": {"status": "error", "final": True}, "error": {"code": "X"}, "outputs": {}}
+    _leader_settles_on_first_poll(monkeypatch, leader, error)
+
+    # The first follower to re-run the election leads
+    assert RunService._coalesced_response(first) is None
+    assert str(Run.objects.get(id=first.id).coalesce_leader_id) == first.id
+
+    # Other followers and new identical runs wait for it instead of executing
+    _leader_settles_on_first_poll(monkeypatch, first, SUCCESS)
+    RunService.execute(second)
+
+    assert coalesced.adapter.invoked == []
+    assert (second.status, second.cost_micro) == (Run.Status.SUCCEEDED, 0)
+    assert str(Run.objects.get(id=second.id).coalesce_leader_id) == first.id
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_cancelled_follower_stops_waiting(coalesced, monkeypatch):
+    from apps.runs.models import Run
+    from apps.runs.services import RunService
+
+    leader, follower = coalesced(), coalesced()
+    RunService._coalesced_response(leader)
+
+    def sleep(seconds):
+        Run.objects.filter(id=follower.id).update(status=Run.Status.PREEMPTED, error_code="ERR_PREEMPTED")
+
+    monkeypatch.setattr("apps.runs.services.time.sleep", sleep)
+
+    RunService.execute(follower)
+
+    assert coalesced.adapter.invoked == []
+    assert (follower.status, follower.error_code) == ("preempted", "ERR_PREEMPTED")
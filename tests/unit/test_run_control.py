@@ -0,0 +1,182 @@
+"""
+Unit tests for run control: cancelRun / setRunBudget and the adapter's CONTROLLER connection.
+
+Hermetic: the shared fake adapter stands in for containers; the protocol test
+talks to an in-process WebSocket server speaking the controller handshake.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+PREEMPTED = {
+    "kind": "Response",
+    "control": {"status": "error", "final": True},
+    "error": {"code": "ERR_PREEMPTED", "message": "Run preempted by conn-1"},
+    "outputs": {},
+}
+
+
+@pytest.fixture
+def adapter(fake_adapter):
+    # The container answers in-flight invocations of preempted runs with ERR_PREEMPTED
+    fake_adapter.response = PREEMPTED
+    return fake_adapter
+
+
+@pytest.fixture
+def run(make_run):
+    return make_run()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_cancel_pending_run_is_never_claimed(run, adapter):
+    from apps.runs.models import Run
+    from apps.runs.services import RunService
+
+    RunService.cancel(run)
+
+    assert (run.status, run.error_code) == (Run.Status.PREEMPTED, "ERR_PREEMPTED")
+    assert run.ended_at is not None
+    assert RunService.claim_next() is None
+    assert adapter.ops == []
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_cancel_running_run_preempts_container_and_worker_settles_preempted(run, adapter):
+    from apps.runs.models import Run
+    from apps.runs.services import RunService
+
+    claimed = RunService.claim_next()
+    RunService.cancel(run)
+
+    assert adapter.ops == [(str(run.id), {"op": "preempt"})]
+    run.refresh_from_db()
+    assert run.status == Run.Status.RUNNING
+
+    # The container answers the in-flight invocation with ERR_PREEMPTED
+    RunService.execute(claimed)
+    claimed.refresh_from_db()
+    assert (claimed.status, claimed.error_code) == (Run.Status.PREEMPTED, "ERR_PREEMPTED")
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_cancel_running_run_with_unreachable_container_settles_it_preempted(run, adapter):
+    from apps.core.adapters.base_ws_adapter import WsError
+    from apps.runs.models import Run, RunStat
+    from apps.runs.services import RunService
+
+    claimed = RunService.claim_next()
+    adapter.control_error = WsError("connection refused")
+    RunService.cancel(run)
+
+    assert (run.status, run.error_code) == (Run.Status.PREEMPTED, "ERR_PREEMPTED")
+    run.refresh_from_db()
+    assert (run.status, run.error_code) == (Run.Status.PREEMPTED, "ERR_PREEMPTED")
+    assert "connection refused" in run.error_message and run.ended_at is not None
+    assert RunStat.objects.get().failed == 1
+
+    # A worker still holding the run keeps the cancelled outcome and does not count it twice
+    adapter.control_error = None
+    RunService.execute(claimed)
+    assert (claimed.status, claimed.error_message) == (Run.Status.PREEMPTED, run.error_message)
+    assert RunStat.objects.get().runs == 1
+
+    with pytest.raises(ValueError, match="not running"):
+        RunService.cancel(run)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_set_budget_requires_running_run(run, adapter):
+    from apps.runs.services import RunService
+
+    with pytest.raises(ValueError, match="not running"):
+        RunService.set_budget(run, tokens=100)
+
+    RunService.claim_next()
+    assert RunService.set_budget(run, tokens=100) == {"tokens": 100, "time_s": None}
+    assert adapter.ops == [(str(run.id), {"op": "set_budget", "tokens": 100})]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_graphql_cancel_and_budget_mutations(run, adapter):
+    from backend.schema import schema
+
+    cancel = schema.execute_sync(
+        "mutation($id: ID!) { cancelRun(runId: $id) { status errorCode } }", {"id": str(run.id)}
+    )
+    assert cancel.errors is None
+    assert cancel.data["cancelRun"] == {"status": "preempted", "errorCode": "ERR_PREEMPTED"}
+
+    budget = schema.execute_sync(
+        "mutation($id: ID!) { setRunBudget(runId: $id, timeS: 30) { tokens timeS } }", {"id": str(run.id)}
+    )
+    assert "not running" in budget.errors[0].message
+
+
+def _serve(handler):
+    """Run a WebSocket server on a background loop; returns (url, stop)."""
+    from websockets.asyncio.server import serve
+
+    started, loop = threading.Event(), asyncio.new_event_loop()
+    state = {}
+
+    async def main():
+        async with serve(handler, "127.0.0.1", 0, subprotocols=["theory.run.v1"]) as server:
+            state["port"] = server.sockets[0].getsockname()[1]
+            state["stop"] = asyncio.Event()
+            started.set()
+            await state["stop"].wait()
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(main(),), daemon=True)
+    thread.start()
+    started.wait(5)
+
+    def stop():
+        loop.call_soon_threadsafe(state["stop"].set)
+        thread.join(5)
+
+    return f"ws://127.0.0.1:{state['port']}/run", stop
+
+
+@pytest.mark.unit
+def test_controller_connection_sends_op_on_request_and_waits_for_its_event():
+    from apps.core.adapters.base_ws_adapter import BaseWsAdapter, WsError
+
+    requests = []
+
+    async def container(ws):
+        request = json.loads(await ws.recv())
+        requests.append(request)
+        if request["control"]["run_id"] != "run-1":
+            await ws.send(json.dumps({"kind": "Error", "content": {"message": "Unknown run"}}))
+            await ws.close(1008)
+            return
+        await ws.send(json.dumps({"kind": "Ack", "content": {"run_id": "run-1"}}))
+        # Controllers share the run's fan-out, so unrelated frames come first
+        await ws.send(json.dumps({"kind": "Token", "content": {"text": "hi"}}))
+        await ws.send(json.dumps({"kind": "Event", "content": {"phase": "budget_updated", "budgets": {"tokens": 5}}}))
+        await ws.wait_closed()
+
+    url, stop = _serve(container)
+    try:
+        adapter = BaseWsAdapter()
+        event = adapter.control("tool@1", "run-1", {"op": "set_budget", "tokens": 5}, {"ws_url": url})
+        assert event["content"]["budgets"] == {"tokens": 5}
+        assert requests[0] == {
+            "kind": "Request",
+            "control": {"run_id": "run-1", "role": "controller"},
+            "content": {"op": "set_budget", "tokens": 5},
+        }
+
+        with pytest.raises(WsError, match="Unknown run"):
+            adapter.control("tool@1", "run-2", {"op": "preempt"}, {"ws_url": url})
+    finally:
+        stop()
@@ -0,0 +1,122 @@
+"""
+Unit tests for live run events: the in-process hub and the runEvents subscription.
+"""
+
+import asyncio
+
+import pytest
+
+FINAL = {"kind": "Response", "control": {"status": "success", "final": True}, "outputs": {}}
+
+
+@pytest.mark.unit
+def test_slow_subscriber_drops_oldest_tokens_but_keeps_control_frames(settings):
+    from apps.runs.events import RunEventHub
+
+    settings.RUN_EVENTS_BUFFER = 3
+    hub = RunEventHub()
+
+    async def scenario():
+        hub.begin("r1")
+        sub = hub.subscribe("r1")
+        hub.publish("r1", {"kind": "Ack"})
+        for i in range(4):
+            hub.publish("r1", {"kind": "Token", "content": str(i)})
+        hub.publish("r1", {"kind": "Event", "content": {"type": "step"}})
+        hub.publish("r1", FINAL)
+        hub.end("r1")
+        return [event async for event in sub]
+
+    events = asyncio.run(scenario())
+
+    assert [e.data["kind"] for e in events] == ["Ack", "Event", "Response"]
+    assert [e.seq for e in events] == [0, 5, 6]
+    assert events[1].dropped == 4
+
+
+@pytest.mark.unit
+def test_late_subscriber_replays_backlog_and_unknown_run_is_not_live(settings):
+    from apps.runs.events import RunEventHub
+
+    hub = RunEventHub()
+
+    async def scenario():
+        assert hub.subscribe("missing") is None
+        hub.begin("r1")
+        hub.publish("r1", {"kind": "Token", "content": "a"})
+        sub = hub.subscribe("r1")
+        hub.publish("r1", FINAL)
+        return [event async for event in sub]
+
+    events = asyncio.run(scenario())
+    assert [(e.seq, e.data["kind"]) for e in events] == [(0, "Token"), (1, "Response")]
+
+
+SUBSCRIPTION = "subscription ($id: ID!) { runEvents(runId: $id) { seq kind dropped data } }"
+
+
+async def _collect(run_id):
+    from backend.schema import schema
+
+    results = await schema.subscribe(SUBSCRIPTION, variable_values={"id": run_id})
+    out = []
+    async for result in results:
+        assert result.errors is None, result.errors
+        out.append(result.data["runEvents"])
+    return out
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_subscription_streams_live_run():
+    from apps.runs.events import run_events
+
+    async def scenario():
+        run_events.begin("live-run")
+        task = asyncio.ensure_future(_collect("live-run"))
+        await asyncio.sleep(0.05)
+        run_events.publish("live-run", {"kind": "Token", "content": "hi"})
+        run_events.publish("live-run", FINAL)
+        run_events.end("live-run")
+        return await task
+
+    events = asyncio.run(scenario())
+    assert [(e["seq"], e["kind"]) for e in events] == [(0, "Token"), (1, "Response")]
+    assert events[0]["data"]["content"] == "hi"
+
+
+@pytest.mark.unit
+@pytest.mark.django_db(transaction=True)
+def test_subscription_sends_final_response_of_run_settled_elsewhere():
+    from apps.agents.models import Agent
+    from apps.runs.models import Run
+    from apps.worlds.models import World
+
+    run = Run.objects.create(
+        world=World.objects.create(name="w"),
+        caller_agent=Agent.objects.create(name="a"),
+        ref="llm/litellm@1",
+        mode="mock",
+        adapter="local",
+        status=Run.Status.FAILED,
+        error_code="TIMEOUT",
+    )
+
+    events = asyncio.run(_collect(str(run.id)))
+
+    assert len(events) == 1
+    assert events[0]["kind"] == "Response"
+    assert events[0]["data"]["error"]["code"] == "TIMEOUT"
+
+
+@pytest.mark.unit
+@pytest.mark.django_db(transaction=True)
+def test_subscription_to_malformed_run_id_reports_not_found():
+    from backend.schema import schema
+
+    async def scenario():
+        results = await schema.subscribe(SUBSCRIPTION, variable_values={"id": "not-a-uuid"})
+        return [result async for result in results]
+
+    (result,) = asyncio.run(scenario())
+    assert result.errors[0].message == "Run not-a-uuid not found"
@@ -0,0 +1,76 @@
+"""
+Unit tests for Run.finalize.
+
+Finalize must cost the same number of queries whatever the number of outputs.
+The 1/10/100 sweep doubles as a small benchmark (run with -s to see timings).
+"""
+
+import itertools
+import time
+
+import pytest
+
+
+def _response(run, n):
+    outputs = {}
+    for i in range(n):
+        if i % 2:
+            outputs[f"out{i}"] = f"world://{run.world_id}/{run.id}/out{i}.json?data=%7B%22i%22%3A%20{i}%7D"
+        else:
+            outputs[f"out{i}"] = f"world://{run.world_id}/{run.id}/out{i}.txt"
+    return {"kind": "Response", "control": {"status": "success", "cost_micro": 7}, "outputs": outputs}
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_finalize_query_count_is_constant(make_run):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    # The day's first finalize inserts its RunStat row; every later one is a single UPDATE
+    make_run(status="running").finalize(_response(None, 0))
+
+    counts = {}
+    for n in (1, 10, 100):
+        run = make_run(status="running")
+        response = _response(run, n)
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as ctx:
+            run.finalize(response)
+        print(f"finalize outputs={n}: {len(ctx)} queries, {(time.perf_counter() - start) * 1000:.1f} ms")
+        # SQLite caps bound parameters, so Django may split one bulk insert into consecutive batches
+        counts[n] = len([statement for statement, _ in itertools.groupby(q["sql"][:40] for q in ctx)])
+
+        assert run.artifacts.filter(direction="out").count() == n
+
+    assert counts[1] == counts[10] == counts[100]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_finalize_reuses_existing_artifacts_and_parses_new_ones(make_run):
+    from apps.artifacts.models import Artifact
+
+    run = make_run(status="running")
+    known = Artifact.objects.create(
+        world_id=run.world_id, uri=f"world://{run.world_id}/prev/known.txt", path="prev/known.txt"
+    )
+    response = {
+        "control": {"status": "error", "cost_micro": 3},
+        "error": {"code": "TIMEOUT", "message": "slow"},
+        "outputs": {
+            "known": known.uri,
+            "text": f"world://{run.world_id}/{run.id}/text.txt",
+            "answer": f"world://{run.world_id}/{run.id}/answer.json?data=%7B%22ok%22%3A%20true%7D",
+        },
+    }
+
+    run.finalize(response)
+    run.refresh_from_db()
+
+    assert (run.status, run.error_code, run.cost_micro) == ("failed", "TIMEOUT", 3)
+    links = {link.key: link.artifact for link in run.artifacts.select_related("artifact")}
+    assert links["known"].pk == known.pk
+    assert links["text"].path == f"{run.world_id}/{run.id}/text.txt"
+    assert links["answer"].is_scalar and links["answer"].data == {"ok": True}
+    assert run.as_response()["outputs"] == response["outputs"]
@@ -0,0 +1,161 @@
+"""
+Unit tests for the stale-run reaper: deadlines, lost heartbeats, unclaimed runs.
+
+Hermetic: runs live in the test DB; the shared fake adapter records preempt control ops.
+"""
+
+import datetime
+
+import pytest
+
+
+@pytest.fixture
+def make_run(make_run, settings):
+    """Overrides the shared factory: make(status, age_s, ...) backdates the run's timestamps."""
+    from django.utils import timezone
+
+    from apps.runs.models import Run
+    from apps.tools.models import Tool
+
+    settings.RUN_HEARTBEAT_TIMEOUT_S = 120
+    settings.RUN_DEADLINE_GRACE_S = 60
+    settings.RUN_PENDING_TIMEOUT_S = 3600
+    # 100s per attempt, 2 attempts, up to 10s backoff -> preempted after 210s + 60s grace
+    Tool.objects.create(
+        ref="llm/litellm@1",
+        namespace="llm",
+        name="litellm",
+        version=1,
+        ref_slug="llm_litellm",
+        timeout_s=100,
+        retry_policy={"max_attempts": 2, "max_delay_s": 10},
+    )
+    enqueue, now = make_run, timezone.now()
+
+    def make(status, age_s, heartbeat_age_s=None, ref="llm/litellm@1", queued_s=0):
+        """age_s counts from the claim for running runs and from creation for pending ones."""
+        run = enqueue(ref=ref)
+        heartbeat_at = None if heartbeat_age_s is None else now - datetime.timedelta(seconds=heartbeat_age_s)
+        claimed_at = None if status == "pending" else now - datetime.timedelta(seconds=age_s)
+        Run.objects.filter(id=run.id).update(
+            status=status,
+            started_at=now - datetime.timedelta(seconds=age_s + queued_s),
+            claimed_at=claimed_at,
+            heartbeat_at=heartbeat_at,
+        )
+        return run
+
+    make.now = now
+    return make
+
+
+def _preempted(adapter):
+    return [run_id for run_id, content in adapter.ops if content == {"op": "preempt"}]
+
+
+def _status(run):
+    run.refresh_from_db()
+    return run.status, run.error_code
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_reaps_by_deadline_heartbeat_and_queue_age(make_run, fake_adapter):
+    from apps.runs.models import Run, RunStat
+    from apps.runs.reaper import reap_stale_runs
+
+    slow = make_run("running", age_s=280, heartbeat_age_s=5)
+    healthy = make_run("running", age_s=260, heartbeat_age_s=5)
+    # Time spent pending does not count against the deadline
+    long_queued = make_run("running", age_s=30, heartbeat_age_s=5, queued_s=3000)
+    orphaned = make_run("running", age_s=200, heartbeat_age_s=130)
+    never_beat = make_run("running", age_s=130)
+    unknown_tool = make_run("running", age_s=3500, heartbeat_age_s=5, ref="x/unknown@1")
+    queued = make_run("pending", age_s=3700)
+    fresh = make_run("pending", age_s=10)
+    done = make_run("succeeded", age_s=9000)
+
+    reaped = reap_stale_runs(now=make_run.now)
+
+    assert reaped == {"deadline": 1, "heartbeat": 2, "pending": 1}
+    assert _status(slow) == ("preempted", "ERR_DEADLINE_EXCEEDED")
+    assert _status(orphaned) == _status(never_beat) == ("failed", "ERR_HEARTBEAT_LOST")
+    assert _status(queued) == ("failed", "ERR_QUEUE_TIMEOUT")
+    for run in (healthy, long_queued, unknown_tool, fresh, done):
+        assert _status(run)[1] is None
+    assert Run.objects.get(id=slow.id).ended_at == make_run.now
+
+    # Reaped running runs are preempted in their container and counted as finished
+    assert sorted(_preempted(fake_adapter)) == sorted(str(run.id) for run in (slow, orphaned, never_beat))
+    assert RunStat.objects.get().failed == 3
+
+    # Terminal now: a second pass finds nothing
+    assert reap_stale_runs(now=make_run.now) == {"deadline": 0, "heartbeat": 0, "pending": 0}
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_one_update_per_reason_and_preempt_is_best_effort(make_run, fake_adapter):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from apps.runs.reaper import reap_stale_runs
+
+    fake_adapter.control_error = OSError("container gone")
+    runs = [make_run("running", age_s=500, heartbeat_age_s=5) for _ in range(5)]
+    runs += [make_run("pending", age_s=4000) for _ in range(5)]
+
+    with CaptureQueriesContext(connection) as ctx:
+        reaped = reap_stale_runs(now=make_run.now)
+
+    assert reaped == {"deadline": 5, "heartbeat": 0, "pending": 5}
+    run_updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "runs_run"')]
+    assert len(run_updates) == 2
+    assert {_status(run)[0] for run in runs} == {"preempted", "failed"}
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_claim_records_heartbeat_and_preempt_flag_is_respected(make_run, fake_adapter):
+    from apps.runs.reaper import reap_stale_runs
+    from apps.runs.services import RunService
+
+    pending = make_run("pending", age_s=10)
+    claimed = RunService.claim_next()
+    assert str(claimed.id) == str(pending.id)
+    claimed.refresh_from_db()
+    assert claimed.claimed_at is not None and claimed.heartbeat_at == claimed.claimed_at
+
+    make_run("running", age_s=500, heartbeat_age_s=5)
+    assert reap_stale_runs(now=make_run.now, preempt=False)["deadline"] == 1
+    assert _preempted(fake_adapter) == []
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+@pytest.mark.parametrize("outcome", ["response", "exception"])
+def test_worker_finishing_a_reaped_run_keeps_the_reaped_status(make_run, fake_adapter, outcome):
+    from apps.runs.models import RunStat
+    from apps.runs.reaper import reap_stale_runs
+    from apps.runs.services import RunService
+
+    run = make_run("running", age_s=500, heartbeat_age_s=5)
+
+    def invoke_run(run, on_event=None):
+        # The reaper settles the run while its worker is still waiting on the container
+        assert reap_stale_runs(now=make_run.now)["deadline"] == 1
+        if outcome == "exception":
+            raise RuntimeError("container exited")
+        return {"kind": "Response", "control": {"status": "success", "cost_micro": 5, "final": True}, "outputs": {}}
+
+    fake_adapter.invoke_run = invoke_run
+    run.refresh_from_db()
+    try:
+        RunService.execute(run)
+    except RuntimeError:
+        pass
+
+    assert (run.status, run.error_code) == ("preempted", "ERR_DEADLINE_EXCEEDED")
+    assert _status(run) == ("preempted", "ERR_DEADLINE_EXCEEDED")
+    stat = RunStat.objects.get()
+    assert (stat.runs, stat.succeeded, stat.failed) == (1, 0, 1)
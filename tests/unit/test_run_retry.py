@@ -0,0 +1,214 @@
+"""
+Unit tests for run retries: policy resolution, backoff, and transport-only retrying.
+"""
+
+import random
+
+import pytest
+
+TOOL_ERROR = {
+    "kind": "Response",
+    "control": {"status": "error", "final": True},
+    "error": {"code": "BAD_INPUT", "message": "no"},
+    "outputs": {},
+}
+
+
+@pytest.fixture
+def run(make_run, monkeypatch, settings):
+    settings.RUN_RETRY_DEFAULTS = {"max_attempts": 3, "base_delay_s": 0.5, "max_delay_s": 5, "multiplier": 2}
+    monkeypatch.setattr("apps.runs.services.time.sleep", lambda seconds: None)
+    # As claimed by a worker: execute only settles runs that are still running
+    return make_run(status="running")
+
+
+def _execute(run):
+    from apps.runs.services import RunService
+
+    try:
+        RunService.execute(run)
+    except Exception:
+        pass
+    run.refresh_from_db()
+    return run
+
+
+@pytest.mark.unit
+def test_policy_merges_sources_and_backoff_is_capped_full_jitter():
+    from apps.runs.retry import RetryPolicy
+
+    policy = RetryPolicy.from_config({"max_attempts": 3, "base_delay_s": 1}, {"max_attempts": "5"}, {"ignored": 1})
+    assert (policy.max_attempts, policy.base_delay_s, policy.max_delay_s) == (5, 1.0, 30.0)
+
+    rng = random.Random(1)
+    delays = [policy.delay(attempt, rng) for attempt in (1, 2, 3, 10) for _ in range(200)]
+    assert max(delays[:200]) <= 1.0 and max(delays[400:600]) <= 4.0 and max(delays[600:]) <= 30.0
+    assert min(delays) >= 0 and max(delays[600:]) > 15
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_transport_failures_are_retried_with_the_same_idempotency_key(run, fake_adapter):
+    from apps.core.adapters.base_ws_adapter import TransportError
+
+    fake_adapter.failures = [TransportError("WebSocket timeout"), ConnectionRefusedError("refused")]
+    run = _execute(run)
+
+    assert (run.status, run.attempts) == ("succeeded", 3)
+    assert fake_adapter.keys == [f"run:{run.id}"] * 3
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_tool_errors_and_protocol_errors_are_not_retried(run, fake_adapter):
+    from apps.core.adapters.base_ws_adapter import WsError
+
+    fake_adapter.response = TOOL_ERROR
+    assert _execute(run).attempts == 1
+    assert run.status == "failed" and run.error_code == "BAD_INPUT"
+
+    run.status, run.attempts = "running", 0
+    fake_adapter.failures = [WsError("Invalid response")]
+    run = _execute(run)
+    assert (run.status, run.attempts) == ("failed", 1)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_world_override_limits_attempts(run, fake_adapter):
+    from apps.core.adapters.base_ws_adapter import TransportError
+    from apps.tools.models import Tool, WorldTool
+
+    tool = Tool.objects.create(
+        ref="llm/litellm@1",
+        namespace="llm",
+        name="litellm",
+        version=1,
+        ref_slug="llm_litellm",
+        retry_policy={"max_attempts": 4},
+    )
+    WorldTool.objects.create(world_id=run.world_id, tool=tool, config={"retry": {"max_attempts": 2}})
+
+    fake_adapter.failures = [TransportError("closed")] * 5
+    run = _execute(run)
+
+    assert (run.status, run.attempts) == ("failed", 2)
+    assert run.error_message == "closed"
+
+
+def _closed_port():
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class RefusedAdapter:
+    """Real WebSocket path (background event loop) against a port nobody listens on."""
+
+    def __init__(self):
+        from apps.core.adapters.base_ws_adapter import BaseWsAdapter
+
+        self.ws = BaseWsAdapter(connect_timeout_s=2)
+        self.url = f"ws://127.0.0.1:{_closed_port()}/run"
+        self.attempts = 0
+
+    def invoke_run(self, run, on_event=None):
+        self.attempts += 1
+        request = {"kind": "Request", "control": {"run_id": str(run.id)}, "inputs": {}, "outputs": {}}
+        return self.ws._invoke_observed(run.ref, request, 5, {"ws_url": self.url}, on_event)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_connection_failure_in_event_loop_thread_is_raised_as_transport_error(run, use_adapter):
+    from apps.core.adapters.base_ws_adapter import BaseWsAdapter, TransportError
+
+    url = f"ws://127.0.0.1:{_closed_port()}/run"
+    with pytest.raises(TransportError, match="connect failed"):
+        BaseWsAdapter(connect_timeout_s=2).invoke("tool@1", {"kind": "Request"}, 5, {"ws_url": url})
+
+    adapter = use_adapter(RefusedAdapter())
+    run = _execute(run)
+    assert (run.status, run.attempts, adapter.attempts) == ("failed", 3, 3)
+    assert "connect failed" in run.error_message
+
+
+class PresignStub:
+    def generate_presigned_put_url(self, bucket, key, expires_in):
+        return f"https://put/{key}"
+
+    def generate_presigned_get_url(self, bucket, key, expires_in):
+        return f"https://get/{key}"
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_idempotency_key_and_attempt_reach_the_tool_handler(run, monkeypatch):
+    from apps.core.adapters.base_ws_adapter import BaseWsAdapter
+    from libs.runtime_common.protocol.worker import handler_payload
+
+    monkeypatch.setattr("backend.storage.service.StorageService", PresignStub)
+    run.attempts = 2
+
+    request = BaseWsAdapter()._build_payload(run)
+    payload = handler_payload(request)
+
+    assert request["kind"] == "Request"
+    assert payload["run_id"] == str(run.id) and payload["mode"] == "mock"
+    assert (payload["idempotency_key"], payload["attempt"]) == (f"run:{run.id}", 2)
+    assert payload["outputs"]["outputs.json"].endswith(f"{run.world_id}/{run.id}/outputs.json")
+
+
+class SilentContainerAdapter:
+    """Real WebSocket path against a container that acknowledges the run, then never answers."""
+
+    def __init__(self, url):
+        from apps.core.adapters.base_ws_adapter import BaseWsAdapter
+
+        self.ws = BaseWsAdapter()
+        self.url = url
+        self.attempts = 0
+
+    def invoke_run(self, run, on_event=None):
+        self.attempts += 1
+        request = {"kind": "Request", "control": {"run_id": str(run.id)}, "inputs": {}, "outputs": {}}
+        return self.ws._invoke_observed(run.ref, request, 1, {"ws_url": self.url}, on_event)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_tool_deadline_is_not_retried(run, use_adapter):
+    import asyncio
+    import json
+    import threading
+
+    from websockets.asyncio.server import serve
+
+    ready, state = threading.Event(), {}
+
+    async def container(ws):
+        await ws.recv()
+        await ws.send(json.dumps({"kind": "Ack", "content": {}}))
+        await ws.wait_closed()
+
+    async def main():
+        async with serve(container, "127.0.0.1", 0, subprotocols=["theory.run.v1"]) as server:
+            state["port"], state["stop"] = server.sockets[0].getsockname()[1], asyncio.Event()
+            ready.set()
+            await state["stop"].wait()
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(main(),), daemon=True)
+    thread.start()
+    ready.wait(5)
+    try:
+        adapter = use_adapter(SilentContainerAdapter(f"ws://127.0.0.1:{state['port']}/run"))
+        run = _execute(run)
+    finally:
+        loop.call_soon_threadsafe(state["stop"].set)
+        thread.join(5)
+
+    assert (run.status, run.attempts, adapter.attempts) == ("failed", 1, 1)
+    assert "deadline" in run.error_message
@@ -0,0 +1,105 @@
+"""
+Unit tests for the incremental run statistics rollup (RunStat) and its histograms.
+"""
+
+import random
+from datetime import timedelta
+
+import pytest
+
+
+@pytest.mark.unit
+def test_histogram_quantiles_within_bucket_error_and_merge_is_additive():
+    from apps.runs import stats
+
+    rng = random.Random(7)
+    values = [rng.lognormvariate(7, 1) for _ in range(5000)]
+    first, second = {}, {}
+    for i, value in enumerate(values):
+        stats.add(first if i % 2 else second, value)
+    merged = stats.merge([first, second])
+
+    assert sum(merged.values()) == len(values)
+    ordered = sorted(values)
+    for q in (0.5, 0.95):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(stats.quantile(merged, q) - exact) / exact < 0.06
+    assert stats.quantile({}, 0.5) is None
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_finalize_rolls_up_runs_and_graphql_reads_rollup():
+    from django.utils import timezone
+
+    from apps.agents.models import Agent
+    from apps.runs.models import Run, RunStat
+    from apps.worlds.models import World
+    from backend.schema import schema
+
+    world, agent = World.objects.create(name="w"), Agent.objects.create(name="a")
+    for seconds, status, cost in ((1, "success", 10), (3, "success", 20), (2, "error", 5)):
+        run = Run.objects.create(
+            world=world, caller_agent=agent, ref="llm/litellm@1", mode="mock", adapter="local", status="running"
+        )
+        # Queued for an hour before a worker claimed it: only execution time counts
+        run.started_at = timezone.now() - timedelta(hours=1)
+        run.claimed_at = timezone.now() - timedelta(seconds=seconds)
+        run.finalize({"control": {"status": status, "cost_micro": cost}, "outputs": {}})
+
+    stat = RunStat.objects.get(world=world, ref="llm/litellm@1")
+    assert (stat.runs, stat.succeeded, stat.failed, stat.cost_micro) == (3, 2, 1, 35)
+    assert 5500 <= stat.duration_ms_sum <= 6500
+
+    result = schema.execute_sync(
+        """
+        query ($world: ID!) {
+          runStatsSummary(worldId: $world) { runs failed errorRate costMicro p50DurationMs p95DurationMs }
+          runStats(worldId: $world) { ref day runs }
+        }
+        """,
+        variable_values={"world": str(world.id)},
+    )
+    assert result.errors is None, result.errors
+    summary = result.data["runStatsSummary"]
+    assert (summary["runs"], summary["failed"], summary["costMicro"]) == (3, 1, 35)
+    assert summary["errorRate"] == pytest.approx(1 / 3)
+    assert 1800 <= summary["p50DurationMs"] <= 2200
+    assert [(row["ref"], row["runs"]) for row in result.data["runStats"]] == [("llm/litellm@1", 3)]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_record_is_one_atomic_update_per_run():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.utils import timezone
+
+    from apps.agents.models import Agent
+    from apps.runs import stats
+    from apps.runs.models import Run, RunStat
+    from apps.worlds.models import World
+
+    world, agent = World.objects.create(name="w"), Agent.objects.create(name="a")
+    now = timezone.now()
+
+    def finished(status, duration_s, cost):
+        return Run(
+            world=world,
+            caller_agent=agent,
+            ref="llm/litellm@1",
+            status=status,
+            claimed_at=now - timedelta(seconds=duration_s),
+            ended_at=now,
+            cost_micro=cost,
+        )
+
+    RunStat.record(finished("succeeded", 1, 10))
+    with CaptureQueriesContext(connection) as ctx:
+        RunStat.record(finished("failed", 1, 5))
+        RunStat.record(finished("succeeded", 4, 0))
+
+    assert [q["sql"].split()[0] for q in ctx.captured_queries] == ["UPDATE", "UPDATE"]
+    stat = RunStat.objects.get()
+    assert (stat.runs, stat.succeeded, stat.failed, stat.cost_micro, stat.duration_ms_sum) == (3, 2, 1, 15, 6000)
+    assert stat.latency_histogram == {str(stats.bucket_of(1000)): 2, str(stats.bucket_of(4000)): 1}
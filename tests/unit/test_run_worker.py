@@ -0,0 +1,114 @@
+"""
+Unit tests for the run queue: enqueue, claim and runworker execution.
+
+Hermetic: the shared fake adapter replaces the WebSocket adapters; runs live in the test DB.
+"""
+
+import pytest
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_enqueue_returns_pending_run_with_write_prefix(make_run, fake_adapter):
+    run = make_run({"prompt": "hi"})
+
+    assert run.status == "pending"
+    assert run.write_prefix == f"/{run.world_id}/{run.id}/"
+    assert fake_adapter.invoked == []
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_claim_next_takes_oldest_pending_once(make_run):
+    from apps.runs.services import RunService
+
+    first, second = make_run({"n": 1}), make_run({"n": 2})
+
+    assert str(RunService.claim_next().id) == first.id
+    assert str(RunService.claim_next().id) == second.id
+    assert RunService.claim_next() is None
+    first.refresh_from_db()
+    assert first.status == "running"
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_runworker_once_drains_queue(make_run, fake_adapter):
+    from django.core.management import call_command
+
+    runs = [make_run({"n": i}) for i in range(3)]
+
+    call_command("runworker", "--once")
+
+    assert fake_adapter.invoked == [run.id for run in runs]
+    for run in runs:
+        run.refresh_from_db()
+        assert (run.status, run.cost_micro) == ("succeeded", 5)
+        assert run.ended_at is not None
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_runworker_marks_failed_and_continues(make_run, fake_adapter):
+    from django.core.management import call_command
+
+    fake_adapter.failures = [RuntimeError("container exited"), RuntimeError("container exited")]
+    failed, also_failed = make_run({"n": 1}), make_run({"n": 2})
+
+    call_command("runworker", "--once")
+
+    for run in (failed, also_failed):
+        run.refresh_from_db()
+        assert run.status == "failed"
+        assert run.error_message == "container exited"
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_enqueue_links_input_artifacts_with_constant_queries(make_run):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from apps.artifacts.models import Artifact
+
+    world = make_run.world
+    counts = {}
+    for n in (1, 20):
+        inputs = {
+            f"in{i}": Artifact.objects.create(world=world, uri=f"world://{world.id}/n{n}/{i}").uri for i in range(n)
+        }
+        inputs.update({"external": "https://example.com/doc.pdf", "temperature": 0.2})
+        with CaptureQueriesContext(connection) as ctx:
+            run = make_run(inputs)
+        counts[n] = len(ctx)
+
+        links = dict(run.artifacts.filter(direction="in").values_list("key", "artifact__uri"))
+        assert links == {f"in{i}": inputs[f"in{i}"] for i in range(n)}
+
+    assert counts[1] == counts[20]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+def test_invoke_tool_run_is_never_claimable_by_a_worker(make_run, fake_adapter):
+    from django.db.models.signals import post_save
+
+    from apps.runs.models import Run
+    from apps.runs.services import RunService
+
+    claimed = []
+
+    def worker_polls(sender, instance, created, **kwargs):
+        # A worker polling right after the row is written, before invoke_tool executes it
+        if created:
+            claimed.append(RunService.claim_next())
+
+    post_save.connect(worker_polls, sender=Run)
+    try:
+        run = RunService.invoke_tool(make_run.world, make_run.agent, "llm/litellm@1", {}, "local", "mock")
+    finally:
+        post_save.disconnect(worker_polls, sender=Run)
+
+    assert claimed == [None]
+    assert fake_adapter.invoked == [str(run.id)]
+    assert run.status == "succeeded"
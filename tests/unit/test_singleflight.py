@@ -0,0 +1,107 @@
+"""
+Unit tests for in-flight invocation coalescing.
+
+Fast, hermetic, no I/O. Fake event sources stand in for WS adapters.
+"""
+
+import threading
+import time
+
+import pytest
+
+
+def _response(run_id="leader"):
+    return {"kind": "Response", "control": {"run_id": run_id, "status": "success", "final": True}, "outputs": {}}
+
+
+@pytest.mark.unit
+def test_coalesce_key_is_order_insensitive_and_scoped():
+    """Same invocation → same key; different scope or inputs → different key."""
+    from apps.core.singleflight import coalesce_key
+
+    a = coalesce_key("llm/litellm@1", "sha256:abc", "mock", {"a": 1, "b": [1, 2]}, scope="w1")
+    b = coalesce_key("llm/litellm@1", "sha256:abc", "mock", {"b": [1, 2], "a": 1}, scope="w1")
+    assert a == b
+    assert a != coalesce_key("llm/litellm@1", "sha256:abc", "mock", {"a": 1, "b": [1, 2]}, scope="w2")
+    assert a != coalesce_key("llm/litellm@1", "sha256:abc", "real", {"a": 1, "b": [1, 2]}, scope="w1")
+
+
+@pytest.mark.unit
+def test_concurrent_identical_calls_share_one_execution():
+    """Followers attach to the leader's stream; the source runs once."""
+    from apps.core.singleflight import SingleFlight
+
+    group = SingleFlight()
+    starts = []
+    release = threading.Event()
+
+    def start():
+        starts.append(1)
+
+        def gen():
+            yield {"kind": "Ack"}
+            release.wait(timeout=5)
+            yield {"kind": "Token", "content": {"text": "hi"}}
+            yield _response()
+
+        return gen()
+
+    results = []
+
+    def call():
+        results.append(list(group.join("k", start)))
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert len(starts) == 1
+    assert len(results) == 5
+    assert all([ev["kind"] for ev in r] == ["Ack", "Token", "Response"] for r in results)
+    assert group.inflight() == 0
+
+
+@pytest.mark.unit
+def test_leader_error_propagates_and_next_call_starts_fresh():
+    """Transport errors reach every subscriber; the key is released afterwards."""
+    from apps.core.singleflight import SingleFlight
+
+    group = SingleFlight()
+
+    def failing():
+        def gen():
+            yield {"kind": "Ack"}
+            raise RuntimeError("WebSocket timeout")
+
+        return gen()
+
+    with pytest.raises(RuntimeError):
+        list(group.join("k", failing))
+
+    events = list(group.join("k", lambda: iter([_response()])))
+    assert events[-1]["kind"] == "Response"
+
+
+@pytest.mark.unit
+def test_final_response_settles_flight_without_draining_source():
+    """A consumer that stops at the final Response must not leave a stale flight behind."""
+    from apps.core.singleflight import SingleFlight
+
+    group = SingleFlight()
+
+    def start():
+        def gen():
+            yield _response()
+            yield {"kind": "Log", "content": {"msg": "after final"}}
+
+        return gen()
+
+    for ev in group.join("k", start):
+        if ev["kind"] == "Response":
+            break
+
+    assert group.inflight() == 0
@@ -0,0 +1,83 @@
+"""
+Unit tests for batched delete and copy.
+
+Fast, hermetic, no I/O. A fake boto3 client records requests.
+"""
+
+import pytest
+
+
+class BatchS3:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.delete_requests = []
+        self.copies = []
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [o["Key"] for o in Delete["Objects"]]
+        self.delete_requests.append(keys)
+        return {"Errors": [{"Key": k, "Code": "AccessDenied", "Message": "denied"} for k in keys if k in self.fail]}
+
+    def copy(self, CopySource, Bucket, Key):
+        if CopySource["Key"] in self.fail:
+            raise RuntimeError("NoSuchKey")
+        self.copies.append((CopySource["Bucket"], CopySource["Key"], Bucket, Key))
+
+
+@pytest.fixture
+def s3():
+    from backend.storage.adapters import S3Adapter
+
+    adapter = S3Adapter()
+    adapter.client = BatchS3(fail={"k-0042", "src-3"})
+    return adapter
+
+
+@pytest.mark.unit
+def test_delete_many_batches_of_1000_with_per_key_failures(s3):
+    keys = (f"k-{i:04d}" for i in range(2500))  # lazy, like a listing
+    result = s3.delete_many(keys, "b")
+
+    assert [len(r) for r in s3.client.delete_requests] == [1000, 1000, 500]
+    assert len(result.succeeded) == 2499
+    assert result.failed == {"k-0042": "AccessDenied: denied"}
+    assert not result.ok
+
+
+@pytest.mark.unit
+def test_copy_many_reports_failures_by_dest_key(s3):
+    pairs = [(f"src-{i}", f"dst-{i}") for i in range(5)]
+    result = s3.copy_many(pairs, "dst-bucket", source_bucket="src-bucket")
+
+    assert sorted(result.succeeded) == ["dst-0", "dst-1", "dst-2", "dst-4"]
+    assert list(result.failed) == ["dst-3"]
+    assert ("src-bucket", "src-0", "dst-bucket", "dst-0") in s3.client.copies
+
+
+@pytest.mark.unit
+def test_copy_many_pulls_lazy_pairs_one_window_at_a_time(s3):
+    import threading
+
+    from backend.storage.adapters import COPY_WINDOW
+
+    pulled, drained, seen = [], threading.Event(), []
+
+    def listing():
+        for i in range(COPY_WINDOW * 3):
+            pulled.append(i)
+            yield f"k-{i}", f"d-{i}"
+        drained.set()
+
+    copy = s3.client.copy
+
+    def first_copy_waits(CopySource, Bucket, Key):
+        if Key == "d-0":
+            drained.wait(timeout=0.2)  # an unbounded submitter drains the listing meanwhile
+            seen.append(len(pulled))
+        copy(CopySource, Bucket, Key)
+
+    s3.client.copy = first_copy_waits
+    result = s3.copy_many(listing(), "b")
+
+    assert len(result.succeeded) == COPY_WINDOW * 3
+    assert seen == [COPY_WINDOW]
@@ -0,0 +1,131 @@
+"""
+Unit tests for the read-through disk cache decorator.
+
+Fast, hermetic. A filesystem adapter under tmp_path stands in for object storage.
+"""
+
+import io
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def origin(settings, tmp_path):
+    from backend.storage.adapters import FileSystemAdapter
+
+    settings.STORAGE = {**settings.STORAGE, "FS": {"ROOT": str(tmp_path / "origin")}}
+    adapter = FileSystemAdapter()
+    adapter.reads = 0
+    adapter.heads = 0
+    open_stream, get_file_metadata = adapter.open_stream, adapter.get_file_metadata
+
+    def counting_open(*args, **kwargs):
+        adapter.reads += 1
+        return open_stream(*args, **kwargs)
+
+    def counting_head(*args, **kwargs):
+        adapter.heads += 1
+        return get_file_metadata(*args, **kwargs)
+
+    adapter.open_stream, adapter.get_file_metadata = counting_open, counting_head
+    return adapter
+
+
+def _cache(origin, tmp_path, **kwargs):
+    from backend.storage.cache import CachingAdapter
+
+    kwargs.setdefault("max_bytes", 1024)
+    return CachingAdapter(origin, directory=tmp_path / "cache", **kwargs)
+
+
+@pytest.mark.unit
+def test_hits_are_served_locally_and_counted(origin, tmp_path):
+    origin.upload_file(io.BytesIO(b"payload"), "a.json", "b", content_type="application/json")
+    cache = _cache(origin, tmp_path)
+
+    assert cache.download_file("a.json", "b") == b"payload"
+    assert cache.download_file("a.json", "b") == b"payload"
+    with cache.open_stream("a.json", "b", range=(3, None)) as s:
+        assert s.read() == b"load" and s.content_type == "application/json"
+
+    assert origin.reads == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.unit
+def test_mutable_keys_revalidate_by_etag(origin, tmp_path):
+    origin.upload_file(io.BytesIO(b"v1"), "k", "b")
+    cache = _cache(origin, tmp_path)
+    assert cache.download_file("k", "b") == b"v1"
+
+    # Overwritten behind the cache's back
+    origin.upload_file(io.BytesIO(b"v2"), "k", "b")
+    assert cache.download_file("k", "b") == b"v2"
+    assert origin.reads == 2
+
+
+@pytest.mark.unit
+def test_immutable_prefixes_skip_revalidation(origin, tmp_path):
+    origin.upload_file(io.BytesIO(b"blob"), "cas/abc", "b")
+    cache = _cache(origin, tmp_path, immutable_prefixes=["cas/"])
+
+    for _ in range(3):
+        assert cache.download_file("cas/abc", "b") == b"blob"
+    assert origin.heads == 0 and origin.reads == 1
+
+
+@pytest.mark.unit
+def test_lru_eviction_respects_max_bytes(origin, tmp_path):
+    for key in ["x", "y", "z"]:
+        origin.upload_file(io.BytesIO(b"0123456789"), key, "b")
+    cache = _cache(origin, tmp_path, max_bytes=20, immutable_prefixes=[""])
+
+    cache.download_file("x", "b")
+    cache.download_file("y", "b")
+    cache.download_file("x", "b")  # x is now most recent
+    cache.download_file("z", "b")  # evicts y
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["bytes"] == 20
+    cache.download_file("x", "b")
+    assert origin.reads == 3
+
+
+@pytest.mark.unit
+def test_concurrent_misses_share_one_fill(origin, tmp_path):
+    origin.upload_file(io.BytesIO(b"slow"), "k", "b")
+    cache = _cache(origin, tmp_path)
+    open_stream = origin.open_stream
+
+    def slow_open(*args, **kwargs):
+        time.sleep(0.05)
+        return open_stream(*args, **kwargs)
+
+    origin.open_stream = slow_open
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.download_file("k", "b"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert results == [b"slow"] * 5
+    assert origin.reads == 1
+
+
+@pytest.mark.unit
+def test_index_survives_restart_and_writes_invalidate(origin, tmp_path):
+    origin.upload_file(io.BytesIO(b"data"), "k", "b")
+    _cache(origin, tmp_path).download_file("k", "b")
+
+    cache = _cache(origin, tmp_path)
+    assert cache.stats()["entries"] == 1
+    assert cache.download_file("k", "b") == b"data"
+    assert origin.reads == 1
+
+    cache.delete_file("k", "b")
+    assert cache.stats()["entries"] == 0
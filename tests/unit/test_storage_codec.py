@@ -0,0 +1,63 @@
+"""
+Unit tests for transparent at-rest compression.
+
+Fast, hermetic. A filesystem adapter under tmp_path backs the storage service.
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def service(settings, tmp_path, monkeypatch):
+    from backend.storage.adapters import FileSystemAdapter
+    from backend.storage.service import storage_service
+
+    settings.STORAGE = {
+        **settings.STORAGE,
+        "FS": {"ROOT": str(tmp_path)},
+        "COMPRESSION": {"LEVEL": 3},
+    }
+    monkeypatch.setattr(storage_service, "_adapter", FileSystemAdapter())
+    return storage_service
+
+
+def _payload():
+    return json.dumps([{"role": "user", "content": "hello " * 20}] * 20).encode()
+
+
+@pytest.mark.unit
+def test_json_is_stored_compressed_and_read_back_transparently(service):
+    data = _payload()
+    service.upload_bytes(data, "w/messages.json", content_type="application/json", bucket="b", compress=True)
+
+    raw = service.adapter.download_file("w/messages.json", "b")
+    assert len(raw) < len(data) // 5
+    assert service.get_file_metadata("w/messages.json", "b")["metadata"] == {"content-encoding": "zstd"}
+
+    assert service.download_file("w/messages.json", "b") == data
+    assert b"".join(service.iter_chunks("w/messages.json", "b", chunk_size=100)) == data
+    with service.open_stream("w/messages.json", "b", range=(2, 9)) as stream:
+        assert stream.read() == data[2:10]
+        assert stream.metadata == {}
+
+
+@pytest.mark.unit
+def test_uploads_are_stored_verbatim_unless_compression_is_requested(service):
+    data = _payload()
+    service.upload_bytes(data, "plain", content_type="application/json", bucket="b")
+
+    assert service.adapter.download_file("plain", "b") == data
+    assert service.download_file("plain", "b") == data
+
+
+@pytest.mark.unit
+def test_artifact_store_never_compresses_presignable_objects(service, settings):
+    from backend.storage.artifact_store import ArtifactStore
+
+    data = _payload()
+    path = ArtifactStore().put_bytes("/artifacts/inputs/messages.json", data, "application/json")
+
+    # Tools read artifacts through presigned GETs, which return the stored bytes
+    assert service.adapter.download_file(path, settings.STORAGE["BUCKET"]) == data
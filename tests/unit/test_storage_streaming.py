@@ -0,0 +1,93 @@
+"""
+Unit tests for streaming and ranged reads on storage adapters.
+
+Fast, hermetic, no I/O. Fake clients stand in for boto3.
+"""
+
+import io
+import json
+
+import pytest
+
+
+class FakeBody(io.BytesIO):
+    """StreamingBody stand-in that records close()."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.was_closed = False
+
+    def close(self):
+        self.was_closed = True
+        super().close()
+
+
+class FakeS3:
+    def __init__(self, objects):
+        self.objects = objects
+        self.calls = []
+        self.bodies = []
+
+    def get_object(self, Bucket, Key, Range=None):
+        self.calls.append({"Bucket": Bucket, "Key": Key, "Range": Range})
+        data = self.objects[Key]
+        if Range:
+            spec = Range[len("bytes=") :]
+            start, _, end = spec.partition("-")
+            if start == "":
+                data = data[-int(end) :]
+            else:
+                data = data[int(start) : int(end) + 1 if end else None]
+        body = FakeBody(data)
+        self.bodies.append(body)
+        return {"Body": body, "ContentLength": len(data), "ContentType": "application/json", "ETag": '"abc"'}
+
+
+@pytest.fixture
+def s3():
+    from backend.storage.adapters import S3Adapter
+
+    adapter = S3Adapter()
+    adapter.client = FakeS3({"doc.json": json.dumps({"hello": "world"}).encode(), "big.bin": bytes(range(256)) * 10})
+    return adapter
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "byte_range,header",
+    [(None, None), ((0, 99), "bytes=0-99"), ((100, None), "bytes=100-"), ((-16, None), "bytes=-16")],
+)
+def test_range_header(byte_range, header):
+    from backend.storage.interfaces import range_header
+
+    assert range_header(byte_range) == header
+
+
+@pytest.mark.unit
+def test_range_header_rejects_inverted_range():
+    from backend.storage.interfaces import range_header
+
+    with pytest.raises(ValueError):
+        range_header((10, 5))
+
+
+@pytest.mark.unit
+def test_iter_chunks_bounded_and_releases_connection(s3):
+    chunks = list(s3.iter_chunks("big.bin", "b", chunk_size=1000))
+    assert [len(c) for c in chunks] == [1000, 1000, 560]
+    assert b"".join(chunks) == bytes(range(256)) * 10
+    assert s3.client.bodies[-1].was_closed
+
+
+@pytest.mark.unit
+def test_ranged_tail_read(s3):
+    with s3.open_stream("big.bin", "b", range=(-4, None)) as stream:
+        assert stream.read() == bytes([252, 253, 254, 255])
+        assert stream.etag == "abc"
+    assert s3.client.calls[-1]["Range"] == "bytes=-4"
+
+
+@pytest.mark.unit
+def test_stream_is_file_like_for_json(s3):
+    with s3.open_stream("doc.json", "b") as stream:
+        assert json.load(io.TextIOWrapper(io.BufferedReader(stream), encoding="utf-8")) == {"hello": "world"}